@@ -3,6 +3,7 @@ from utc.src.constants.file_system.file_types.json_file import JsonFile
 from utc.src.constants.file_system.file_types.xml_file import XmlFile
 from utc.src.clustering.gravitational.grav_clustering_options import GravClusteringOptions
 from utc.src.graph import Graph, RoadNetwork
+from utc.src.graph.network import SpatialIndex
 from typing import Dict, List, Union
 import numpy as np
 import matplotlib.pyplot as plt
@@ -234,9 +235,9 @@ class GravClustering:
 		:return: matrix of centroid points of all network edges
 		"""
 		centroid_matrix: np.array = np.zeros(shape=(len(self.graph.road_network.edges), 2), dtype=np.float32)
-		for edge in self.graph.road_network.edges.values():
-			# Values must be taken from lanes, since edges can have the same shape!
-			centroid_matrix[edge.get_id(True)] = np.array(edge.get_centroid())
+		# Values are taken from lanes (computed by spatial index), since edges can have the same shape!
+		spatial_index: SpatialIndex = self.graph.road_network.get_spatial_index()
+		centroid_matrix[spatial_index.edge_index] = spatial_index.edge_centroid
 		# Check if there are lanes which have the same position (can happen -> ITSC scenario), shift them
 		unique_elements, counts = np.unique(centroid_matrix, axis=0, return_counts=True)
 		duplicates = unique_elements[counts > 1]
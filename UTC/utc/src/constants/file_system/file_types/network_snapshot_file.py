@@ -0,0 +1,84 @@
+from utc.src.constants.file_system.my_file import MyFile
+from utc.src.constants.static import FileExtension, FilePaths
+from typing import Dict, Optional
+import numpy as np
+import hashlib
+import tempfile
+import zipfile
+import os
+
+
+class NetworkSnapshotFile(MyFile):
+    """
+    File class handling binary snapshots (".snapshot.npz") of road networks loaded
+    from ".net.xml" files, the snapshot is stored next to the network file and
+    is keyed by the content hash of network file (stale snapshots are rejected).
+    """
+    VERSION: int = 3  # Increase when the format of stored arrays changes
+
+    def __init__(self, network_path: str):
+        """
+        :param network_path: path to ".net.xml" file, can be name (in such case
+        directory utc/data/maps/sumo will be searched for corresponding file),
+        snapshot is always located in the same directory as the network file
+        """
+        self.network_path: str = network_path
+        if not self.file_exists(network_path, message=False):
+            self.network_path = FilePaths.MAP_SUMO.format(self.get_file_name(network_path))
+        super().__init__(
+            self.network_path.replace(FileExtension.SUMO_NETWORK, "") + FileExtension.NETWORK_SNAPSHOT,
+            mode="rb", extension=FileExtension.NETWORK_SNAPSHOT
+        )
+
+    def load_arrays(self) -> Optional[Dict[str, np.ndarray]]:
+        """
+        :return: Arrays stored in snapshot, None if snapshot does not exist, or is stale (different version or hash)
+        """
+        if not self.is_loaded() or not self.file_exists(self.network_path, message=False):
+            return None
+        try:
+            with open(self.file_path, "rb") as file, np.load(file, allow_pickle=False) as data:
+                if int(data["version"]) != self.VERSION or str(data["source_hash"]) != self.get_source_hash():
+                    return None
+                return {key: data[key] for key in data.files}
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile) as e:
+            # Corrupted (e.g. partially written) snapshot is built again
+            print(f"Unable to load network snapshot: '{self.file_path}', got error: {e} !")
+        return None
+
+    def save(self, file_path: str = "default", arrays: Dict[str, np.ndarray] = None) -> bool:
+        file_path = (self.file_path if file_path == "default" else file_path)
+        if not file_path.endswith(self.extension):
+            print(f"Expected default extension: '{self.extension}', got: '{file_path}' !")
+            return False
+        elif not arrays:
+            print(f"Cannot save network snapshot: '{file_path}', received empty arrays!")
+            return False
+        elif not self.file_exists(self.network_path):
+            return False
+        # Snapshot is written to temporary file first and then moved, so that interrupted
+        # writes (or other processes loading the same network) never see partial snapshot
+        descriptor, temp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(os.path.abspath(file_path)))
+        try:
+            # Numpy would append '.npz' extension to path, when its not file object
+            with os.fdopen(descriptor, "wb") as snapshot:
+                np.savez(
+                    snapshot, version=np.array(self.VERSION),
+                    source_hash=np.array(self.get_source_hash()), **arrays
+                )
+            os.replace(temp_path, file_path)
+        except OSError as e:
+            print(f"Unable to save network snapshot: '{file_path}', got error: {e} !")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+        return True
+
+    # ------------------------------------------ Utils ------------------------------------------
+
+    def get_source_hash(self) -> str:
+        """
+        :return: Hash of the content of network file
+        """
+        with open(self.network_path, "rb") as network_file:
+            return hashlib.sha1(network_file.read()).hexdigest()
@@ -9,15 +9,30 @@ class SumoNetworkFile(XmlFile):
     File class handling ".net.xml" files,
     provides utility methods
     """
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, stream: bool = False):
         """
         :param file_path: to ".net.xml" file, can be name (in such case
         directory utc/data/maps/osm  will be search for corresponding file)
+        :param stream: True if file should be read element by element (without
+        keeping the whole xml tree in memory), each getter then reads the file again, default False
         """
-        super().__init__(file_path, extension=FileExtension.SUMO_NETWORK)
+        super().__init__(file_path, extension=FileExtension.SUMO_NETWORK, stream=stream)
 
     # ------------------------------------------ Getters ------------------------------------------
 
+    def get_network_elements(self) -> Optional[Iterator[Element]]:
+        """
+        :return: generator of non-internal Junction, Edge (including lanes), Connection and Roundabout
+        xml elements (in order of file, i.e. single pass trough file), none if file is not loaded
+        """
+        # File is not loaded
+        if not self.is_loaded():
+            print(f"Xml file of sumo road network is not loaded, cannot return network elements!")
+            return None
+        for xml_element in self.get_children({"junction", "edge", "connection", "roundabout"}):
+            if not self.is_internal(xml_element):
+                yield xml_element
+
     def get_junctions(self) -> Optional[Iterator[Element]]:
         """
         :return: generator of non-internal
@@ -28,9 +43,9 @@ class SumoNetworkFile(XmlFile):
             print(f"Xml file of sumo road network is not loaded, cannot return junctions!")
             return None
         # Find all xml elements named "junction"
-        for junction in self.root.findall("junction"):
+        for junction in self.get_children({"junction"}):
             # Filter internal junctions
-            if ("type" in junction.attrib) and (junction.attrib["type"] != "internal"):
+            if not self.is_internal(junction):
                 yield junction
 
     def get_connections(self) -> Optional[Iterator[Element]]:
@@ -43,9 +58,9 @@ class SumoNetworkFile(XmlFile):
             print(f"Xml file of sumo road network is not loaded, cannot return connections!")
             return None
         # Find all xml elements named "connection"
-        for connection in self.root.findall("connection"):
+        for connection in self.get_children({"connection"}):
             # Filter internal connections
-            if connection.attrib["from"][0] != ":":
+            if not self.is_internal(connection):
                 yield connection
 
     def get_edges(self) -> Optional[Iterator[Element]]:
@@ -57,9 +72,9 @@ class SumoNetworkFile(XmlFile):
             print(f"Xml file of sumo road network is not loaded, cannot return edges!")
             return None
         # Find all xml elements named "edge"
-        for edge in self.root.findall("edge"):
+        for edge in self.get_children({"edge"}):
             # Filter internal edges
-            if not ("function" in edge.attrib):
+            if not self.is_internal(edge):
                 yield edge
 
     def get_lanes(self) -> Optional[Iterator[Element]]:
@@ -77,9 +92,10 @@ class SumoNetworkFile(XmlFile):
     def get_component_interval(self, component_type: str) -> Optional[Tuple[int, int]]:
         """
         :param component_type: either edge or junction
-        :return: starting and ending index of non-internal objects in root (indexed as list)
+        :return: starting and ending index of non-internal objects in root (indexed as list),
+        None if file is read in streaming mode
         """
-        if component_type not in {"edge", "junction"}:
+        if component_type not in {"edge", "junction"} or self.root is None:
             return None
         first_index: int = -1
         last_index: int = 0
@@ -106,9 +122,23 @@ class SumoNetworkFile(XmlFile):
             print(f"Xml file of sumo road network is not loaded, cannot return roundabouts!")
             return None
         # Find all xml elements named "roundabout"
-        yield from self.root.findall("roundabout")  # No need to check for internal
+        yield from self.get_children({"roundabout"})  # No need to check for internal
 
     # ------------------------------------------ Utils  -----------------------------------------
 
+    @staticmethod
+    def is_internal(xml_element: Element) -> bool:
+        """
+        :param xml_element: junction, edge, or connection xml element
+        :return: True if element is internal (inside of junctions), False otherwise
+        """
+        if xml_element.tag == "junction":
+            return not (("type" in xml_element.attrib) and (xml_element.attrib["type"] != "internal"))
+        elif xml_element.tag == "edge":
+            return "function" in xml_element.attrib
+        elif xml_element.tag == "connection":
+            return xml_element.attrib["from"][0] == ":"
+        return False
+
     def get_known_path(self, file_name: str) -> str:
         return FilePaths.MAP_SUMO.format(file_name)
@@ -8,13 +8,14 @@ class SumoRoutesFile(XmlFile):
     File class handling ".rou.xml" files, provides utility methods
     """
 
-    def __init__(self, file_path: str = FilePaths.XmlTemplates.SUMO_ROUTES):
+    def __init__(self, file_path: str = FilePaths.XmlTemplates.SUMO_ROUTES, stream: bool = False):
         """
         :param file_path: to ".rou.xml" file, can be name (in such case
         directory 'utc/data/scenarios/routes' will be search for corresponding file),
         default is template of ".rou.xml" file
+        :param stream: True if file should be read element by element (see 'XmlFile.iterparse'), default False
         """
-        super().__init__(file_path, extension=FileExtension.SUMO_ROUTES)
+        super().__init__(file_path, extension=FileExtension.SUMO_ROUTES, stream=stream)
         # Recording of routes based on their edges to new id
         self.route_map: Dict[str, str] = {}
         # Counter for new route ids
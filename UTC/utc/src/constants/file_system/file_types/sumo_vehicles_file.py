@@ -7,13 +7,14 @@ class SumoVehiclesFile(XmlFile):
     """
     File class handling vehicle files for SUMO, provides utility methods
     """
-    def __init__(self, file_path: str = FilePaths.XmlTemplates.SUMO_VEHICLE):
+    def __init__(self, file_path: str = FilePaths.XmlTemplates.SUMO_VEHICLE, stream: bool = False):
         """
         :param file_path: to ".add.xml" file, can be name (in such case
         directory 'utc/data/scenarios/name/additional' will be search for corresponding file),
         default is template of ".rou.xml" file
+        :param stream: True if file should be read element by element (see 'XmlFile.iterparse'), default False
         """
-        super().__init__(file_path, extension=FileExtension.SUMO_ADDITIONAL)
+        super().__init__(file_path, extension=FileExtension.SUMO_ADDITIONAL, stream=stream)
 
     def save(self, file_path: str = "default") -> bool:
         if not self.check_file():
@@ -1,16 +1,24 @@
 from utc.src.constants.file_system.my_file import MyFile
 import xml.etree.ElementTree as ET
 from xml.etree.ElementTree import Element, ElementTree, ParseError
-from typing import Optional, List, Set
+from typing import Optional, List, Set, Iterator
 
 
 class XmlFile(MyFile):
     """
     Class handling xml type files
     """
-    def __init__(self, file_path: str, mode: str = "r", extension: str = ""):
+    def __init__(self, file_path: str, mode: str = "r", extension: str = "", stream: bool = False):
+        """
+        :param file_path: path to xml file
+        :param mode: mode to open file with
+        :param extension: extension of file
+        :param stream: True if file should not be parsed into tree, elements are
+        instead read by single pass trough file (see 'iterparse'), default False
+        """
         self.tree: Optional[ElementTree] = None
         self.root: Optional[Element] = None
+        self.stream: bool = stream
         super().__init__(file_path, mode, extension)  # Super call needs to happen after var declaration
 
     def load(self, file_path: str) -> bool:
@@ -18,6 +26,8 @@ class XmlFile(MyFile):
         if not success:
             print(f"Unable to initialize XML file: '{self.file_path}', file does not exist!")
             return False
+        elif self.stream:  # File will be parsed when elements are requested
+            return True
         try:  # Check for parsing error
             self.tree = ET.parse(self.file_path)
             self.root = self.tree.getroot()
@@ -50,6 +60,48 @@ class XmlFile(MyFile):
 
     # ------------------------------------------ Getters ------------------------------------------
 
+    def get_children(self, element_tags: Set[str]) -> Iterator[Element]:
+        """
+        :param element_tags: tags of xml elements (children of root) to be found
+        :return: generator of xml elements (from tree, or parsed from file in streaming mode)
+        """
+        if not self.stream:
+            for xml_element in self.root:
+                if xml_element.tag in element_tags:
+                    yield xml_element
+            return
+        yield from self.iterparse(element_tags)
+
+    def iterparse(self, element_tags: Set[str]) -> Iterator[Element]:
+        """
+        Parses file in single pass, children of root are cleared after they were processed,
+        memory usage is therefore not proportional to size of file (elements must be processed
+        before next one is requested, or copied, since their content is removed).
+
+        :param element_tags: tags of xml elements (children of root) to be found
+        :return: generator of xml elements (including their children)
+        """
+        root: Optional[Element] = None
+        depth: int = 0
+        try:
+            for event, xml_element in ET.iterparse(self.file_path, events=("start", "end")):
+                if event == "start":
+                    root = xml_element if root is None else root
+                    depth += 1
+                    continue
+                depth -= 1
+                if depth != 1:  # Only children of root are returned (with their sub-elements)
+                    continue
+                elif xml_element.tag in element_tags:
+                    yield xml_element
+                xml_element.clear()
+                del root[:]
+        except ParseError as e:
+            print(
+                f"Unable to parse xml file: {self.file_path}\n"
+                f" got error: '{e}'\n, be sure the file is actually of type 'xml'!"
+            )
+
     def get_elements(self, element_tag: str, element_ids: Set[str]) -> Optional[List[Element]]:
         """
         :param element_tag: tag of xml element object (must be first child of root)
@@ -67,7 +119,7 @@ class XmlFile(MyFile):
     # ------------------------------------------ Utils ------------------------------------------
 
     def is_loaded(self) -> bool:
-        return super().is_loaded() and self.root is not None
+        return super().is_loaded() and (self.root is not None or self.stream)
 
     def get_known_path(self, file_name: str) -> str:
         raise NotImplementedError("Error, method 'get_known_path' must be implemented by subclasses of XmlFile class!")
@@ -18,6 +18,7 @@ class FileExtension:
     OSM: str = ".osm"
     SUMO_NETWORK: str = ".net.xml"
     EDGE_DUMP: str = ".out.xml"
+    NETWORK_SNAPSHOT: str = ".snapshot.npz"  # Binary snapshot of loaded ".net.xml" file
 
 
 # ---------------------------------- CWD ----------------------------------
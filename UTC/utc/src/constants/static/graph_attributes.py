@@ -1,4 +1,5 @@
 from typing import Dict, List, Any, Callable
+from sys import intern
 
 # ---------------------------------------------------- Methods ----------------------------------------------------
 
@@ -29,9 +30,10 @@ class EdgeAttributes:
     """
     LANE_WIDTH: int = 1
     LINES_STYLE: str = "solid"
+    # Identifiers and types are interned (shared by objects referencing them)
     EDGE_ATTRIBUTES: Dict[str, Callable] = {
-        "id": str, "from": str, "to": str,
-        "type": str, "shape": process_shape
+        "id": intern, "from": intern, "to": intern,
+        "type": intern, "shape": process_shape
     }
     LANE_ATTRIBUTES: Dict[str, Callable] = {
         "id": str, "length": float, "speed": float, "shape": process_shape
@@ -46,5 +48,5 @@ class NodeAttributes:
     NODE_SIZE: int = 3  # radius squared of node
     NODE_LABEL_SIZE: int = 6  # text size of nodes label
     JUNCTION_ATTRIBUTES: Dict[str, Callable] = {
-        "id": str, "type": str, "x": float, "y": float
+        "id": intern, "type": intern, "x": float, "y": float
     }
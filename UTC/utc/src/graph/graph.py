@@ -1,5 +1,5 @@
 from utc.src.graph.network import RoadNetwork
-from utc.src.graph.modules import GraphModule, Loader, Simplify, PathFinder, Display, SubGraph, Control
+from utc.src.graph.modules import GraphModule, Loader, Simplify, PathFinder, Alternatives, Display, SubGraph, Control
 
 
 class Graph(GraphModule):
@@ -10,6 +10,7 @@ class Graph(GraphModule):
         self.loader: Loader = Loader(self.road_network)
         self.simplify: Simplify = Simplify(self.road_network)
         self.path_finder: PathFinder = PathFinder(self.road_network)
+        self.alternatives: Alternatives = Alternatives(self.road_network)
         self.display: Display = Display(self.road_network)
         self.sub_graph: SubGraph = SubGraph(self.road_network)
         self.control: Control = Control(self.road_network)
@@ -23,6 +24,7 @@ class Graph(GraphModule):
         self.loader.set_network(self.road_network)
         self.simplify.set_network(self.road_network)
         self.path_finder.set_network(self.road_network)
+        self.alternatives.set_network(self.road_network)
         self.display.set_network(self.road_network)
         self.sub_graph.set_network(self.road_network)
         self.control.set_network(self.road_network)
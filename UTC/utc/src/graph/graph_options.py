@@ -7,6 +7,21 @@ class TopkaOptions(Options):
     """ Data class for TopKA* algorithm options """
     c: float = 1.3
     k: int = 3000
+    heuristic: str = "euclidean"  # Heuristic of A* search ('euclidean' or 'landmarks')
+    metric: str = "length"  # Cost of routes ('length' or current 'travel_time')
 
     def validate_options(self) -> bool:
         return self.validate_data(asdict(self), "TopkaOptions")
+
+
+@dataclass
+class AlternativesOptions(Options):
+    """ Data class for generators of alternative routes (used instead of TopKA*) """
+    generator: str = "penalty"  # Generator of routes ('penalty', 'plateau' or 'via_node')
+    count: int = 5  # Maximal number of routes (including the shortest one)
+    c: float = 1.3  # Multiplier of the shortest path length (maximal length of routes)
+    overlap: float = 0.8  # Maximal length of route shared with previous routes (fraction of its length)
+    penalty: float = 0.3  # Multiplier of length of routes used by found paths ('penalty' generator)
+
+    def validate_options(self) -> bool:
+        return self.validate_data(asdict(self), "AlternativesOptions")
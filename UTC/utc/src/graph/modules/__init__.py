@@ -2,6 +2,7 @@ from utc.src.graph.modules.graph_module import GraphModule
 from utc.src.graph.modules.display import Display
 from utc.src.graph.modules.loader import Loader
 from utc.src.graph.modules.path_finder import PathFinder
+from utc.src.graph.modules.alternatives import Alternatives
 from utc.src.graph.modules.simplify import Simplify
 from utc.src.graph.modules.sub_graph import SubGraph
 from utc.src.graph.modules.control import Control
@@ -0,0 +1,239 @@
+from utc.src.graph.modules.graph_module import GraphModule
+from utc.src.graph.network import RoadNetwork, Route, CsrGraph
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+import numpy as np
+from typing import Iterator, List, Optional, Set, Tuple
+
+
+class Alternatives(GraphModule):
+    """
+    Class implementing generators of alternative routes, which produce small set of diverse routes directly
+    (instead of enumerating routes by TopKA* and clustering them). Searches run on turn-expanded graph of routes
+    (weights are lengths of entered routes) between starting and goal edge (same as 'top_k_a_star2'), candidate
+    routes are accepted if they are not longer than 'c' * shortest_route_length and do not share more than
+    'overlap' of their length with previously accepted routes. The shortest route is always the first.
+    """
+    GENERATORS: Tuple[str, ...] = ("penalty", "plateau", "via_node")
+
+    def __init__(self, road_network: RoadNetwork):
+        super().__init__(road_network)
+        self._csr: Optional[CsrGraph] = None  # Array representation of network, for which graph was built
+        self._graphs: Optional[Tuple[csr_matrix, csr_matrix]] = None  # Turn-expanded graph and its transposition
+
+    def find_routes(
+            self, generator: str, start_edge_id: str, goal_edge_id: str,
+            count: int = 5, c: float = 1.3, overlap: float = 0.8, penalty: float = 0.3
+        ) -> Optional[List[Route]]:
+        """
+        :param generator: of routes ('penalty', 'plateau' or 'via_node')
+        :param start_edge_id: ID of starting edge
+        :param goal_edge_id: ID of goal edge
+        :param count: maximal number of routes (including the shortest one), default 5
+        :param c: multiplier of the shortest path length (maximal length of routes), default 1.3
+        :param overlap: maximal length of route shared with previous routes (fraction of its length), default 0.8
+        :param penalty: multiplier of length of routes used by found paths ('penalty' generator), default 0.3
+        :return: List of routes (the shortest route is the first), None if shortest route does not exist
+        """
+        # -------------------------------- checks --------------------------------
+        if generator not in self.GENERATORS:
+            print(f"Unknown generator: '{generator}', expected one of: {self.GENERATORS} !")
+            return None
+        elif c <= 1:
+            print(f"Parameter 'c' has to be greater than 1, got: '{c}' !")
+            return None
+        elif count < 1:
+            print(f"Parameter 'count' has to be at least 1, got: '{count}' !")
+            return None
+        elif not (0 < overlap <= 1) or penalty <= 0:
+            print(f"Parameters 'overlap' and 'penalty' have to be in (0, 1] and positive, got: '{overlap, penalty}' !")
+            return None
+        terminals: Optional[Tuple[int, int]] = self.get_terminals(start_edge_id, goal_edge_id)
+        if terminals is None:
+            return None
+        # -------------------------------- init --------------------------------
+        lengths: np.ndarray = self.road_network.get_route_costs().length
+        forward, forward_pred = dijkstra(self.get_graphs()[0], indices=terminals[0], return_predecessors=True)
+        forward += lengths[terminals[0]]  # Distances include starting route
+        if not np.isfinite(forward[terminals[1]]):
+            print(f"No path exists between edge '{start_edge_id}' and edge '{goal_edge_id}'")
+            return None
+        limit: float = round(c * forward[terminals[1]], 3)
+        if generator == "penalty":
+            paths: Iterator[List[int]] = self.penalty(terminals[0], terminals[1], count, penalty)
+        else:
+            backward, backward_pred = dijkstra(self.get_graphs()[1], indices=terminals[1], return_predecessors=True)
+            trees: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray] = (
+                forward, forward_pred, backward, backward_pred
+            )
+            paths = (self.plateau if generator == "plateau" else self.via_node)(terminals[0], terminals[1], trees, limit)
+        # -------------------------------- Selection --------------------------------
+        route_edges: List[List[int]] = self.road_network.get_csr().get_route_edge_lists()
+        routes: List[Route] = []
+        for path in self.select(paths, lengths, count, overlap, limit):
+            edges: List[int] = [edge for route_id in path for edge in route_edges[route_id]]
+            assert (self.road_network.check_edge_sequence(edges))
+            routes.append(Route(self.road_network.get_edges(edges)))
+        return routes
+
+    # -------------------------------------- Generators --------------------------------------
+
+    def penalty(self, start: int, goal: int, count: int, penalty: float) -> Iterator[List[int]]:
+        """
+        Penalty method, after each search lengths of routes on found path are
+        multiplied by (1 + penalty), so that next search avoids them.
+
+        :param start: internal id of starting route
+        :param goal: internal id of goal route
+        :param count: number of routes, searches are limited to 3 * count
+        :param penalty: multiplier of lengths of used routes
+        :return: Generator of paths (internal id's of routes), the first is the shortest
+        """
+        graph: csr_matrix = self.get_graphs()[0].copy()
+        weights: np.ndarray = self.road_network.get_route_costs().length.copy()
+        for _ in range(3 * count):
+            # Transition to route 'j' costs weight of route 'j' (columns of graph)
+            graph.data = weights[graph.indices]
+            distances, predecessors = dijkstra(graph, indices=start, return_predecessors=True)
+            if not np.isfinite(distances[goal]):
+                return
+            path: List[int] = self.get_path(predecessors, goal)
+            weights[path] *= (1 + penalty)
+            yield path
+
+    def plateau(
+            self, start: int, goal: int,
+            trees: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray], limit: float
+        ) -> Iterator[List[int]]:
+        """
+        Plateau method, plateaus are the longest chains of routes shared by the shortest path tree
+        from starting route and the (reversed) shortest path tree to goal route. Paths
+        trough plateaus are generated in descending order of plateau length.
+
+        :param start: internal id of starting route
+        :param goal: internal id of goal route
+        :param trees: distances from start, their predecessors, distances to goal and their successors
+        :param limit: maximal length of paths
+        :return: Generator of paths (internal id's of routes), the first is the shortest
+        """
+        forward, forward_pred, backward, backward_succ = trees
+        yield self.get_path(forward_pred, goal)
+        # Route 'r' is on plateau if transition from its predecessor to 'r' is in both trees
+        reached: np.ndarray = np.flatnonzero(forward_pred >= 0)
+        linked: np.ndarray = np.zeros(len(forward), dtype=bool)
+        linked[reached] = backward_succ[forward_pred[reached]] == reached
+        # Plateau ends on linked route, whose successor is not linked to it
+        successors: np.ndarray = np.where(backward_succ >= 0, backward_succ, 0)
+        ends: np.ndarray = np.flatnonzero(linked & ~(
+            (backward_succ >= 0) & linked[successors] & (forward_pred[successors] == np.arange(len(forward)))
+        ))
+        plateaus: List[Tuple[float, int]] = []
+        for end in ends[(forward[ends] + backward[ends]) <= limit].tolist():
+            first: int = end
+            while linked[first]:
+                first = int(forward_pred[first])
+            plateaus.append((-(forward[end] - forward[first]), end))
+        for _, end in sorted(plateaus):
+            yield self.get_path(forward_pred, end) + self.get_path(backward_succ, end, False)[1:]
+
+    def via_node(
+            self, start: int, goal: int,
+            trees: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray], limit: float
+        ) -> Iterator[List[int]]:
+        """
+        Via-node method, path trough via route 'v' is the shortest path from starting route to 'v'
+        followed by the shortest path from 'v' to goal route. Via routes are tried in ascending
+        order of path length, skipping routes of already generated paths.
+
+        :param start: internal id of starting route
+        :param goal: internal id of goal route
+        :param trees: distances from start, their predecessors, distances to goal and their successors
+        :param limit: maximal length of paths
+        :return: Generator of paths (internal id's of routes), the first is the shortest
+        """
+        forward, forward_pred, backward, backward_succ = trees
+        totals: np.ndarray = forward + backward
+        candidates: np.ndarray = np.flatnonzero(totals <= limit)
+        generated: Set[int] = set()
+        for via in candidates[np.argsort(totals[candidates], kind="stable")].tolist():
+            if via in generated:
+                continue
+            path: List[int] = self.get_path(forward_pred, via) + self.get_path(backward_succ, via, False)[1:]
+            generated.update(path)
+            yield path
+
+    # -------------------------------------- Utils --------------------------------------
+
+    def select(
+            self, paths: Iterator[List[int]], lengths: np.ndarray,
+            count: int, overlap: float, limit: float
+        ) -> List[List[int]]:
+        """
+        :param paths: candidate paths (internal id's of routes), in order of preference
+        :param lengths: of routes (indexed by internal id's of routes)
+        :param count: maximal number of selected paths
+        :param overlap: maximal length of path shared with selected paths (fraction of its length)
+        :param limit: maximal length of paths
+        :return: Selected paths (without loops or duplicates)
+        """
+        route_edges: List[List[int]] = self.road_network.get_csr().get_route_edge_lists()
+        selected: List[List[int]] = []
+        found: Set[Tuple[int, ...]] = set()
+        used: Set[int] = set()
+        for path in paths:
+            if len(selected) >= count:
+                break
+            length: float = float(lengths[path].sum())
+            edges: List[int] = [edge for route_id in path for edge in route_edges[route_id]]
+            # Too long, duplicate or with loop (visiting the same edge multiple times)
+            if length > limit or tuple(path) in found or len(set(edges)) != len(edges):
+                continue
+            shared: float = sum(float(lengths[route_id]) for route_id in path if route_id in used)
+            if selected and shared > overlap * length:
+                continue
+            selected.append(path)
+            found.add(tuple(path))
+            used.update(path)
+        return selected
+
+    # noinspection PyMethodMayBeStatic
+    def get_path(self, predecessors: np.ndarray, route_id: int, reverse: bool = True) -> List[int]:
+        """
+        :param predecessors: of routes in shortest path tree (-9999 for root and unreached routes)
+        :param route_id: internal id of route reached by search
+        :param reverse: if path should be reversed (i.e. from root of tree), default True
+        :return: Internal id's of routes between root of tree and given route
+        """
+        path: List[int] = [route_id]
+        while predecessors[path[-1]] >= 0:
+            path.append(int(predecessors[path[-1]]))
+        if reverse:
+            path.reverse()
+        return path
+
+    def get_graphs(self) -> Tuple[csr_matrix, csr_matrix]:
+        """
+        :return: Turn-expanded graph of routes weighted by their lengths and its transposition,
+        built again after network was changed
+        """
+        if self._csr is not self.road_network.get_csr() or self._graphs is None:
+            self._csr = self.road_network.get_csr()
+            graph: csr_matrix = self.road_network.get_route_costs().get_graph("length")
+            self._graphs = (graph, graph.transpose().tocsr())
+        return self._graphs
+
+    def get_terminals(self, start_edge_id: str, goal_edge_id: str) -> Optional[Tuple[int, int]]:
+        """
+        :param start_edge_id: ID of starting edge
+        :param goal_edge_id: ID of goal edge
+        :return: Internal id's of starting and goal routes (sharing internal id with edges), None if they do not exist
+        """
+        if not (self.road_network.edge_exists(start_edge_id) and self.road_network.edge_exists(goal_edge_id)):
+            print(f"Edges '{start_edge_id}' and '{goal_edge_id}' have to exist in network !")
+            return None
+        start_edge, goal_edge = self.road_network.get_edges([start_edge_id, goal_edge_id])
+        if not (self.road_network.route_exists(start_edge.internal_id) and
+                self.road_network.route_exists(goal_edge.internal_id)):
+            print(f"Edges '{start_edge_id}' and '{goal_edge_id}' have to start routes of network !")
+            return None
+        return start_edge.internal_id, goal_edge.internal_id
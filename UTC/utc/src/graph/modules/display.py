@@ -89,17 +89,29 @@ class Display(GraphModule):
 
     # -------------------------------------------- Render Objects --------------------------------------------
 
-    def render_graph(self, ax: plt.Axes, colored: bool = True, annotate: bool = False) -> None:
+    def render_graph(
+            self, ax: plt.Axes, colored: bool = True, annotate: bool = False,
+            viewport: Optional[Tuple[float, float, float, float]] = None
+        ) -> None:
         """
         :param ax: current matplotlib axes
         :param colored: True if fringe junctions should be colored, false otherwise
         :param annotate: True if junctions should display their internal id, False by default (limited to 100)
+        :param viewport: bounding box (x_min, y_min, x_max, y_max), only objects inside of it
+        are rendered (found by spatial index of network), None by default (everything is rendered)
         :return: None
         """
+        visible: Set[str] = set(self.road_network.junctions.keys())
+        edges: List[Edge] = list(self.road_network.edges.values())
+        if viewport is not None:
+            visible = set(self.road_network.get_spatial_index().junctions_in_box(*viewport))
+            edges = self.road_network.get_edges(self.road_network.get_spatial_index().edges_in_box(*viewport))
         if colored:
-            self.render_junctions(ax, self.road_network.get_inner_junctions())
-            starting_junction: set = self.road_network.starting_junctions
-            ending_junctions: set = self.road_network.ending_junctions
+            self.render_junctions(
+                ax, [junction for junction in self.road_network.get_inner_junctions() if junction.id in visible]
+            )
+            starting_junction: set = self.road_network.starting_junctions & visible
+            ending_junctions: set = self.road_network.ending_junctions & visible
             common: set = (starting_junction & ending_junctions)
             starting_junction ^= common
             ending_junctions ^= common
@@ -116,8 +128,8 @@ class Display(GraphModule):
                 colors=GraphColors.JUNCTION_START_END_COLOR, annotate=annotate
             )
         else:
-            self.render_junctions(ax, self.road_network.get_junctions_list(), annotate=annotate)
-        self.render_edges(ax, list(self.road_network.edges.values()))
+            self.render_junctions(ax, self.road_network.get_junctions(visible), annotate=annotate)
+        self.render_edges(ax, edges)
         return
 
     # noinspection PyMethodMayBeStatic
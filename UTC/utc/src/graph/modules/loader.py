@@ -1,8 +1,12 @@
 from utc.src.constants.static.graph_attributes import EdgeAttributes, NodeAttributes, filter_attributes
 from utc.src.constants.file_system.file_types.sumo_network_file import SumoNetworkFile
+from utc.src.constants.file_system.file_types.network_snapshot_file import NetworkSnapshotFile
 from utc.src.graph.modules.graph_module import GraphModule
-from utc.src.graph.network import RoadNetwork, Junction, Edge, Route
-from typing import Dict, List, Set, Optional
+from utc.src.graph.network import RoadNetwork, SpatialIndex, Landmarks, Junction, Edge, Route
+from utc.src.graph.network.parts import Shape
+from typing import Dict, List, Set, Tuple, Optional, Any
+from sys import intern
+import numpy as np
 
 
 class Loader(GraphModule):
@@ -12,55 +16,106 @@ class Loader(GraphModule):
         super().__init__(road_network)
         self.network_file: Optional[SumoNetworkFile] = None
 
-    def load_map(self, network_path: str) -> bool:
+    def load_map(self, network_path: str, snapshot: bool = True) -> bool:
         """
         :param network_path: path to network file (default is utc/data/maps/sumo)
+        :param snapshot: True if network should be loaded from binary snapshot (created
+        next to network file on first load, rebuilt when network file changes), default True
         :return: true on success, false otherwise
         """
         # print(f"Loading network: '{network_path}'")
-        self.network_file = SumoNetworkFile(network_path)
+        snapshot_file: Optional[NetworkSnapshotFile] = NetworkSnapshotFile(network_path) if snapshot else None
+        if snapshot_file is not None:
+            arrays: Optional[Dict[str, np.ndarray]] = snapshot_file.load_arrays()
+            if arrays is not None:
+                if not self.load_snapshot(arrays):
+                    print(f"Error while loading network snapshot: '{snapshot_file}' !")
+                    return False
+                self.road_network.map_name = snapshot_file.get_file_name(snapshot_file.network_path)
+                return True
+        self.network_file = SumoNetworkFile(network_path, stream=True)
         if not self.network_file.is_loaded():  # File does not exist
             return False
-        elif not self.load_junctions():
+        junctions, edges, connections, roundabouts = self.read_network()
+        if not self.load_junctions(junctions):
             print("Error while loading junctions!")
             return False
-        elif not self.load_edges():
+        elif not self.load_edges(edges):
             print("Error while loading edges!")
             return False
-        elif not self.load_connections():  # Error in connections (missing Junction / Edge id, ..)
+        elif not self.load_connections(connections=connections):  # Error in connections (missing Edge id, ..)
             return False
-        self.road_network.roundabouts = self.load_roundabouts()
+        self.road_network.roundabouts = self.load_roundabouts(roundabouts)
         self.road_network.map_name = self.network_file.get_name()
         # print("Finished loading road network")
         # return True
-        return self.check_status()
+        if not self.check_status(junctions, edges, connections):
+            return False
+        # Spatial index is built once (stored in snapshot)
+        self.road_network.get_spatial_index()
+        # Failing to save snapshot is not an error, network will be loaded from file next time
+        if snapshot_file is not None:
+            snapshot_file.save(arrays=self.create_snapshot())
+        return True
+
+    def read_network(self) -> Tuple[
+            List[Dict[str, Any]], List[Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]],
+            Dict[str, Set[str]], List[List[str]]
+        ]:
+        """
+        Reads network ('.net.xml') file in single pass, xml elements are
+        discarded after their attributes were extracted.
+
+        :return: Attributes of junctions, attributes of edges with attributes of their lanes,
+        connections (mapping of edge id to incoming edge id's) and roundabouts (list of junction id's)
+        """
+        junctions: List[Dict[str, Any]] = []
+        edges: List[Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]] = []
+        connections: Dict[str, Set[str]] = {
+            # to_edge_id: {from_edge_id, ..}, ..
+        }
+        roundabouts: List[List[str]] = []
+        for xml_element in self.network_file.get_network_elements():
+            if xml_element.tag == "junction":
+                junctions.append(filter_attributes(xml_element.attrib, NodeAttributes.JUNCTION_ATTRIBUTES))
+            elif xml_element.tag == "edge":
+                lane_attributes: Dict[str, Dict[str, Any]] = {}
+                for lane in xml_element.findall("lane"):
+                    lane_attributes[lane.attrib["id"]] = filter_attributes(lane.attrib, EdgeAttributes.LANE_ATTRIBUTES)
+                edges.append((filter_attributes(xml_element.attrib, EdgeAttributes.EDGE_ATTRIBUTES), lane_attributes))
+            elif xml_element.tag == "connection":
+                if xml_element.attrib["to"] not in connections:
+                    connections[xml_element.attrib["to"]] = set()
+                connections[xml_element.attrib["to"]].add(xml_element.attrib["from"])
+            else:
+                roundabouts.append(xml_element.attrib["nodes"].split())
+        return junctions, edges, connections, roundabouts
 
-    def load_junctions(self) -> bool:
+    def load_junctions(self, junctions: List[Dict[str, Any]]) -> bool:
         """
-        Loads junctions from network ('.net.xml') file, must be called first!
+        Creates junctions from their attributes, must be called first!
 
+        :param junctions: attributes of junctions (their order defines internal id's)
         :return: True on success, false otherwise
         """
         # print("Loading & creating junctions")
-        for index, xml_junction in enumerate(self.network_file.get_junctions()):
-            attributes: dict = filter_attributes(xml_junction.attrib, NodeAttributes.JUNCTION_ATTRIBUTES)
-            if not self.road_network.add_junction(Junction(attributes, index)):
+        for index, attributes in enumerate(junctions):
+            # Junction removes 'id' from attributes
+            if not self.road_network.add_junction(Junction(dict(attributes), index)):
                 return False
         # print("Finished loading & creating junctions")
         return len(self.road_network.junctions) != 0
 
-    def load_edges(self) -> bool:
+    def load_edges(self, edges: List[Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]]) -> bool:
         """
-        Loads edges from network ('.net.xml') file, must be called after loading junctions!
+        Creates edges (and routes representing them) from their attributes, must be called after loading junctions!
 
+        :param edges: attributes of edges and their lanes (their order defines internal id's)
         :return: True on success, false otherwise
         """
         # print("Loading & creating edges, routes")
-        for index, xml_edge in enumerate(self.network_file.get_edges()):
-            attributes: dict = filter_attributes(xml_edge.attrib, EdgeAttributes.EDGE_ATTRIBUTES)
-            lane_attributes: dict = {}
-            for lane in xml_edge.findall("lane"):
-                lane_attributes[lane.attrib["id"]] = filter_attributes(lane.attrib, EdgeAttributes.LANE_ATTRIBUTES)
+        self.pack_shapes(edges)
+        for index, (attributes, lane_attributes) in enumerate(edges):
             edge: Edge = Edge(attributes, lane_attributes, index)
             if not self.road_network.add_edge(edge):
                 return False
@@ -69,27 +124,24 @@ class Loader(GraphModule):
         # print("Finished loading & creating edges, routes")
         return len(self.road_network.edges) != 0
 
-    def load_connections(self, self_loops: bool = True) -> bool:
+    def load_connections(self, self_loops: bool = True, connections: Dict[str, Set[str]] = None) -> bool:
         """
         Loads connections from network ('.net.xml') file, assigns routes to junctions,
         identifies starting/ending junctions, must be called after loading edges & junctions!
 
         :param self_loops: True if loops on fringe junctions should be allowed, False by default
+        :param connections: mapping of edge id to incoming edge id's, if None, they are loaded from network file
         :return: True on success, false otherwise
         """
         # print("Loading & creating connections between junctions")
         # ----------------- Connections -----------------
-        connections: Dict[str, Set[str]] = {
-            # to_edge_id: {from_edge_id, ..}, ..
-        }
-        for connection in self.network_file.get_connections():
-            if connection.attrib["to"] not in connections:
-                connections[connection.attrib["to"]] = set()
-            connections[connection.attrib["to"]].add(connection.attrib["from"])
-            # Check existence
-            for edge_id in [connection.attrib["to"], connection.attrib["from"]]:
-                if not self.road_network.edge_exists(edge_id):
-                    print(f"Invalid connection edge: '{edge_id}', corresponding edge does not exist!")
+        if connections is None:
+            connections = self.get_connections()
+        # Check existence
+        for edge_id, in_edges in connections.items():
+            for connection_edge_id in ({edge_id} | in_edges):
+                if not self.road_network.edge_exists(connection_edge_id):
+                    print(f"Invalid connection edge: '{connection_edge_id}', corresponding edge does not exist!")
                     return False
         # print(connections)
         # Disable turnarounds (u-turns) on junctions
@@ -101,81 +153,237 @@ class Loader(GraphModule):
         #             connections[edge_id] -= {neigh_edge}
         #             connections[neigh_edge] -= {edge_id}
 
+        # Check if we allow self loops, edges forming loop are used as starting
+        if not self_loops:
+            connections = {
+                edge_id: in_edges for edge_id, in_edges in connections.items()
+                if not (len(in_edges) == 1 and self.is_loop(edge_id, next(iter(in_edges))))
+            }
         # ------------------- Assign routes, to junctions -------------------
-        for route in self.road_network.routes.values():
-            # Routes only have 1 edge each
-            edge_id: str = route.first_edge().get_id()
-            from_junction: Junction = self.road_network.get_junction(route.get_start())
-            to_junction: Junction = self.road_network.get_junction(route.get_destination())
-            to_junction.add_connection(route, None)
-            if edge_id in connections:
-                # Check if we allow self loops
-                if not self_loops and len(connections[edge_id]) == 1 and \
-                        self.is_loop(edge_id, next(iter(connections[edge_id]))):
-                    # print(f"Found loop at junction: {self.road_network.edges[edge_id].from_junction}, changing route!")
-                    from_junction.add_connection(None, route)
-                else:
-                    for in_edge_id in connections[edge_id]:
-                        # Map internal edge id into route (when network is not modified, mapping is 1:1),
-                        # meaning, internal id of edge corresponds to route that represents this edge
-                        from_junction.add_connection(
-                            self.road_network.get_route(self.road_network.edges[in_edge_id].get_id(internal=True)),
-                            route
-                        )
-            else:  # No connection to this edge, from_junction is fringe (starting)
-                from_junction.add_connection(None, route)
-                # print(f"Junction: {from_junction.get_id(False)} is starting !")
+        if not self.road_network.assign_connections(connections):
+            return False
         # ------------------- Starting & ending junctions -----------------
         # Find nodes, which have only 1 in_route and 1 out_route,
         # if in_route_start is equal to out_route_destination, remove it
         for junction in self.road_network.junctions.values():
             in_routes: List[Route] = junction.get_in_routes()
             out_routes: List[Route] = junction.get_out_routes()
-            if len(in_routes) == len(out_routes) == 1:
+            if not self_loops and len(in_routes) == len(out_routes) == 1:
                 in_route: Route = in_routes[0]
                 out_route: Route = out_routes[0]
                 # Remove self loops on fringe junctions
-                if not self_loops and junction.connection_exists(in_route, out_route, False) and \
+                if junction.connection_exists(in_route, out_route, False) and \
                         in_route.get_start() == out_route.get_destination():
                     # Change self loop, incoming route will be 'None'
                     raise ValueError("Found loop, should have been removed before!")
                     # junction.remove_connection(in_route, out_route)
                     # junction.add_connection(None, out_route)
-            # Check junctions if they are on fringe
-            self.road_network.check_fringe(junction)
         # print("Finished loading & creating edges, connections")
         return True
 
-    def load_roundabouts(self) -> List[List[str]]:
+    def load_roundabouts(self, roundabouts: List[List[str]]) -> List[List[str]]:
         """
-        :return: List of roundabouts (each roundabout is list of junctions ids forming it)
+        :param roundabouts: list of junction id's forming roundabouts
+        :return: List of roundabouts (each roundabout is list of junctions ids forming it), which are correct
         """
-        roundabouts: list = []
-        for xml_roundabout in self.network_file.get_roundabouts():
-            roundabout: List[str] = xml_roundabout.attrib["nodes"].split()
-            # Check for correctness (this is important when loading sub-graphs)
-            if self.check_roundabout(roundabout):
-                roundabouts.append(roundabout)
-        return roundabouts
+        # Check for correctness (this is important when loading sub-graphs)
+        return [roundabout for roundabout in roundabouts if self.check_roundabout(roundabout)]
 
-    # ----------------------------------- Utils -----------------------------------
+    # ----------------------------------- Snapshot -----------------------------------
 
-    def check_status(self, self_loops: bool = True) -> bool:
+    def load_snapshot(self, arrays: Dict[str, np.ndarray]) -> bool:
         """
-        :return: True if network was loaded correctly, False otherwise
+        Loads junctions, edges, routes, connections and roundabouts from arrays of
+        network snapshot (created by 'create_snapshot' method), objects are given the same
+        internal id's as when loaded from network file.
+
+        :param arrays: loaded from snapshot file
+        :return: True on success, false otherwise
         """
-        if self.network_file is None:
-            print(f"Expected network file!")
+        # ----------------- Junctions -----------------
+        junction_xy: List[List[float]] = arrays["junction_xy"].tolist()
+        junctions: List[Dict[str, Any]] = [
+            {"id": junction_id, "type": junction_type, "x": junction_xy[index][0], "y": junction_xy[index][1]}
+            for index, (junction_id, junction_type) in enumerate(
+                zip(map(intern, arrays["junction_id"].tolist()), map(intern, arrays["junction_type"].tolist()))
+            )
+        ]
+        if not self.load_junctions(junctions):
+            print("Error while loading junctions!")
             return False
-        # print(f"Checking if network connections were build correctly ...")
-        # 1st check that all junctions & edges were loaded
-        for xml_junction in self.network_file.get_junctions():
-            if xml_junction.attrib["id"] not in self.road_network.junctions:
-                return False
-        for xml_edge in self.network_file.get_edges():
-            if xml_edge.attrib["id"] not in self.road_network.edges:
-                return False
-        # 2nd check that connections represented by junctions correspond to what is in file
+        # ----------------- Edges & Routes -----------------
+        edge_shapes: List[Optional[Shape]] = self.decode_shapes(
+            arrays["edge_shape_coords"], arrays["edge_shape_offsets"], arrays["edge_has_shape"]
+        )
+        lane_shapes: List[Optional[Shape]] = self.decode_shapes(
+            arrays["lane_shape_coords"], arrays["lane_shape_offsets"], arrays["lane_has_shape"]
+        )
+        lane_ids: List[str] = arrays["lane_id"].tolist()
+        lane_lengths: List[float] = arrays["lane_length"].tolist()
+        lane_speeds: List[float] = arrays["lane_speed"].tolist()
+        lane_offsets: List[int] = arrays["lane_offsets"].tolist()
+        edge_types: List[str] = list(map(intern, arrays["edge_type"].tolist()))
+        edge_has_type: List[bool] = arrays["edge_has_type"].tolist()
+        edges: List[Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]] = []
+        for index, (edge_id, from_junction, to_junction) in enumerate(zip(
+                map(intern, arrays["edge_id"].tolist()), map(intern, arrays["edge_from"].tolist()),
+                map(intern, arrays["edge_to"].tolist()))):
+            attributes: Dict[str, Any] = {"id": edge_id, "from": from_junction, "to": to_junction}
+            if edge_has_type[index]:
+                attributes["type"] = edge_types[index]
+            if edge_shapes[index] is not None:
+                attributes["shape"] = edge_shapes[index]
+            lane_attributes: Dict[str, Dict[str, Any]] = {}
+            for lane in range(lane_offsets[index], lane_offsets[index + 1]):
+                lane_attributes[lane_ids[lane]] = {
+                    "id": lane_ids[lane], "length": lane_lengths[lane], "speed": lane_speeds[lane]
+                }
+                if lane_shapes[lane] is not None:
+                    lane_attributes[lane_ids[lane]]["shape"] = lane_shapes[lane]
+            edges.append((attributes, lane_attributes))
+        if not self.load_edges(edges):
+            print("Error while loading edges!")
+            return False
+        # ----------------- Connections -----------------
+        edge_ids: List[str] = arrays["edge_id"].tolist()
+        connections: Dict[str, Set[str]] = {}
+        for from_edge, to_edge in zip(arrays["connection_from"].tolist(), arrays["connection_to"].tolist()):
+            if edge_ids[to_edge] not in connections:
+                connections[edge_ids[to_edge]] = set()
+            connections[edge_ids[to_edge]].add(edge_ids[from_edge])
+        if not self.load_connections(connections=connections):
+            return False
+        # ----------------- Roundabouts -----------------
+        roundabout_junctions: List[str] = arrays["roundabout_junctions"].tolist()
+        roundabout_offsets: List[int] = arrays["roundabout_offsets"].tolist()
+        self.road_network.roundabouts = [
+            roundabout_junctions[roundabout_offsets[i]:roundabout_offsets[i + 1]]
+            for i in range(len(roundabout_offsets) - 1)
+        ]
+        # Connections were checked against network file, when snapshot was created
+        self.road_network.edge_connections = self.road_network.get_edges_connections()
+        # ----------------- Spatial index -----------------
+        self.road_network.set_spatial_index(SpatialIndex(
+            [junction["id"] for junction in junctions], np.arange(len(junctions)), arrays["junction_xy"],
+            edge_ids, np.arange(len(edge_ids)), arrays["edge_centroid"], arrays["edge_bbox"]
+        ))
+        # ----------------- Landmarks -----------------
+        landmarks: Optional[Landmarks] = Landmarks.from_arrays(arrays)
+        if landmarks is not None:
+            self.road_network.set_landmarks(landmarks)
+        return True
+
+    def create_snapshot(self) -> Dict[str, np.ndarray]:
+        """
+        Creates arrays describing loaded network (must be called right after
+        network was loaded from file, before it is modified in any way).
+
+        :return: Dictionary mapping name of array to array
+        """
+        junctions: List[Junction] = sorted(self.road_network.junctions.values(), key=lambda j: j.internal_id)
+        edges: List[Edge] = sorted(self.road_network.edges.values(), key=lambda e: e.internal_id)
+        lanes: List[Dict[str, Any]] = [lane for edge in edges for lane in edge.lanes.values()]
+        edge_index: Dict[str, int] = {edge.id: index for index, edge in enumerate(edges)}
+        connections: List[Tuple[int, int]] = [
+            (edge_index[from_edge], edge_index[to_edge])
+            for to_edge, in_edges in self.road_network.edge_connections.items() for from_edge in in_edges
+        ]
+        edge_shape_coords, edge_shape_offsets, edge_has_shape = self.encode_shapes(
+            [edge.attributes.get("shape", None) for edge in edges]
+        )
+        lane_shape_coords, lane_shape_offsets, lane_has_shape = self.encode_shapes(
+            [lane.get("shape", None) for lane in lanes]
+        )
+        roundabouts: List[List[str]] = self.road_network.roundabouts
+        # Geometry of edges in order of their internal id's
+        spatial_index: SpatialIndex = self.road_network.get_spatial_index()
+        edge_order: np.ndarray = np.argsort(spatial_index.edge_index)
+        return {
+            # Junctions
+            "junction_id": np.array([junction.id for junction in junctions], dtype=str),
+            "junction_type": np.array([junction.attributes["type"] for junction in junctions], dtype=str),
+            "junction_xy": np.array(
+                [[junction.attributes["x"], junction.attributes["y"]] for junction in junctions], dtype=np.float64
+            ).reshape(-1, 2),
+            # Edges
+            "edge_id": np.array([edge.id for edge in edges], dtype=str),
+            "edge_from": np.array([edge.from_junction for edge in edges], dtype=str),
+            "edge_to": np.array([edge.to_junction for edge in edges], dtype=str),
+            "edge_type": np.array([edge.attributes.get("type", "") for edge in edges], dtype=str),
+            "edge_has_type": np.array(["type" in edge.attributes for edge in edges], dtype=bool),
+            "edge_shape_coords": edge_shape_coords,
+            "edge_shape_offsets": edge_shape_offsets,
+            "edge_has_shape": edge_has_shape,
+            "edge_centroid": spatial_index.edge_centroid[edge_order],
+            "edge_bbox": spatial_index.edge_bbox[edge_order],
+            # Lanes, lanes of edge 'i' are: lane_offsets[i]:lane_offsets[i+1]
+            "lane_offsets": np.cumsum([0] + [edge.get_lane_count() for edge in edges], dtype=np.int64),
+            "lane_id": np.array([lane["id"] for lane in lanes], dtype=str),
+            "lane_length": np.array([lane["length"] for lane in lanes], dtype=np.float64),
+            "lane_speed": np.array([lane["speed"] for lane in lanes], dtype=np.float64),
+            "lane_shape_coords": lane_shape_coords,
+            "lane_shape_offsets": lane_shape_offsets,
+            "lane_has_shape": lane_has_shape,
+            # Connections (pairs of edge indexes)
+            "connection_from": np.array([from_edge for from_edge, _ in connections], dtype=np.int32),
+            "connection_to": np.array([to_edge for _, to_edge in connections], dtype=np.int32),
+            # Roundabouts, junctions of roundabout 'i' are: roundabout_offsets[i]:roundabout_offsets[i+1]
+            "roundabout_junctions": np.array(
+                [junction_id for roundabout in roundabouts for junction_id in roundabout], dtype=str
+            ),
+            "roundabout_offsets": np.cumsum([0] + [len(roundabout) for roundabout in roundabouts], dtype=np.int64),
+            # Landmarks, distance tables are indexed by internal id's of routes
+            **self.road_network.get_landmarks().to_arrays()
+        }
+
+    @staticmethod
+    def encode_shapes(shapes: List[Optional[Shape]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        :param shapes: list of shapes, can be None
+        :return: Coordinates of all shapes, offsets of shapes in coordinates, mask of shapes which are not None
+        """
+        coords: List[np.ndarray] = [np.zeros((0, 2), dtype=np.float64)] + [
+            np.asarray(shape, dtype=np.float64).reshape(-1, 2) for shape in shapes if shape is not None
+        ]
+        offsets: np.ndarray = np.cumsum(
+            [0] + [len(shape) if shape is not None else 0 for shape in shapes], dtype=np.int64
+        )
+        return np.concatenate(coords), offsets, np.array([shape is not None for shape in shapes], dtype=bool)
+
+    @staticmethod
+    def decode_shapes(coords: np.ndarray, offsets: np.ndarray, mask: np.ndarray) -> List[Optional[Shape]]:
+        """
+        :param coords: of all shapes
+        :param offsets: of shapes in coordinates
+        :param mask: of shapes which are not None
+        :return: List of shapes (sharing coordinates), None for shapes which were not present
+        """
+        return Shape.from_buffer(coords, offsets.tolist(), mask.tolist())
+
+    @staticmethod
+    def pack_shapes(edges: List[Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]]) -> None:
+        """
+        Replaces shapes (lists of coordinates) of edges and their lanes by
+        shapes stored in one shared coordinate buffer (in place).
+
+        :param edges: attributes of edges and their lanes
+        :return: None
+        """
+        attributes: List[Dict[str, Any]] = [
+            edge_attributes for edge, lanes in edges for edge_attributes in ([edge] + list(lanes.values()))
+            if isinstance(edge_attributes.get("shape", None), list)
+        ]
+        if not attributes:
+            return
+        for shape_attributes, shape in zip(attributes, Shape.create_shapes([a["shape"] for a in attributes])):
+            shape_attributes["shape"] = shape
+
+    # ----------------------------------- Utils -----------------------------------
+
+    def get_connections(self) -> Dict[str, Set[str]]:
+        """
+        :return: Mapping of edge id to incoming edge id's, as defined by connections in network file
+        """
         connections: Dict[str, Set[str]] = {
             # to_edge_id: {from_edge_id, ..}, ..
         }
@@ -183,6 +391,30 @@ class Loader(GraphModule):
             if connection.attrib["to"] not in connections:
                 connections[connection.attrib["to"]] = set()
             connections[connection.attrib["to"]].add(connection.attrib["from"])
+        return connections
+
+    def check_status(
+            self, junctions: List[Dict[str, Any]],
+            edges: List[Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]],
+            connections: Dict[str, Set[str]], self_loops: bool = True
+        ) -> bool:
+        """
+        :param junctions: attributes of junctions read from network file
+        :param edges: attributes of edges (and their lanes) read from network file
+        :param connections: mapping of edge id to incoming edge id's read from network file
+        :param self_loops: True if loops on fringe junctions were allowed, default True
+        :return: True if network was loaded correctly, False otherwise
+        """
+        # print(f"Checking if network connections were build correctly ...")
+        # 1st check that all junctions & edges were loaded
+        for attributes in junctions:
+            if attributes["id"] not in self.road_network.junctions:
+                return False
+        for attributes, _ in edges:
+            if attributes["id"] not in self.road_network.edges:
+                return False
+        # 2nd check that connections represented by junctions correspond to what is in file
+        connections = dict(connections)
         # Filter out self-loops
         if not self_loops:
             for edge_id in list(connections.keys()):
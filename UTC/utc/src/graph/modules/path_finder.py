@@ -1,15 +1,23 @@
 from utc.src.graph import Junction
 from utc.src.graph.modules.graph_module import GraphModule
-from utc.src.graph.network import RoadNetwork, Route
+from utc.src.graph.network import RoadNetwork, Route, SearchTree, BidirectionalSearch, SearchWorkspace, CsrGraph
 from utc.src.graph.modules.display import Display, plt
+import numpy as np
 import heapq
 from typing import Dict, List, Tuple, Optional
 
 
 class PathFinder(GraphModule):
     """ Class implementing shortest path algorithms """
+    HEURISTICS: Tuple[str, ...] = ("euclidean", "landmarks")  # Heuristics of A* (distance to goal)
+    METRICS: Tuple[str, ...] = ("length", "travel_time")  # Costs of routes minimized by A* and TopKA*
+    # Highest ratio of vehicle speed to speed limit (current travel times can be shorter than free-flow)
+    SPEED_FACTOR: float = 1.2
+
     def __init__(self, road_network: RoadNetwork):
         super().__init__(road_network)
+        # Forward and backward search state (reused between searches)
+        self.workspaces: Tuple[SearchWorkspace, SearchWorkspace] = (SearchWorkspace(), SearchWorkspace())
 
     # -------------------------------------- Shortest path --------------------------------------
 
@@ -44,23 +52,29 @@ class PathFinder(GraphModule):
             return None
         # -------------------------------- init --------------------------------
         # Perform initial search to find shortest route and return queue with unexplored junctions
-        queue, shortest_route = self.a_star(start_junction_id, target_junction_id, incoming_route)
+        queue, shortest_route, tree = self.a_star(start_junction_id, target_junction_id, incoming_route)
         if shortest_route is None:  # No path exists
             print(f"No path exists between junction '{start_junction_id}' and junction '{target_junction_id}'")
             return None
         dest: Tuple[float, float] = self.road_network.junctions[target_junction_id].get_position()
         limit: float = round(c * shortest_route.traverse()[0], 3)
+        # Costs of routes are read from arrays (indexed by internal id's of routes)
+        lengths: List[float] = self.road_network.get_route_costs().get_list("length")
+        destinations: List[Junction] = self.road_network.get_csr().get_destinations()
+        routes: List[Route] = self.road_network.get_csr().routes
         assert (limit > 0)
         # print(f"Setting alternative route length limit: '{limit}'")
         other_routes: List[Route] = [shortest_route]
         # -------------------------------- Algorithm --------------------------------
         while queue:
-            priority, in_route, length, path = heapq.heappop(queue)
-            # print(f"Traveling2: {length}, {in_route}, {path}")
+            priority, route_id, length, node = heapq.heappop(queue)
+            in_route: Route = routes[route_id]
+            # print(f"Traveling2: {length}, {in_route}, {node}")
             if priority > limit:  # Priority is current length + euclidean distance to target
                 break  # End of search
-            elif in_route.get_destination() == target_junction_id and in_route.allowed_last:
+            elif destinations[route_id].id == target_junction_id and in_route.allowed_last:
                 # Found other path (satisfying path_length < c * shortest_path_length), record it
+                path: List[int] = tree.get_path(node)
                 assert (length <= limit)
                 assert (self.road_network.check_edge_sequence(path))
                 assert (len(set(path)) == len(path))
@@ -70,21 +84,21 @@ class PathFinder(GraphModule):
                     print(f"Reach limit of k={k} routes found, stopping search ...")
                     break
                 continue
-            for route in self.road_network.junctions[in_route.get_destination()].travel(in_route):
-                distance, neigh_junction_id = route.traverse()
+            for route in destinations[route_id].travel(in_route):
+                distance: float = lengths[route.internal_id]
                 # On the same route, avoid visiting the same edge multiple times (loops)
-                if not self.has_loop(route, path):
+                if not self.has_loop(route, tree, node):
                     distance += length
                     # Current position
-                    pos: Tuple[float, float] = self.road_network.junctions[neigh_junction_id].get_position()
+                    pos: Tuple[float, float] = destinations[route.internal_id].get_position()
                     heapq.heappush(queue, (
-                        distance + self.coord_distance(dest, pos), route,
-                        distance, path + route.get_edge_ids(True)
+                        distance + self.coord_distance(dest, pos), route.internal_id,
+                        distance, tree.add_node(node, route.internal_id, distance)
                         )
                     )
                     # self.tie_breaker += 1
         # print(f"Finished finding routes, found another: '{len(other_routes) - 1}' routes")
-        queue = None  # Free memory
+        queue = tree = None  # Free memory
         # -------------------------------- Plot --------------------------------
         if display is not None:  # Show animation of routes
             fig, ax = display.initialize_plot()
@@ -105,7 +119,7 @@ class PathFinder(GraphModule):
     def a_star(
             self, start_junction_id: str,
             end_junction_id: str, in_route: Route = None
-        ) -> Tuple[List[tuple], Optional[Route]]:
+        ) -> Tuple[List[tuple], Optional[Route], SearchTree]:
         """
         Standard implementation of A* algorithm, with added support for multi-graphs (which
         can prevent A* from finding shortest path)
@@ -113,86 +127,100 @@ class PathFinder(GraphModule):
         :param start_junction_id: starting junction
         :param end_junction_id: goal junction
         :param in_route: incoming route to starting junction (Default None)
-        :return: Queue containing unexplored junctions, shortest route (None if it could not be found)
+        :return: Queue containing unexplored junctions, shortest route (None if it could not be found),
+        search tree holding paths of queue entries
         """
         # print(f"Finding shortest route from: {start_junction_id}, to: {end_junction_id} using A* algorithm")
         # -------------------------- Init --------------------------
-        # priority, in_route, path (list containing all visited edges)
-        queue: List[Tuple[float, Route, float, List[int]]] = []
+        # priority, in_route (internal id), length, node of search tree (holding path of all visited edges)
+        queue: List[Tuple[float, int, float, int]] = []
         shortest_route: Optional[Route] = None
+        tree: SearchTree = SearchTree(self.road_network.get_csr())
         if not self.check_junctions(start_junction_id, end_junction_id):
-            return queue, shortest_route
+            return queue, shortest_route, tree
         destination_pos: Tuple[float, float] = self.road_network.get_junction(end_junction_id).get_position()
+        # Costs of routes are read from arrays (indexed by internal id's of routes)
+        lengths: List[float] = self.road_network.get_route_costs().get_list("length")
+        destinations: List[Junction] = self.road_network.get_csr().get_destinations()
+        routes: List[Route] = self.road_network.get_csr().routes
         # For junction n, gScore[n] is the cost of the cheapest path from start to n currently known,
         # reworked to be mapping to routes (since road-network, can be multi-graph)
-        g_score: Dict[Route, float] = {route: float("inf") for route in self.road_network.routes.values()}
+        g_score: SearchWorkspace = self.workspaces[0].prepare(len(routes))
         # Use all incoming routes as starting points (if they have any out-going routes)
         if in_route is None:
             for out_route in self.road_network.junctions[start_junction_id].get_out_routes():
                 # Do not add disallowed routes or already added routes (different incoming can have same out-going)
-                if not out_route.allowed_first or g_score[out_route] != float("inf"):
+                if not out_route.allowed_first or g_score.reached(out_route.internal_id):
                     continue
-                distance, neigh_junction_id = out_route.traverse()
+                distance: float = lengths[out_route.internal_id]
                 # Current position
-                pos: Tuple[float, float] = self.road_network.junctions[neigh_junction_id].get_position()
-                g_score[out_route] = distance  # Update distances
+                pos: Tuple[float, float] = destinations[out_route.internal_id].get_position()
+                g_score.set(out_route.internal_id, distance)  # Update distances
                 heapq.heappush(queue, (
-                    distance + self.coord_distance(destination_pos, pos), out_route,
-                    distance, out_route.get_edge_ids(True)
+                    distance + self.coord_distance(destination_pos, pos), out_route.internal_id,
+                    distance, tree.add_node(-1, out_route.internal_id, distance)
                     )
                 )
         else:
             # print(f"A* running with incoming route: {in_route}")
             assert (in_route in self.road_network.junctions[start_junction_id].connections)
             # assert (len(self.road_network.junctions[start_junction_id].travel(in_route)) != 0)
-            g_score[in_route] = 0
-            heapq.heappush(queue, (0, in_route, 0, []))
+            g_score.set(in_route.internal_id, 0)
+            # Incoming route is not part of path
+            heapq.heappush(queue, (0, in_route.internal_id, 0, tree.add_node(-1, in_route.internal_id, 0, False)))
         # Empty queue
         if not queue:
             print(f"Unable to find any incoming route to junction: {start_junction_id}")
-            return queue, shortest_route
+            return queue, shortest_route, tree
         # -------------------------- Algorithm --------------------------
         while queue:
-            priority, in_route, length, path = heapq.heappop(queue)  # Removes and returns
-            # print(f"Traveling1: {priority} {length}, {in_route}, {path}")
+            priority, route_id, length, node = heapq.heappop(queue)  # Removes and returns
+            in_route: Route = routes[route_id]
+            # print(f"Traveling1: {priority} {length}, {in_route}, {node}")
             # Found shortest path
-            if in_route.get_destination() == end_junction_id and in_route.allowed_last:
+            if destinations[route_id].id == end_junction_id and in_route.allowed_last:
+                path: List[int] = tree.get_path(node)
                 assert (self.road_network.check_edge_sequence(path))
                 assert (len(set(path)) == len(path))
                 # print(f"Found shortest path: {path}, length: {length}")
                 shortest_route = Route(self.road_network.get_edges(path))
                 break
-            for route in self.road_network.junctions[in_route.get_destination()].travel(in_route):
-                distance, neigh_junction_id = route.traverse()
-                distance += g_score[in_route]
-                if distance < g_score[route] and not self.has_loop(route, path):
-                    pos: Tuple[float, float] = self.road_network.junctions[neigh_junction_id].get_position()
-                    g_score[route] = distance
+            for route in destinations[route_id].travel(in_route):
+                distance: float = lengths[route.internal_id] + g_score.distances[route_id]
+                if distance < g_score.get_distance(route.internal_id) and not self.has_loop(route, tree, node):
+                    pos: Tuple[float, float] = destinations[route.internal_id].get_position()
+                    g_score.set(route.internal_id, distance, route_id)
                     heapq.heappush(queue, (
-                        distance + self.coord_distance(destination_pos, pos), route,
-                        distance, path + route.get_edge_ids(True)
+                        distance + self.coord_distance(destination_pos, pos), route.internal_id,
+                        distance, tree.add_node(node, route.internal_id, distance)
                         )
                     )
         # print(f"Finished finding shortest route: {shortest_route}, queue size: {len(queue)}")
-        return queue, shortest_route
+        return queue, shortest_route, tree
 
 
     def top_k_a_star2(
             self, start_edge_id: str, goal_edge_id: str,
             c: float, k: int = 3000,
-            display: Display = None
+            display: Display = None, heuristic: str = "euclidean", metric: str = "length",
+            corridor: bool = True
         ) -> Optional[List[Route]]:
         """
         At start, performs A* search to find the shortest route,
         uses unexplored junction remaining in queue from the initial call of A* to find 'K' other routes.
         K in this case can be limited by parameter 'c', which sets the maximal length
-        of new routes to be at maximum c * shortest_route_length
+        of new routes to be at maximum c * shortest_route_length (lengths are replaced by
+        current travel times of routes for 'travel_time' metric)
 
         :param start_edge_id: ID of starting edge
         :param goal_edge_id: ID of goal edge
         :param c: multiplier of shortest path length
         :param k: limit of found routes (Default 3000)
         :param display: Class Display, if process should be displayed (Default None)
+        :param heuristic: of A* search, 'euclidean' distance to goal or 'landmarks' lower bounds (Default 'euclidean')
+        :param metric: cost of routes, 'length' or 'travel_time' (Default 'length')
+        :param corridor: if routes which cannot be on any path within limit should be pruned,
+        found routes are the same (Default True)
         :return: List of sorted routes satisfying (route_length < c * shortest_route_length),
         None if shortest route does not exist
         """
@@ -205,48 +233,74 @@ class PathFinder(GraphModule):
         elif k <= 1:
             print(f"Parameter 'k' has to be more than 1, got: '{k}' !")
             return None
+        elif heuristic not in self.HEURISTICS:
+            print(f"Unknown heuristic: '{heuristic}', expected one of: {self.HEURISTICS} !")
+            return None
+        elif metric not in self.METRICS:
+            print(f"Unknown metric: '{metric}', expected one of: {self.METRICS} !")
+            return None
         # -------------------------------- init --------------------------------
         # Perform initial search to find the shortest route and return queue with unexplored junctions
-        queue, shortest_route = self.a_star2(start_edge_id, goal_edge_id)
+        queue, shortest_route, tree = self.a_star2(start_edge_id, goal_edge_id, heuristic, metric)
         if shortest_route is None:  # No path exists
             print(f"No path exists between edge '{start_edge_id}' and edge '{goal_edge_id}'")
             return None
         start_edge, goal_edge = self.road_network.get_edges([start_edge_id, goal_edge_id])
         entry_route, exit_route = self.road_network.get_routes([start_edge.internal_id, goal_edge.internal_id])
         dest_pos: Tuple[float, float] = self.road_network.get_junction(goal_edge.to_junction).get_position()
-        limit: float = round(c * shortest_route.get_length(), 3)
+        limit: float = round(c * self.get_cost(shortest_route, metric), 3)
         assert (limit > 0)
+        # Costs of routes (lengths or travel times) are read from arrays (indexed by internal id's of routes)
+        lengths: List[float] = self.road_network.get_route_costs().get_list(metric)
+        destinations: List[Junction] = self.road_network.get_csr().get_destinations()
+        routes: List[Route] = self.road_network.get_csr().routes
+        bounds: Optional[List[float]] = self.get_bounds(heuristic, exit_route, metric)
+        scale: float = self.get_scale(metric)
+        # Routes which cannot be on any path within limit are pruned (found routes and their order do not change)
+        mask: Optional[List[bool]] = None
+        if corridor:
+            mask = self.road_network.get_corridor(metric).get_mask(
+                entry_route.internal_id, exit_route.internal_id, limit
+            ).tolist()
+            queue = [entry for entry in queue if mask[entry[1]]]
+            heapq.heapify(queue)
         # print(f"Setting alternative route length limit: '{limit}'")
         other_routes: List[Route] = [shortest_route]
         # -------------------------------- Algorithm --------------------------------
         while queue:
-            priority, (in_route, junction), length, path = heapq.heappop(queue)
-            # print(f"Traveling2: {length}, {in_route}, {path}")
-            if priority > limit:  # Priority is current length + Euclidean distance to target
+            priority, route_id, length, node = heapq.heappop(queue)
+            in_route, junction = routes[route_id], destinations[route_id]
+            # print(f"Traveling2: {length}, {in_route}, {node}")
+            if priority > limit:  # Priority is current length + lower bound on distance to target
                 break  # End of search
             elif in_route == exit_route:
                 # Found other path (satisfying path_length < c * shortest_path_length), record it
+                path: List[int] = tree.get_path(node)
                 assert (length <= limit)
                 assert (self.road_network.check_edge_sequence(path))
                 assert (len(set(path)) == len(path))
                 other_routes.append(Route(self.road_network.get_edges(path)))
-                assert(other_routes[-1].get_length() <= limit)
+                assert(self.get_cost(other_routes[-1], metric) <= limit + 1e-6)
                 assert(path[0] == start_edge.internal_id and path[-1] == goal_edge.internal_id)
                 if len(other_routes) > k:
                     print(f"Reach limit of k={k} routes found, stopping search ...")
                     break
                 continue
             for route in junction.travel(in_route):
-                distance, neigh_id = route.traverse()
-                neigh: Junction = self.road_network.get_junction(neigh_id)
-                if not self.has_loop(route, path):
+                if mask is not None and not mask[route.internal_id]:
+                    continue
+                distance: float = lengths[route.internal_id]
+                neigh: Junction = destinations[route.internal_id]
+                if not self.has_loop(route, tree, node):
                     distance += length
                     heapq.heappush(queue, (
-                        distance + self.coord_distance(dest_pos, neigh.get_position()), (route, neigh),
-                        distance, path + route.get_edge_ids(True)
+                        distance + (
+                            bounds[route.internal_id] if bounds is not None else
+                            scale * self.coord_distance(dest_pos, neigh.get_position())
+                        ), route.internal_id, distance, tree.add_node(node, route.internal_id, distance)
                     ))
         # print(f"Finished finding routes, found another: '{len(other_routes) - 1}' routes")
-        queue = None  # Free memory
+        queue = tree = None  # Free memory
         # -------------------------------- Plot --------------------------------
         if display is not None:  # Show animation of routes
             fig, ax = display.initialize_plot()
@@ -265,8 +319,8 @@ class PathFinder(GraphModule):
         return other_routes
 
     def a_star2(
-            self, start_edge_id: str, goal_edge_id: str
-        ) -> Tuple[List[tuple], Optional[Route]]:
+            self, start_edge_id: str, goal_edge_id: str, heuristic: str = "euclidean", metric: str = "length"
+        ) -> Tuple[List[tuple], Optional[Route], SearchTree]:
         """
         Standard implementation of A* algorithm, with added support for multi-graphs (which
         can prevent A* from finding the shortest path) and state-based representation to allow
@@ -274,67 +328,207 @@ class PathFinder(GraphModule):
 
         :param start_edge_id: ID of starting edge
         :param goal_edge_id: ID of goal edge
-        :return: Queue containing unexplored junctions, shortest route (None if it could not be found)
+        :param heuristic: of search, 'euclidean' distance to goal or 'landmarks' lower bounds (Default 'euclidean')
+        :param metric: cost of routes, 'length' or 'travel_time' (Default 'length'), Euclidean distance
+        is divided by the highest speed of network for 'travel_time' (keeps heuristic admissible)
+        :return: Queue containing unexplored junctions, shortest route (None if it could not be found),
+        search tree holding paths of queue entries
         """
         # print(f"Finding shortest route from: {start}({entry_edge}), to: {goal}({exit_edge}) using A* algorithm")
+        tree: SearchTree = SearchTree(self.road_network.get_csr())
         # --- Check ---
         if not self.check_edges(start_edge_id, goal_edge_id):
-            return [], None
+            return [], None, tree
+        elif heuristic not in self.HEURISTICS:
+            print(f"Unknown heuristic: '{heuristic}', expected one of: {self.HEURISTICS} !")
+            return [], None, tree
+        elif metric not in self.METRICS:
+            print(f"Unknown metric: '{metric}', expected one of: {self.METRICS} !")
+            return [], None, tree
         # -------------------------- Init --------------------------
-        # priority, state, length,  path (list containing all visited edges)
-        queue: List[Tuple[float, Tuple[Route, Junction], float, List[int]]] = []
+        # priority, state (route internal id, junction is its destination), length, node of search tree
+        queue: List[Tuple[float, int, float, int]] = []
         shortest_route: Optional[Route] = None
         start_edge, goal_edge = self.road_network.get_edges([start_edge_id, goal_edge_id])
         entry_route, exit_route = self.road_network.get_routes([start_edge.internal_id, goal_edge.internal_id])
         dest_pos: Tuple[float, float] = self.road_network.get_junction(goal_edge.to_junction).get_position()
+        # Costs of routes (lengths or travel times) are read from arrays (indexed by internal id's of routes)
+        lengths: List[float] = self.road_network.get_route_costs().get_list(metric)
+        destinations: List[Junction] = self.road_network.get_csr().get_destinations()
+        routes: List[Route] = self.road_network.get_csr().routes
+        bounds: Optional[List[float]] = self.get_bounds(heuristic, exit_route, metric)
+        scale: float = self.get_scale(metric)
         # For state 'n', gScore[n] is the cost of the cheapest path from start to 'n' currently known
-        g_score: Dict[Tuple[Route, Junction], float] = {}
-        g_score[(entry_route, self.road_network.get_junction(start_edge.to_junction))] = entry_route.get_length()
-        heapq.heappush(queue, (0, (
-            entry_route, self.road_network.get_junction(start_edge.to_junction)),
-            entry_route.get_length(), entry_route.get_edge_ids(True)
-       ))
+        # (states are identified by routes, junction of state is determined by its route)
+        g_score: SearchWorkspace = self.workspaces[0].prepare(len(routes))
+        start_junction: Junction = self.road_network.get_junction(start_edge.to_junction)
+        g_score.set(entry_route.internal_id, lengths[entry_route.internal_id])
+        heapq.heappush(queue, (
+            0, entry_route.internal_id, lengths[entry_route.internal_id],
+            tree.add_node(-1, entry_route.internal_id, lengths[entry_route.internal_id])
+        ))
         # -------------------------- Algorithm --------------------------
         while queue:
-            priority, (in_route, junction), length, path = heapq.heappop(queue)  # Removes and returns
+            priority, route_id, length, node = heapq.heappop(queue)  # Removes and returns
+            # Junction of state is destination of its route (starting edge is the only exception)
+            in_route, junction = routes[route_id], (destinations[route_id] if node != 0 else start_junction)
             # Found the shortest path
             if in_route == exit_route and length > 0:
+                path: List[int] = tree.get_path(node)
                 assert (self.road_network.check_edge_sequence(path))
                 assert(len(set(path)) == len(path))
                 assert(path[0] == start_edge.internal_id and path[-1] == goal_edge.internal_id)
                 shortest_route = Route(self.road_network.get_edges(path))
                 break
             for route in junction.travel(in_route):
-                distance, neigh_id = route.traverse()
-                neigh: Junction = self.road_network.get_junction(neigh_id)
-                distance += g_score[(in_route, junction)]
-                if distance < g_score.get((route, neigh), float("inf")) and not self.has_loop(route, path):
-                    g_score[(route, neigh)] = distance
+                distance: float = lengths[route.internal_id] + g_score.distances[route_id]
+                neigh: Junction = destinations[route.internal_id]
+                if distance < g_score.get_distance(route.internal_id) and not self.has_loop(route, tree, node):
+                    g_score.set(route.internal_id, distance, route_id)
                     heapq.heappush(queue, (
-                        distance + self.coord_distance(dest_pos, neigh.get_position()),
-                        (route, neigh), distance, path + route.get_edge_ids(True)
+                        distance + (
+                            bounds[route.internal_id] if bounds is not None else
+                            scale * self.coord_distance(dest_pos, neigh.get_position())
+                        ), route.internal_id, distance, tree.add_node(node, route.internal_id, distance)
                     ))
-        return queue, shortest_route
+        return queue, shortest_route, tree
+
+    def bidirectional(
+            self, start_junction_id: str, end_junction_id: str, in_route: Route = None
+        ) -> Optional[Route]:
+        """
+        Bidirectional Dijkstra's algorithm, alternative of 'a_star' search (routes are the same
+        as of 'a_star', but length of path is always the shortest, since no heuristic is used)
+
+        :param start_junction_id: starting junction
+        :param end_junction_id: goal junction
+        :param in_route: incoming route to starting junction (Default None)
+        :return: Shortest route (None if it could not be found)
+        """
+        if not self.check_junctions(start_junction_id, end_junction_id):
+            return None
+        lengths: List[float] = self.road_network.get_route_costs().get_list("length")
+        destinations: List[Junction] = self.road_network.get_csr().get_destinations()
+        routes: List[Route] = self.road_network.get_csr().routes
+        # Incoming route is not part of path
+        if in_route is not None:
+            assert (in_route in self.road_network.junctions[start_junction_id].connections)
+            sources: Dict[int, float] = {in_route.internal_id: 0}
+        else:
+            sources: Dict[int, float] = {
+                route.internal_id: lengths[route.internal_id]
+                for route in self.road_network.junctions[start_junction_id].get_out_routes() if route.allowed_first
+            }
+        targets: Dict[int, float] = {
+            route_id: 0 for route_id, junction in enumerate(destinations)
+            if junction is not None and junction.id == end_junction_id and routes[route_id].allowed_last
+        }
+        return self.bidirectional_search(sources, targets, lengths, in_route is not None)
+
+    def bidirectional2(self, start_edge_id: str, goal_edge_id: str) -> Optional[Route]:
+        """
+        Bidirectional Dijkstra's algorithm, alternative of 'a_star2' search from starting edge
+        to goal edge (length of found path is always the shortest, since no heuristic is used)
+
+        :param start_edge_id: ID of starting edge
+        :param goal_edge_id: ID of goal edge
+        :return: Shortest route (None if it could not be found)
+        """
+        if not self.check_edges(start_edge_id, goal_edge_id):
+            return None
+        start_edge, goal_edge = self.road_network.get_edges([start_edge_id, goal_edge_id])
+        entry_route, exit_route = self.road_network.get_routes([start_edge.internal_id, goal_edge.internal_id])
+        lengths: List[float] = self.road_network.get_route_costs().get_list("length")
+        shortest_route: Optional[Route] = self.bidirectional_search(
+            {entry_route.internal_id: lengths[entry_route.internal_id]}, {exit_route.internal_id: 0}, lengths
+        )
+        assert (shortest_route is None or (
+            shortest_route.first_edge() == start_edge and shortest_route.last_edge() == goal_edge
+        ))
+        return shortest_route
+
+    def bidirectional_search(
+            self, sources: Dict[int, float], targets: Dict[int, float],
+            lengths: List[float], skip_first: bool = False
+        ) -> Optional[Route]:
+        """
+        :param sources: mapping of starting routes (internal id's) to length of path starting with them
+        :param targets: mapping of goal routes (internal id's) to length remaining after them
+        :param lengths: of routes (indexed by internal id's of routes)
+        :param skip_first: True if first route of path is not part of it (incoming route), default False
+        :return: Shortest route (None if it could not be found)
+        """
+        if not sources or not targets:
+            return None
+        _, path = BidirectionalSearch(self.road_network.get_csr()).search(sources, targets, lengths, self.workspaces)
+        edges: List[int] = [
+            edge for route_id in path[int(skip_first):]
+            for edge in self.road_network.get_csr().get_route_edge_lists()[route_id]
+        ]
+        if not edges:
+            return None
+        assert (self.road_network.check_edge_sequence(edges))
+        return Route(self.road_network.get_edges(edges))
 
     # -------------------------------------- Utils --------------------------------------
 
     # noinspection PyMethodMayBeStatic
-    def has_loop(self, route: Route, path: List[int]) -> bool:
+    def has_loop(self, route: Route, tree: SearchTree, node: int) -> bool:
         """
         :param route: currently considered route
-        :param path: all visited edges on path
+        :param tree: search tree
+        :param node: of search tree, holding all visited edges on path
         :return: True if there is overlap between route edges and visited edges, False otherwise
         """
-        return route.edge_list[0].internal_id in path
+        return tree.has_edge(node, route.edge_list[0].internal_id)
+
+    def get_bounds(self, heuristic: str, goal_route: Route, metric: str = "length") -> Optional[List[float]]:
+        """
+        :param heuristic: of A* search ('euclidean' or 'landmarks')
+        :param goal_route: of search
+        :param metric: cost of routes ('length' or 'travel_time'), default 'length'
+        :return: Lower bounds on cost from the end of each route to the end of goal route (indexed by
+        internal id's of routes), None for Euclidean heuristic (computed from positions of visited junctions)
+        """
+        if heuristic != "landmarks":
+            return None
+        elif metric == "travel_time":
+            # Free-flow travel times are lower bounds only up to speed factor
+            return (
+                self.road_network.get_landmarks().get_bounds("free_flow", goal_route.internal_id) / self.SPEED_FACTOR
+            ).tolist()
+        return self.road_network.get_landmarks().get_bounds("length", goal_route.internal_id).tolist()
+
+    def get_scale(self, metric: str) -> float:
+        """
+        :param metric: cost of routes ('length' or 'travel_time')
+        :return: Multiplier of Euclidean distance, which keeps it lower bound on cost of routes
+        (inverse of the highest speed of network for 'travel_time', 1 for 'length')
+        """
+        if metric != "travel_time":
+            return 1.
+        csr: CsrGraph = self.road_network.get_csr()
+        return 1 / (max(float(csr.edge_speed[csr.edge_mask].max(initial=0)), 1.) * self.SPEED_FACTOR)
+
+    def get_cost(self, route: Route, metric: str) -> float:
+        """
+        :param route: of network
+        :param metric: cost of routes ('length' or 'travel_time')
+        :return: Length of route, or sum of current travel times of its edges
+        """
+        if metric != "travel_time":
+            return route.get_length()
+        edge_travel_time: np.ndarray = self.road_network.get_route_costs().edge_travel_time
+        return float(sum(edge_travel_time[edge.internal_id] for edge in route.edge_list))
 
     # noinspection PyMethodMayBeStatic
     def coord_distance(self, point_a: Tuple[float, float], point_b: Tuple[float, float]) -> float:
         """
         :param point_a: first point
         :param point_b: second point
-        :return: absolute distance between points (3 decimal precision)
+        :return: absolute distance between points (not rounded, used only in comparisons of heuristic)
         """
-        return round((((point_a[0] - point_b[0]) ** 2) + ((point_a[1] - point_b[1]) ** 2)) ** 0.5, 3)
+        return (((point_a[0] - point_b[0]) ** 2) + ((point_a[1] - point_b[1]) ** 2)) ** 0.5
 
     def check_junctions(self, start_junction_id: str, end_junction_id: str) -> bool:
         """
@@ -19,9 +19,15 @@ class Simplify(GraphModule):
         :param plot: Class Display, if plot should be displayed (default None)
         :return: True on success, false otherwise
         """
+        # Routes are modified directly
+        self.road_network.materialize()
         if not self.simplify_junctions(plot):
             return False
-        return self.simplify_roundabouts(plot)
+        elif not self.simplify_roundabouts(plot):
+            return False
+        # Routes & connections of junctions were modified directly
+        self.road_network.reset_csr()
+        return True
 
     def simplify_junctions(self, plot: Display = None) -> bool:
         """
@@ -1,6 +1,7 @@
 from utc.src.graph.modules.display import GraphModule
-from utc.src.graph.network import RoadNetwork, Route, Edge, Junction
+from utc.src.graph.network import RoadNetwork, NetworkView, CsrGraph, Route, Edge, Junction
 from typing import Optional, Union, List, Set
+import numpy as np
 
 
 class SubGraph(GraphModule):
@@ -11,16 +12,16 @@ class SubGraph(GraphModule):
 
     def create_sub_graph(self, components: List[Union[Route, Edge, Junction]]) -> Optional[RoadNetwork]:
         """
-        Creates sub-graph from given parts of road network.
+        Creates sub-graph from given parts of road network, sub-graph is a view of the road network
+        (objects are shared, until the sub-graph is modified).
 
         :param components: List of routes/edges/junctions from which sub-graph will be created
         :return: RoadNetwork (sub-graph), None if error occurred
         """
-        sub_graph: RoadNetwork = RoadNetwork()
         keep_junctions: Set[str] = set()
         keep_edges: Set[str] = set()
         # -------------------------- Checks and type definitions --------------------------
-        if len(components) == 0 or not sub_graph.load(self.road_network):
+        if len(components) == 0:
             return None
         elif all(isinstance(x, Route) for x in components):
             # Add junctions & edges to be kept in graph
@@ -47,23 +48,51 @@ class SubGraph(GraphModule):
             print(f"Expected sub-graph to be given by either list of edges/routes/junctions !")
             return None
         # -------------------------- Cut graph --------------------------
-        if (keep_junctions & sub_graph.junctions.keys()) != keep_junctions:
-            print(f"Received unknown junction id's: {keep_junctions ^ (keep_junctions & sub_graph.junctions.keys())}")
+        if (keep_junctions & self.road_network.junctions.keys()) != keep_junctions:
+            print(f"Received unknown junction id's: {keep_junctions - self.road_network.junctions.keys()}")
             return None
-        elif (keep_edges & sub_graph.edges.keys()) != keep_edges:
-            print(f"Received unknown edge id's: {keep_edges ^ (keep_edges & sub_graph.edges.keys())}")
+        elif (keep_edges & self.road_network.edges.keys()) != keep_edges:
+            print(f"Received unknown edge id's: {keep_edges - self.road_network.edges.keys()}")
             return None
         # print(f"Keeping junctions: {keep_junctions}")
         # print(f"Keeping edges: {keep_edges}")
-        # Remove junctions
-        for junction_id in (sub_graph.junctions.keys() ^ keep_junctions):
-            sub_graph.remove_junction(junction_id)
-        assert((sub_graph.junctions.keys() & keep_junctions) == keep_junctions)
-        assert((sub_graph.edges.keys() & keep_edges) == keep_edges)
-        # Remove edges, update edge list, since some could have been removed while removing junctions
-        # keep_edges &= sub_graph.edges.keys()
-        for edge_id in (sub_graph.edges.keys() ^ keep_edges):
-            sub_graph.remove_edge(edge_id)
+        csr: CsrGraph = self.road_network.get_csr()
+        junction_mask: np.ndarray = np.zeros(csr.junction_count, dtype=bool)
+        junction_mask[[self.road_network.junctions[junction_id].internal_id for junction_id in keep_junctions]] = True
+        edge_mask: np.ndarray = np.zeros(csr.edge_count, dtype=bool)
+        edge_mask[[self.road_network.edges[edge_id].internal_id for edge_id in keep_edges]] = True
+        sub_graph: NetworkView = NetworkView(self.road_network, junction_mask, edge_mask)
+        assert(sub_graph.junctions.keys() == keep_junctions)
         assert(sub_graph.edges.keys() == keep_edges)
-        sub_graph.edge_connections = sub_graph.get_edges_connections()
         return sub_graph
+
+    def create_region(self, x: float, y: float, radius: float) -> Optional[RoadNetwork]:
+        """
+        Creates sub-graph from edges (found by spatial index of network), intersecting given circle
+
+        :param x: coordinate of center
+        :param y: coordinate of center
+        :param radius: of circle (meters)
+        :return: RoadNetwork (sub-graph), None if error occurred (or region is empty)
+        """
+        edges: List[str] = self.road_network.get_spatial_index().edges_in_radius(x, y, radius)
+        if not edges:
+            print(f"Region at: ({x}, {y}) with radius: {radius} does not contain any edges!")
+            return None
+        return self.create_sub_graph(self.road_network.get_edges(edges))
+
+    def create_box_region(self, x_min: float, y_min: float, x_max: float, y_max: float) -> Optional[RoadNetwork]:
+        """
+        Creates sub-graph from edges (found by spatial index of network), intersecting given box
+
+        :param x_min: lower left corner of box
+        :param y_min: lower left corner of box
+        :param x_max: upper right corner of box
+        :param y_max: upper right corner of box
+        :return: RoadNetwork (sub-graph), None if error occurred (or region is empty)
+        """
+        edges: List[str] = self.road_network.get_spatial_index().edges_in_box(x_min, y_min, x_max, y_max)
+        if not edges:
+            print(f"Region: ({x_min}, {y_min}, {x_max}, {y_max}) does not contain any edges!")
+            return None
+        return self.create_sub_graph(self.road_network.get_edges(edges))
@@ -1,3 +1,4 @@
 from utc.src.graph.network.parts import Edge, Junction, Route
+from utc.src.graph.network.compact import CsrGraph, SpatialIndex, RouteCosts, RouteProjection, SearchTree, Corridor, Landmarks, ContractionHierarchy, BidirectionalSearch, SearchWorkspace, TravelTimeProfiles, TravelTimeMatrix, DynamicTree, TreeCache
 from utc.src.graph.network.road_network import RoadNetwork
-# Forward imports
+from utc.src.graph.network.network_view import NetworkView
@@ -0,0 +1,15 @@
+from utc.src.graph.network.compact.csr_graph import CsrGraph
+from utc.src.graph.network.compact.spatial_index import SpatialIndex
+from utc.src.graph.network.compact.route_costs import RouteCosts
+from utc.src.graph.network.compact.travel_time_profiles import TravelTimeProfiles
+from utc.src.graph.network.compact.travel_time_matrix import TravelTimeMatrix
+from utc.src.graph.network.compact.route_projection import RouteProjection
+from utc.src.graph.network.compact.search_tree import SearchTree
+from utc.src.graph.network.compact.search_workspace import SearchWorkspace
+from utc.src.graph.network.compact.corridor import Corridor
+from utc.src.graph.network.compact.landmarks import Landmarks
+from utc.src.graph.network.compact.contraction_hierarchy import ContractionHierarchy
+from utc.src.graph.network.compact.bidirectional_search import BidirectionalSearch
+from utc.src.graph.network.compact.dynamic_tree import DynamicTree
+from utc.src.graph.network.compact.tree_cache import TreeCache
+# Forward imports
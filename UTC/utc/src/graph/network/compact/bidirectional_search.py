@@ -0,0 +1,85 @@
+from utc.src.graph.network.compact.csr_graph import CsrGraph
+from utc.src.graph.network.compact.search_workspace import SearchWorkspace
+import heapq
+from typing import Dict, List, Tuple, Optional
+
+
+class BidirectionalSearch:
+    """
+    Bidirectional Dijkstra's algorithm on turn-expanded graph of routes (transition from route 'i' to route 'j'
+    costs cost of route 'j'). Forward search labels routes by cost of path from starting routes (including route),
+    backward search (trough reversed connections) by cost remaining after route to the end of goal routes.
+    Direction with lower queue minimum is expanded first, search stops when the sum of queue minimums
+    is not lower than the cost of the best path found (trough route labeled by both searches).
+    """
+    def __init__(self, csr: CsrGraph):
+        """
+        :param csr: array representation of network
+        """
+        self.adjacency: List[List[int]] = csr.get_adjacency()
+        self.reverse_adjacency: List[List[int]] = csr.get_reverse_adjacency()
+        self.route_count: int = csr.route_count
+
+    def search(
+            self, sources: Dict[int, float], targets: Dict[int, float], costs: List[float],
+            workspaces: Optional[Tuple[SearchWorkspace, SearchWorkspace]] = None
+        ) -> Tuple[float, List[int]]:
+        """
+        :param sources: mapping of starting routes (internal id's) to cost of path starting with them
+        :param targets: mapping of goal routes (internal id's) to cost remaining after them (usually 0)
+        :param costs: of routes (indexed by internal id's of routes), must not be negative
+        :param workspaces: forward and backward search state reused between searches (default None, allocated)
+        :return: Cost of the cheapest path and internal id's of routes on it, (inf, []) if path does not exist
+        """
+        inf: float = float("inf")
+        if workspaces is None:
+            workspaces = (SearchWorkspace(), SearchWorkspace())
+        for workspace in workspaces:
+            workspace.prepare(self.route_count)
+        # Forward and backward labels (parents are -1 for starting and goal routes) and queues
+        for route, cost in sources.items():
+            workspaces[0].set(route, cost)
+        for route, cost in targets.items():
+            workspaces[1].set(route, cost)
+        queues: Tuple[List[Tuple[float, int]], List[Tuple[float, int]]] = (
+            [(cost, route) for route, cost in sources.items()], [(cost, route) for route, cost in targets.items()]
+        )
+        heapq.heapify(queues[0])
+        heapq.heapify(queues[1])
+        best, meeting = inf, -1
+        for route, cost in sources.items():
+            if cost + workspaces[1].get_distance(route) < best:
+                best, meeting = cost + workspaces[1].get_distance(route), route
+        # -------------------------- Algorithm --------------------------
+        while queues[0] or queues[1]:
+            forward_min: float = queues[0][0][0] if queues[0] else inf
+            backward_min: float = queues[1][0][0] if queues[1] else inf
+            # No path trough unsettled routes can be cheaper
+            if forward_min + backward_min >= best:
+                break
+            direction: int = 0 if forward_min <= backward_min else 1
+            cost, route = heapq.heappop(queues[direction])
+            workspace, other = workspaces[direction], workspaces[1 - direction]
+            if cost > workspace.distances[route]:  # Outdated entry
+                continue
+            # Lists of workspaces are indexed directly in the inner loop
+            distances, parents, stamps, generation = (
+                workspace.distances, workspace.parents, workspace.stamps, workspace.generation
+            )
+            for neighbour in (self.adjacency if direction == 0 else self.reverse_adjacency)[route]:
+                # Forward search enters neighbour, backward search enters route from neighbour
+                candidate: float = cost + costs[neighbour if direction == 0 else route]
+                if stamps[neighbour] != generation or candidate < distances[neighbour]:
+                    distances[neighbour], parents[neighbour], stamps[neighbour] = candidate, route, generation
+                    heapq.heappush(queues[direction], (candidate, neighbour))
+                    if candidate + other.get_distance(neighbour) < best:
+                        best, meeting = candidate + other.distances[neighbour], neighbour
+        if meeting == -1:
+            return inf, []
+        # -------------------------- Path --------------------------
+        path: List[int] = workspaces[0].get_path(meeting)
+        route: int = workspaces[1].get_parent(meeting)
+        while route != -1:
+            path.append(route)
+            route = workspaces[1].get_parent(route)
+        return best, path
@@ -0,0 +1,288 @@
+from utc.src.graph.network.compact.csr_graph import CsrGraph
+from utc.src.graph.network.compact.route_costs import RouteCosts
+import numpy as np
+import heapq
+from typing import Dict, List, Set, Tuple
+
+
+class ContractionHierarchy:
+    """
+    Customizable contraction hierarchy (CCH) over turn-expanded graph of routes (transition from route 'i'
+    to route 'j' costs cost of route 'j'), turn restrictions are kept, since routes are nodes of the graph.
+    Preprocessing is metric independent, routes are eliminated in minimum degree order and their higher
+    neighbours are connected by shortcuts (upward arcs). Customization assigns weights to arcs in both
+    directions by lower triangles (processed level by level of elimination tree, vectorized), it is repeated
+    only when costs of routes change ('RouteCosts.epoch'). Queries relax upward arcs of ancestors
+    of starting and goal routes in elimination tree (no priority queue is needed).
+    """
+    def __init__(self, csr: CsrGraph, costs: RouteCosts, metric: str = "travel_time"):
+        """
+        :param csr: array representation of network
+        :param costs: of routes
+        :param metric: cost array of routes used as weights (length, free_flow, travel_time)
+        """
+        self.costs: RouteCosts = costs
+        self.metric: str = metric
+        self.epoch: int = -1  # Epoch of costs, with which hierarchy was customized
+        count: int = csr.route_count
+        # ------------------------------ Original arcs ------------------------------
+        graph = csr.get_route_graph(np.ones(count, dtype=np.float64))
+        sources: np.ndarray = np.repeat(np.arange(count, dtype=np.int64), np.diff(graph.indptr))
+        targets: np.ndarray = graph.indices.astype(np.int64)
+        loops: np.ndarray = (sources == targets)
+        sources, targets = sources[~loops], targets[~loops]
+        # ------------------------------ Elimination ------------------------------
+        self.rank, upper = self.eliminate(count, sources, targets)
+        # Upward arcs, grouped by lower endpoint (tail), heads sorted by rank
+        lengths: np.ndarray = np.fromiter((len(neighbours) for neighbours in upper), dtype=np.int64, count=count)
+        self.up_offsets: np.ndarray = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.up_offsets[1:])
+        self.tails: np.ndarray = np.repeat(np.arange(count, dtype=np.int64), lengths)
+        ranks: List[int] = self.rank.tolist()
+        self.heads: np.ndarray = np.fromiter(
+            (head for neighbours in upper for head in sorted(neighbours, key=ranks.__getitem__)),
+            dtype=np.int64, count=int(self.up_offsets[-1])
+        )
+        # Parent in elimination tree is the lowest ranked upper neighbour
+        self.parent: np.ndarray = np.full(count, -1, dtype=np.int64)
+        self.parent[lengths > 0] = self.heads[self.up_offsets[:-1][lengths > 0]]
+        # Arc indexes are found trough keys sorted by rank of tail, then head
+        keys: np.ndarray = self.rank[self.tails] * count + self.rank[self.heads]
+        self.key_order: np.ndarray = np.argsort(keys)
+        self.keys: np.ndarray = keys[self.key_order]
+        # Original arcs, their upward arc and direction (True if arc leads from tail to head)
+        self.original_forward: np.ndarray = self.rank[sources] < self.rank[targets]
+        self.original_arcs: np.ndarray = self.find_arcs(
+            np.where(self.original_forward, sources, targets), np.where(self.original_forward, targets, sources)
+        )
+        self.original_targets: np.ndarray = targets
+        # ------------------------------ Triangles ------------------------------
+        self.triangles: np.ndarray = self.get_triangles()
+        # Triangles are processed by levels of their lowest node in elimination tree
+        levels: np.ndarray = self.get_levels()
+        order: np.ndarray = np.argsort(levels[self.tails[self.triangles[:, 0]]], kind="stable")
+        self.triangles = self.triangles[order]
+        self.level_offsets: np.ndarray = np.searchsorted(
+            levels[self.tails[self.triangles[:, 0]]], np.arange(int(levels.max(initial=0)) + 2)
+        )
+        # ------------------------------ Metric ------------------------------
+        self.forward: List[float] = []  # Weights of arcs from tail to head
+        self.backward: List[float] = []  # Weights of arcs from head to tail
+        self._forward_triangle: List[int] = []  # Triangle of shortcut (-1 for original arc)
+        self._backward_triangle: List[int] = []
+        # Arrays used by queries as python lists (faster to index in pure python loops)
+        self._triangles: List[List[int]] = self.triangles.tolist()
+        self._tails: List[int] = self.tails.tolist()
+        self._heads: List[int] = self.heads.tolist()
+        self._up_offsets: List[int] = self.up_offsets.tolist()
+        self._parent: List[int] = self.parent.tolist()
+
+    # ------------------------------------------ Customization ------------------------------------------
+
+    def customize(self) -> None:
+        """
+        Assigns weights to arcs from current costs of routes (called automatically, when costs change)
+
+        :return: None
+        """
+        weights: np.ndarray = getattr(self.costs, self.metric)
+        forward: np.ndarray = np.full(len(self.heads), np.inf)
+        backward: np.ndarray = np.full(len(self.heads), np.inf)
+        forward[self.original_arcs[self.original_forward]] = weights[self.original_targets[self.original_forward]]
+        backward[self.original_arcs[~self.original_forward]] = weights[self.original_targets[~self.original_forward]]
+        forward_triangle: np.ndarray = np.full(len(self.heads), -1, dtype=np.int64)
+        backward_triangle: np.ndarray = np.full(len(self.heads), -1, dtype=np.int64)
+        for level in range(len(self.level_offsets) - 1):
+            start, end = self.level_offsets[level], self.level_offsets[level + 1]
+            if start == end:
+                continue
+            # Triangle of route 'x' with upper neighbours 'u' < 'v' (by rank), arcs: (x, u), (x, v), (u, v)
+            xu, xv, uv = self.triangles[start:end].T
+            indexes: np.ndarray = np.arange(start, end)
+            for weights_uv, candidates, triangles in (
+                    (forward, backward[xu] + forward[xv], forward_triangle),  # u -> x -> v
+                    (backward, backward[xv] + forward[xu], backward_triangle)  # v -> x -> u
+                    ):
+                np.minimum.at(weights_uv, uv, candidates)
+                improved: np.ndarray = np.isfinite(candidates) & (candidates == weights_uv[uv])
+                triangles[uv[improved]] = indexes[improved]
+        self.forward, self.backward = forward.tolist(), backward.tolist()
+        self._forward_triangle, self._backward_triangle = forward_triangle.tolist(), backward_triangle.tolist()
+        self.epoch = self.costs.epoch
+
+    # ------------------------------------------ Query ------------------------------------------
+
+    def query(self, start_route: int, goal_route: int) -> Tuple[float, List[int]]:
+        """
+        :param start_route: internal id of starting route
+        :param goal_route: internal id of goal route
+        :return: Cost of the cheapest path (excluding starting route) and internal id's
+        of routes on it (including starting and goal route), (inf, []) if path does not exist
+        """
+        return self.query_many([(start_route, goal_route)])[0]
+
+    def query_many(self, pairs: List[Tuple[int, int]]) -> List[Tuple[float, List[int]]]:
+        """
+        Batch version of 'query', search from each starting route (and to each goal route) is performed only once
+
+        :param pairs: of starting and goal routes (internal id's)
+        :return: Cost and routes of the cheapest path for each pair (same as 'query')
+        """
+        if self.epoch != self.costs.epoch:
+            self.customize()
+        forward: Dict[int, Tuple[Dict[int, float], Dict[int, int]]] = {}
+        backward: Dict[int, Tuple[Dict[int, float], Dict[int, int]]] = {}
+        paths: List[Tuple[float, List[int]]] = []
+        for start_route, goal_route in pairs:
+            if start_route == goal_route:
+                paths.append((0, [start_route]))
+                continue
+            if start_route not in forward:
+                forward[start_route] = self.search(start_route, self.forward)
+            if goal_route not in backward:
+                backward[goal_route] = self.search(goal_route, self.backward)
+            paths.append(self.connect(start_route, goal_route, forward[start_route], backward[goal_route]))
+        return paths
+
+    def connect(
+            self, start_route: int, goal_route: int,
+            forward: Tuple[Dict[int, float], Dict[int, int]], backward: Tuple[Dict[int, float], Dict[int, int]]
+        ) -> Tuple[float, List[int]]:
+        """
+        :param start_route: internal id of starting route
+        :param goal_route: internal id of goal route
+        :param forward: search from starting route (costs and arcs of ancestors)
+        :param backward: search from goal route (costs and arcs of ancestors)
+        :return: Cost and routes of the cheapest path (same as 'query')
+        """
+        (forward_costs, forward_arcs), (backward_costs, backward_arcs) = forward, backward
+        best, meeting = float("inf"), -1
+        for route, cost in forward_costs.items():
+            if cost + backward_costs.get(route, float("inf")) < best:
+                best, meeting = cost + backward_costs[route], route
+        if meeting == -1:
+            return best, []
+        # Path from starting route to meeting route, then to goal route
+        path: List[int] = [start_route]
+        arcs: List[int] = []
+        route: int = meeting
+        while route != start_route:
+            arcs.append(forward_arcs[route])
+            route = self._tails[arcs[-1]]
+        for arc in reversed(arcs):
+            path += self.unpack(arc, True)
+        route = meeting
+        while route != goal_route:
+            arc: int = backward_arcs[route]
+            path += self.unpack(arc, False)
+            route = self._tails[arc]
+        return best, path
+
+    def search(self, route: int, weights: List[float]) -> Tuple[Dict[int, float], Dict[int, int]]:
+        """
+        :param route: internal id of route from which search starts
+        :param weights: of upward arcs (forward for searches from start, backward for searches from goal)
+        :return: Costs of ancestors of route in elimination tree, arcs trough which they were reached
+        """
+        costs: Dict[int, float] = {route: 0}
+        arcs: Dict[int, int] = {}
+        heads, offsets, parent = self._heads, self._up_offsets, self._parent
+        inf: float = float("inf")
+        while route != -1:
+            cost: float = costs.get(route, inf)
+            if cost < inf:
+                for arc in range(offsets[route], offsets[route + 1]):
+                    head, candidate = heads[arc], cost + weights[arc]
+                    if candidate < costs.get(head, inf):
+                        costs[head] = candidate
+                        arcs[head] = arc
+            route = parent[route]
+        return costs, arcs
+
+    def unpack(self, arc: int, forward: bool) -> List[int]:
+        """
+        :param arc: upward arc (possibly shortcut)
+        :param forward: True if arc is traversed from tail to head, False otherwise
+        :return: Internal id's of routes on path represented by arc (excluding its first route)
+        """
+        path: List[int] = []
+        stack: List[Tuple[int, bool]] = [(arc, forward)]
+        while stack:
+            arc, forward = stack.pop()
+            triangle: int = (self._forward_triangle if forward else self._backward_triangle)[arc]
+            if triangle == -1:
+                path.append(self._heads[arc] if forward else self._tails[arc])
+                continue
+            xu, xv, _ = self._triangles[triangle]
+            # u -> x -> v (forward), v -> x -> u (backward), second part is unpacked last
+            stack += [(xv, True), (xu, False)] if forward else [(xu, True), (xv, False)]
+        return path
+
+    # ------------------------------------------ Utils ------------------------------------------
+
+    def find_arcs(self, tails: np.ndarray, heads: np.ndarray) -> np.ndarray:
+        """
+        :param tails: lower endpoints of arcs
+        :param heads: higher endpoints of arcs
+        :return: Indexes of upward arcs
+        """
+        positions: np.ndarray = np.searchsorted(self.keys, self.rank[tails] * len(self.rank) + self.rank[heads])
+        return self.key_order[positions]
+
+    def get_triangles(self) -> np.ndarray:
+        """
+        :return: Array of shape (N, 3) containing arcs (x, u), (x, v), (u, v) of lower triangles,
+        where 'u' and 'v' are upper neighbours of 'x' ('u' is ranked lower than 'v')
+        """
+        # Each arc (x, u) is paired with every following arc (x, v) of the same tail
+        following: np.ndarray = self.up_offsets[self.tails + 1] - np.arange(len(self.tails)) - 1
+        first: np.ndarray = np.repeat(np.arange(len(self.tails), dtype=np.int64), following)
+        starts: np.ndarray = np.zeros(len(self.tails), dtype=np.int64)
+        np.cumsum(following[:-1], out=starts[1:])
+        second: np.ndarray = first + 1 + np.arange(len(first), dtype=np.int64) - np.repeat(starts, following)
+        return np.column_stack((first, second, self.find_arcs(self.heads[first], self.heads[second])))
+
+    def get_levels(self) -> np.ndarray:
+        """
+        :return: Level of each route in elimination tree (leaves are on level 0, parent is above its children)
+        """
+        levels: List[int] = [0] * len(self.rank)
+        parent: List[int] = self.parent.tolist()
+        for route in np.argsort(self.rank).tolist():
+            if parent[route] != -1:
+                levels[parent[route]] = max(levels[parent[route]], levels[route] + 1)
+        return np.array(levels, dtype=np.int64)
+
+    @staticmethod
+    def eliminate(count: int, sources: np.ndarray, targets: np.ndarray) -> Tuple[np.ndarray, List[Set[int]]]:
+        """
+        :param count: number of routes
+        :param sources: of arcs
+        :param targets: of arcs
+        :return: Rank of each route in elimination order (minimum degree), upper neighbours
+        of each route at the time of its elimination (including shortcuts)
+        """
+        neighbours: List[Set[int]] = [set() for _ in range(count)]
+        for source, target in zip(sources.tolist(), targets.tolist()):
+            neighbours[source].add(target)
+            neighbours[target].add(source)
+        rank: np.ndarray = np.full(count, -1, dtype=np.int64)
+        upper: List[Set[int]] = [set() for _ in range(count)]
+        queue: List[Tuple[int, int]] = [(len(neighbours[route]), route) for route in range(count)]
+        heapq.heapify(queue)
+        eliminated: int = 0
+        while queue:
+            degree, route = heapq.heappop(queue)
+            # Skip already eliminated routes and outdated degrees
+            if rank[route] != -1 or degree != len(neighbours[route]):
+                continue
+            rank[route] = eliminated
+            eliminated += 1
+            upper[route] = neighbours[route]
+            # Remaining neighbours form clique
+            for neighbour in upper[route]:
+                neighbours[neighbour].discard(route)
+                neighbours[neighbour] |= upper[route]
+                neighbours[neighbour].discard(neighbour)
+                heapq.heappush(queue, (len(neighbours[neighbour]), neighbour))
+        return rank, upper
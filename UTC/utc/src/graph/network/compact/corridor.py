@@ -0,0 +1,62 @@
+from utc.src.graph.network.compact.route_costs import RouteCosts
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+from collections import OrderedDict
+import numpy as np
+
+
+class Corridor:
+    """
+    Prunes routes of network, which cannot be part of any path between two routes not longer than limit.
+    Route 'r' is kept if 'd_f(r) + d_b(r) <= limit', where 'd_f' is the shortest distance from starting
+    route to the end of 'r' (including both) and 'd_b' is the shortest distance from the end of 'r' to
+    the end of goal route. Distances are computed by Dijkstra's algorithm on turn-expanded graph of routes
+    (weights are costs of entered routes, shared with other users of 'RouteCosts.get_graph') and cached
+    by starting and goal routes, so that queries with the same origin or destination reuse them.
+    """
+    def __init__(self, costs: RouteCosts, name: str = "length", cache_size: int = 256):
+        """
+        :param costs: of routes
+        :param name: of cost array used as length of routes ('length' or 'travel_time'), default 'length'
+        :param cache_size: maximal number of cached distances (for each direction)
+        """
+        self.lengths: np.ndarray = getattr(costs, name)
+        self.cache_size: int = cache_size
+        self.graph: csr_matrix = costs.get_graph(name)
+        self.reversed_graph: csr_matrix = self.graph.transpose().tocsr()
+        self.forward: OrderedDict = OrderedDict()  # Mapping of starting route to distances
+        self.backward: OrderedDict = OrderedDict()  # Mapping of goal route to distances
+
+    def get_mask(self, start_route: int, goal_route: int, limit: float) -> np.ndarray:
+        """
+        :param start_route: internal id of starting route
+        :param goal_route: internal id of goal route
+        :param limit: maximal length of paths (including starting and goal routes)
+        :return: Boolean mask of routes, which can be on path shorter than limit (indexed by internal id's of routes)
+        """
+        # Small tolerance for rounding errors of summed lengths (keeping more routes does not change results)
+        return (self.get_forward(start_route) + self.get_backward(goal_route)) <= (limit + 1e-6)
+
+    def get_forward(self, start_route: int) -> np.ndarray:
+        """
+        :param start_route: internal id of starting route
+        :return: Shortest distances from starting route to the end of each route (including starting route)
+        """
+        if start_route not in self.forward:
+            self.forward[start_route] = self.lengths[start_route] + dijkstra(self.graph, indices=start_route)
+            if len(self.forward) > self.cache_size:
+                self.forward.popitem(last=False)
+        self.forward.move_to_end(start_route)
+        return self.forward[start_route]
+
+    def get_backward(self, goal_route: int) -> np.ndarray:
+        """
+        :param goal_route: internal id of goal route
+        :return: Shortest distances from the end of each route to the end of goal route
+        """
+        if goal_route not in self.backward:
+            self.backward[goal_route] = dijkstra(self.reversed_graph, indices=goal_route)
+            if len(self.backward) > self.cache_size:
+                self.backward.popitem(last=False)
+        self.backward.move_to_end(goal_route)
+        return self.backward[goal_route]
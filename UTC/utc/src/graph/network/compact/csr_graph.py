@@ -0,0 +1,275 @@
+from utc.src.graph.network.parts import Junction, Edge, Route
+from scipy.sparse import csr_matrix
+import numpy as np
+from typing import Dict, List, Optional, Iterable, Tuple, Union, TYPE_CHECKING
+if TYPE_CHECKING:
+    from utc.src.graph.network.road_network import RoadNetwork
+
+
+class CsrGraph:
+    """
+    Compact array (CSR - compressed sparse row) representation of road network, built alongside
+    the object graph. All arrays are indexed by internal id's of Junctions, Edges and Routes
+    (missing objects are masked out), so that search algorithms can work only with integers.
+    Objects are still reachable trough their internal id's, which makes this class a thin
+    view between the object API and arrays.
+    """
+    def __init__(self, road_network: 'RoadNetwork'):
+        """
+        :param road_network: from which arrays are built (must not be modified afterward)
+        """
+        junctions: List[Junction] = list(road_network.junctions.values())
+        edges: List[Edge] = list(road_network.edges.values())
+        routes: List[Route] = list(road_network.routes.values())
+        self.junction_count: int = max((junction.internal_id for junction in junctions), default=-1) + 1
+        self.edge_count: int = max((edge.internal_id for edge in edges), default=-1) + 1
+        self.route_count: int = max((route.internal_id for route in routes), default=-1) + 1
+        # ------------------------------ Junctions ------------------------------
+        self.junctions: List[Optional[Junction]] = [None] * self.junction_count
+        self.junction_mask: np.ndarray = np.zeros(self.junction_count, dtype=bool)
+        self.junction_x: np.ndarray = np.zeros(self.junction_count, dtype=np.float64)
+        self.junction_y: np.ndarray = np.zeros(self.junction_count, dtype=np.float64)
+        junction_index: Dict[str, int] = {}
+        for junction in junctions:
+            self.junctions[junction.internal_id] = junction
+            self.junction_x[junction.internal_id] = junction.x
+            self.junction_y[junction.internal_id] = junction.y
+            junction_index[junction.id] = junction.internal_id
+        self.junction_mask[list(junction_index.values())] = True
+        # ------------------------------ Edges ------------------------------
+        self.edges: List[Optional[Edge]] = [None] * self.edge_count
+        self.edge_mask: np.ndarray = np.zeros(self.edge_count, dtype=bool)
+        self.edge_length: np.ndarray = np.zeros(self.edge_count, dtype=np.float64)
+        self.edge_speed: np.ndarray = np.zeros(self.edge_count, dtype=np.float64)
+        self.edge_lanes: np.ndarray = np.zeros(self.edge_count, dtype=np.int32)
+        self.edge_from: np.ndarray = np.full(self.edge_count, -1, dtype=np.int32)
+        self.edge_to: np.ndarray = np.full(self.edge_count, -1, dtype=np.int32)
+        self.edge_index: Dict[str, int] = {}  # Mapping of original edge id to internal
+        for edge in edges:
+            index: int = edge.internal_id
+            self.edges[index] = edge
+            self.edge_mask[index] = True
+            self.edge_length[index] = edge.length
+            self.edge_speed[index] = edge.speed
+            self.edge_lanes[index] = edge.get_lane_count()
+            self.edge_from[index] = junction_index.get(edge.from_junction, -1)
+            self.edge_to[index] = junction_index.get(edge.to_junction, -1)
+            self.edge_index[edge.id] = index
+        # ------------------------------ Routes ------------------------------
+        self.routes: List[Optional[Route]] = [None] * self.route_count
+        self.route_mask: np.ndarray = np.zeros(self.route_count, dtype=bool)
+        self.route_from: np.ndarray = np.full(self.route_count, -1, dtype=np.int32)
+        self.route_to: np.ndarray = np.full(self.route_count, -1, dtype=np.int32)
+        for route in routes:
+            self.routes[route.internal_id] = route
+            self.route_mask[route.internal_id] = True
+            self.route_from[route.internal_id] = self.edge_from[route.first_edge().internal_id]
+            self.route_to[route.internal_id] = self.edge_to[route.last_edge().internal_id]
+        # Edges of routes, edges of route 'i' are: route_edges[route_offsets[i]:route_offsets[i+1]]
+        self.route_offsets: np.ndarray = np.zeros(self.route_count + 1, dtype=np.int64)
+        route_edges: List[int] = []
+        for index, route in enumerate(self.routes):
+            if route is not None:
+                route_edges.extend(edge.internal_id for edge in route.edge_list)
+            self.route_offsets[index + 1] = len(route_edges)
+        self.route_edges: np.ndarray = np.array(route_edges, dtype=np.int32)
+        # ------------------------------ Connections ------------------------------
+        # Turn-expanded adjacency, routes reachable from route 'i' are: adj_targets[adj_offsets[i]:adj_offsets[i+1]]
+        self.adj_offsets: np.ndarray = np.zeros(self.route_count + 1, dtype=np.int64)
+        adj_targets: List[int] = []
+        for index, route in enumerate(self.routes):
+            if route is not None:
+                junction: Optional[Junction] = self.junctions[self.route_to[index]] if self.route_to[index] >= 0 else None
+                if junction is not None and route in junction.connections:
+                    adj_targets.extend(out_route.internal_id for out_route in junction.connections[route])
+            self.adj_offsets[index + 1] = len(adj_targets)
+        self.adj_targets: np.ndarray = np.array(adj_targets, dtype=np.int32)
+        # Routes which can be used from junction without incoming route (i.e. starting junctions)
+        self.start_offsets: np.ndarray = np.zeros(self.junction_count + 1, dtype=np.int64)
+        start_routes: List[int] = []
+        for index, junction in enumerate(self.junctions):
+            if junction is not None and None in junction.connections:
+                start_routes.extend(out_route.internal_id for out_route in junction.connections[None])
+            self.start_offsets[index + 1] = len(start_routes)
+        self.start_routes: np.ndarray = np.array(start_routes, dtype=np.int32)
+        self._adjacency: Optional[List[List[int]]] = None
+        self._reverse_adjacency: Optional[List[List[int]]] = None
+        self._destinations: Optional[List[Optional[Junction]]] = None
+        self._connections: Optional[np.ndarray] = None
+        self._route_edge_lists: Optional[List[List[int]]] = None
+        self._end_table: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    # ------------------------------------------ Getters ------------------------------------------
+
+    def get_out_routes(self, route_id: int) -> np.ndarray:
+        """
+        :param route_id: internal id of route
+        :return: Array of internal id's of routes, which can be entered from given route
+        """
+        return self.adj_targets[self.adj_offsets[route_id]:self.adj_offsets[route_id + 1]]
+
+    def get_start_routes(self, junction_id: int) -> np.ndarray:
+        """
+        :param junction_id: internal id of junction
+        :return: Array of internal id's of routes, which can be used without incoming route (can be empty)
+        """
+        return self.start_routes[self.start_offsets[junction_id]:self.start_offsets[junction_id + 1]]
+
+    def get_route_edges(self, route_id: int) -> np.ndarray:
+        """
+        :param route_id: internal id of route
+        :return: Array of internal id's of edges, which route goes trough
+        """
+        return self.route_edges[self.route_offsets[route_id]:self.route_offsets[route_id + 1]]
+
+    def get_adjacency(self) -> List[List[int]]:
+        """
+        :return: Turn-expanded adjacency as python lists (faster to index in pure python loops than arrays)
+        """
+        if self._adjacency is None:
+            targets: List[int] = self.adj_targets.tolist()
+            offsets: List[int] = self.adj_offsets.tolist()
+            self._adjacency = [targets[offsets[i]:offsets[i + 1]] for i in range(self.route_count)]
+        return self._adjacency
+
+    def get_reverse_adjacency(self) -> List[List[int]]:
+        """
+        :return: Reversed turn-expanded adjacency as python lists, i.e. routes from which route 'i' can be entered
+        (route level counterpart of 'get_edges_connections')
+        """
+        if self._reverse_adjacency is None:
+            order: np.ndarray = np.argsort(self.adj_targets, kind="stable")
+            sources: List[int] = np.repeat(
+                np.arange(self.route_count), np.diff(self.adj_offsets)
+            )[order].tolist()
+            offsets: List[int] = np.searchsorted(self.adj_targets[order], np.arange(self.route_count + 1)).tolist()
+            self._reverse_adjacency = [sources[offsets[i]:offsets[i + 1]] for i in range(self.route_count)]
+        return self._reverse_adjacency
+
+    def get_route_edge_lists(self) -> List[List[int]]:
+        """
+        :return: Edges of routes as python lists (indexed by internal id's of routes)
+        """
+        if self._route_edge_lists is None:
+            edges: List[int] = self.route_edges.tolist()
+            offsets: List[int] = self.route_offsets.tolist()
+            self._route_edge_lists = [edges[offsets[i]:offsets[i + 1]] for i in range(self.route_count)]
+        return self._route_edge_lists
+
+    def get_end_table(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :return: Routes grouped by their last edge and offsets of groups, routes ending
+        with edge 'e' are: end_routes[end_offsets[e]:end_offsets[e+1]]
+        """
+        if self._end_table is None:
+            last_edges: np.ndarray = np.full(self.route_count, -1, dtype=np.int64)
+            last_edges[self.route_mask] = self.route_edges[self.route_offsets[1:][self.route_mask] - 1]
+            end_routes: np.ndarray = np.argsort(last_edges, kind="stable")[np.count_nonzero(last_edges < 0):]
+            end_offsets: np.ndarray = np.searchsorted(last_edges[end_routes], np.arange(self.edge_count + 1))
+            self._end_table = (end_routes, end_offsets)
+        return self._end_table
+
+    def get_end_routes(self, edge_id: int) -> np.ndarray:
+        """
+        :param edge_id: internal id of edge
+        :return: Array of internal id's of routes, whose last edge is given edge
+        """
+        end_routes, end_offsets = self.get_end_table()
+        return end_routes[end_offsets[edge_id]:end_offsets[edge_id + 1]]
+
+    def get_destinations(self) -> List[Optional[Junction]]:
+        """
+        :return: Junction at which route ends for each route (indexed by internal id's of routes)
+        """
+        if self._destinations is None:
+            self._destinations = [
+                self.junctions[junction_id] if junction_id >= 0 else None for junction_id in self.route_to.tolist()
+            ]
+        return self._destinations
+
+    def get_route_graph(self, weights: np.ndarray) -> csr_matrix:
+        """
+        :param weights: of routes (indexed by internal id's of routes), e.g. their lengths
+        :return: Sparse matrix of turn-expanded graph, transition from route 'i' to route 'j'
+        costs weight of route 'j' (duplicate connections are removed)
+        """
+        route_count: int = max(self.route_count, 1)
+        sources: np.ndarray = np.repeat(np.arange(self.route_count, dtype=np.int64), np.diff(self.adj_offsets))
+        keys: np.ndarray = np.unique(sources * route_count + self.adj_targets)
+        targets: np.ndarray = keys % route_count
+        offsets: np.ndarray = np.searchsorted(keys // route_count, np.arange(self.route_count + 1))
+        return csr_matrix((weights[targets], targets, offsets), shape=(self.route_count, self.route_count))
+
+    def get_edge_indexes(self, edge_ids: Iterable[Union[str, int, Edge]]) -> np.ndarray:
+        """
+        :param edge_ids: original id's of edges, internal id's of edges or Edge instances
+        :return: Array of internal id's of edges (-1 for edges which are not in network)
+        """
+        return np.array([
+            edge_id if isinstance(edge_id, (int, np.integer)) else
+            self.edge_index.get(edge_id if isinstance(edge_id, str) else edge_id.id, -1)
+            for edge_id in edge_ids
+        ], dtype=np.int64)
+
+    def get_connection_table(self) -> np.ndarray:
+        """
+        :return: Sorted array of allowed pairs of consecutive edges (packed as 'from_edge * edge_count + to_edge'),
+        made from edges inside of routes and from last & first edges of connected routes
+        """
+        if self._connections is None:
+            edge_count: int = self.edge_count
+            # Consecutive edges on the same route
+            edge_route: np.ndarray = np.repeat(np.arange(self.route_count), np.diff(self.route_offsets))
+            inner: np.ndarray = edge_route[1:] == edge_route[:-1]
+            route_edges: np.ndarray = self.route_edges.astype(np.int64)
+            inner_keys: np.ndarray = route_edges[:-1][inner] * edge_count + route_edges[1:][inner]
+            # Last edge of incoming route with first edge of out-going route
+            in_routes: np.ndarray = np.repeat(np.arange(self.route_count), np.diff(self.adj_offsets))
+            last_edges: np.ndarray = route_edges[self.route_offsets[in_routes + 1] - 1]
+            first_edges: np.ndarray = route_edges[self.route_offsets[self.adj_targets]]
+            self._connections = np.unique(np.concatenate((inner_keys, last_edges * edge_count + first_edges)))
+        return self._connections
+
+    def check_edge_sequences(self, sequences: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Checks all sequences at once, each pair of consecutive edges is searched for in connection table.
+
+        :param sequences: of edges (arrays of internal id's of edges, -1 for missing edges)
+        :return: Boolean array (True if sequence is correct), array of indexes of first invalid edge
+        in each sequence (-1 if sequence is correct, 0 if sequence is empty)
+        """
+        lengths: np.ndarray = np.fromiter((len(sequence) for sequence in sequences), dtype=np.int64, count=len(sequences))
+        offsets: np.ndarray = np.zeros(len(sequences) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        edges: np.ndarray = np.concatenate(sequences).astype(np.int64) if offsets[-1] else np.zeros(0, dtype=np.int64)
+        # Edge must exist and be connected to previous edge (unless it is first on sequence)
+        valid: np.ndarray = (edges >= 0) & (edges < self.edge_count)
+        valid[valid] = self.edge_mask[edges[valid]]
+        table: np.ndarray = self.get_connection_table()
+        keys: np.ndarray = edges[:-1] * self.edge_count + edges[1:]
+        connected: np.ndarray = np.zeros(len(keys), dtype=bool)
+        if len(table) != 0:
+            connected = table[np.minimum(np.searchsorted(table, keys), len(table) - 1)] == keys
+        # First edges of sequences have no predecessor
+        starts: np.ndarray = offsets[1:-1]
+        connected[starts[(starts > 0) & (starts < len(edges))] - 1] = True
+        valid[1:] &= connected
+        # Index of first invalid edge on each sequence
+        first_invalid: np.ndarray = np.full(len(sequences), -1, dtype=np.int64)
+        invalid: np.ndarray = np.flatnonzero(~valid)
+        sequence_ids, positions = np.unique(np.searchsorted(offsets, invalid, side="right") - 1, return_index=True)
+        first_invalid[sequence_ids] = invalid[positions] - offsets[sequence_ids]
+        first_invalid[lengths == 0] = 0
+        return first_invalid < 0, first_invalid
+
+    # ------------------------------------------ Utils ------------------------------------------
+
+    def info(self) -> str:
+        """
+        :return: String describing size of arrays
+        """
+        return (
+            f"CsrGraph: junctions: {int(self.junction_mask.sum())}/{self.junction_count}, "
+            f"edges: {int(self.edge_mask.sum())}/{self.edge_count}, "
+            f"routes: {int(self.route_mask.sum())}/{self.route_count}, connections: {len(self.adj_targets)}"
+        )
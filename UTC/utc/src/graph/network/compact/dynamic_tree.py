@@ -0,0 +1,194 @@
+from utc.src.graph.network.compact.csr_graph import CsrGraph
+from utc.src.graph.network.compact.route_costs import RouteCosts
+import numpy as np
+import heapq
+from typing import List, Set, Tuple
+
+
+class DynamicTree:
+    """
+    Shortest path tree (by travel time) over turn-expanded graph of routes, rooted at origin route (forward tree)
+    or at destination route (reverse tree), which is repaired after travel times change instead of being computed
+    again. Increased travel times raise distances of subtrees hanging on changed routes (their routes are seeded
+    only if neighbours offer faster path), decreased travel times only seed neighbours of changed routes, the rest
+    of tree is kept. Costs are the same as in DUO, i.e. travel time of the starting route is not counted.
+    """
+    def __init__(self, csr: CsrGraph, costs: RouteCosts, root: int, reverse: bool = False):
+        """
+        :param csr: array representation of network
+        :param costs: of routes (current travel times)
+        :param root: internal id of origin route (or destination route, if tree is reversed)
+        :param reverse: if tree holds paths to root (instead of paths from root), default False
+        """
+        self.csr: CsrGraph = csr
+        self.costs: RouteCosts = costs
+        self.root: int = root
+        self.reverse: bool = reverse
+        self.epoch: int = -1  # Epoch of travel times, for which tree is valid
+        self.weights: np.ndarray = np.zeros(0, dtype=np.float64)
+        self.distances: List[float] = []
+        self.parents: List[int] = []
+        self.settled: int = 0  # Number of routes settled by the last build (or repair)
+        self.build()
+
+    def build(self) -> None:
+        """
+        Computes the whole tree again (by Dijkstra's search)
+
+        :return: None
+        """
+        self.epoch = self.costs.epoch
+        self.weights = self.costs.travel_time.copy()
+        self.distances = [float("inf")] * self.csr.route_count
+        self.parents = [-1] * self.csr.route_count
+        self.distances[self.root] = 0
+        self.settled = self.propagate([(0., self.root)])
+
+    def update(self) -> int:
+        """
+        Repairs tree after travel times of routes were changed (nothing is done, if they are the same)
+
+        :return: Number of settled routes (work done by repair)
+        """
+        if self.epoch == self.costs.epoch:
+            return 0
+        changed: np.ndarray = np.flatnonzero(self.costs.travel_time != self.weights)
+        increased: Set[int] = set(changed[self.costs.travel_time[changed] > self.weights[changed]].tolist())
+        decreased: List[int] = changed[self.costs.travel_time[changed] < self.weights[changed]].tolist()
+        self.epoch = self.costs.epoch
+        self.weights = self.costs.travel_time.copy()
+        weights: List[float] = self.costs.get_list("travel_time")
+        outgoing, incoming = self.get_adjacency()
+        distances, parents = self.distances, self.parents
+        queue: List[Tuple[float, int]] = []
+        # ---------- Increases ----------
+        # Tree edge is affected, if its cost changed (cost of edge is weight of entered route, or of left route if reversed)
+        if self.reverse:
+            roots: List[int] = self.get_children(increased)
+        else:
+            roots: List[int] = [route_id for route_id in increased if parents[route_id] != -1]
+        # Tree paths of affected routes are still valid, their distances are raised along tree
+        # (parents have lower distances than their children, so they are processed first)
+        affected: List[int] = sorted(self.get_subtrees(roots), key=distances.__getitem__)
+        for route_id in affected:
+            parent: int = parents[route_id]
+            distance: float = distances[parent] + weights[parent if self.reverse else route_id]
+            # Tree path can also contain decreased routes, lowered routes have to relax their neighbours
+            if distance < distances[route_id]:
+                queue.append((distance, route_id))
+            distances[route_id] = distance
+        # Affected routes are seeded only if their neighbours offer faster path than tree
+        for route_id in affected:
+            best, parent = distances[route_id], parents[route_id]
+            for neighbour in incoming[route_id]:
+                cost: float = distances[neighbour] + weights[neighbour if self.reverse else route_id]
+                if cost < best:
+                    best, parent = cost, neighbour
+            if parent != parents[route_id]:
+                distances[route_id], parents[route_id] = best, parent
+                queue.append((best, route_id))
+        # ---------- Decreases ----------
+        for route_id in decreased:
+            if self.reverse:
+                cost: float = distances[route_id] + weights[route_id]
+                for neighbour in outgoing[route_id]:
+                    if cost < distances[neighbour]:
+                        distances[neighbour], parents[neighbour] = cost, route_id
+                        queue.append((cost, neighbour))
+                continue
+            for neighbour in incoming[route_id]:
+                cost: float = distances[neighbour] + weights[route_id]
+                if cost < distances[route_id]:
+                    distances[route_id], parents[route_id] = cost, neighbour
+                    queue.append((cost, route_id))
+        heapq.heapify(queue)
+        self.settled = self.propagate(queue)
+        return self.settled
+
+    def propagate(self, queue: List[Tuple[float, int]]) -> int:
+        """
+        Dijkstra's search from routes of queue, whose distances were lowered (or set)
+
+        :param queue: heap of distances and routes
+        :return: Number of settled routes
+        """
+        weights: List[float] = self.costs.get_list("travel_time")
+        outgoing: List[List[int]] = self.get_adjacency()[0]
+        distances, parents = self.distances, self.parents
+        settled: int = 0
+        while queue:
+            distance, route_id = heapq.heappop(queue)
+            if distance > distances[route_id]:
+                continue
+            settled += 1
+            for neighbour in outgoing[route_id]:
+                cost: float = distance + weights[route_id if self.reverse else neighbour]
+                if cost < distances[neighbour]:
+                    distances[neighbour], parents[neighbour] = cost, route_id
+                    heapq.heappush(queue, (cost, neighbour))
+        return settled
+
+    # ------------------------------------------ Getters ------------------------------------------
+
+    def get_distance(self, route_id: int) -> float:
+        """
+        :param route_id: internal id of route
+        :return: Travel time between root and route, infinity if route is unreachable
+        """
+        return self.distances[route_id]
+
+    def get_path(self, route_id: int) -> List[int]:
+        """
+        :param route_id: internal id of route
+        :return: Internal id's of routes on the fastest path (from origin to destination), empty if route is unreachable
+        """
+        if self.distances[route_id] == float("inf"):
+            return []
+        path: List[int] = [route_id]
+        while self.parents[path[-1]] != -1:
+            path.append(self.parents[path[-1]])
+        if not self.reverse:
+            path.reverse()
+        return path
+
+    def get_adjacency(self) -> Tuple[List[List[int]], List[List[int]]]:
+        """
+        :return: Outgoing and incoming neighbours of routes in direction of search
+        """
+        if self.reverse:
+            return self.csr.get_reverse_adjacency(), self.csr.get_adjacency()
+        return self.csr.get_adjacency(), self.csr.get_reverse_adjacency()
+
+    def get_children(self, route_ids: Set[int]) -> List[int]:
+        """
+        :param route_ids: internal id's of routes
+        :return: Internal id's of routes, whose parent in tree is one of given routes
+        """
+        if not route_ids:
+            return []
+        parents: np.ndarray = np.array(self.parents, dtype=np.int64)
+        return np.flatnonzero(np.isin(parents, list(route_ids))).tolist()
+
+    def get_subtrees(self, roots: List[int]) -> List[int]:
+        """
+        :param roots: internal id's of routes
+        :return: Internal id's of routes in subtrees of given routes (including them)
+        """
+        if not roots:
+            return []
+        # Children of route 'i' are: order[offsets[i]:offsets[i+1]]
+        parents: np.ndarray = np.array(self.parents, dtype=np.int64)
+        order: np.ndarray = np.argsort(parents, kind="stable")
+        offsets: List[int] = np.searchsorted(parents[order], np.arange(len(parents) + 1)).tolist()
+        children: List[int] = order.tolist()
+        subtrees: List[int] = []
+        visited: Set[int] = set()
+        stack: List[int] = list(roots)
+        while stack:
+            route_id: int = stack.pop()
+            if route_id in visited:
+                continue
+            visited.add(route_id)
+            subtrees.append(route_id)
+            stack.extend(children[offsets[route_id]:offsets[route_id + 1]])
+        return subtrees
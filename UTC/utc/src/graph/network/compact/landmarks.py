@@ -0,0 +1,126 @@
+from utc.src.graph.network.compact.csr_graph import CsrGraph
+from utc.src.graph.network.compact.route_costs import RouteCosts
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+
+class Landmarks:
+    """
+    Landmark (ALT) lower bounds on distances between routes of turn-expanded graph. For each landmark 'L'
+    and metric, distances 'd(L, r)' and 'd(r, L)' to every route 'r' are precomputed (stored in network snapshot),
+    by triangle inequality: 'd(r, t) >= max(d(L, t) - d(L, r), d(r, L) - d(t, L))' for any goal route 't'.
+    Distance 'd(a, b)' is the sum of weights of routes entered on the shortest path from 'a' to 'b'
+    (excluding 'a'), landmarks are chosen by farthest selection, so that they lie on the border of network.
+    Bounds stay admissible on sub-graphs of network, since their distances can only be longer.
+    """
+    METRICS: Tuple[str, ...] = ("length", "free_flow")  # Metrics of landmarks (attributes of RouteCosts)
+
+    def __init__(self, landmarks: np.ndarray, tables: Dict[str, np.ndarray]):
+        """
+        :param landmarks: internal id's of landmark routes
+        :param tables: mapping of '<metric>_from' and '<metric>_to' to distances from and to
+        landmarks (shape: (landmarks, routes)), for each metric
+        """
+        self.landmarks: np.ndarray = np.asarray(landmarks, dtype=np.int64)
+        self.tables: Dict[str, np.ndarray] = tables
+        assert all(len(self.tables[f"{metric}_{direction}"]) == len(self.landmarks)
+                   for metric in self.METRICS for direction in ("from", "to"))
+
+    @classmethod
+    def from_network(cls, csr: CsrGraph, costs: RouteCosts, count: int = 8) -> 'Landmarks':
+        """
+        :param csr: array representation of network
+        :param costs: of routes
+        :param count: number of landmarks
+        :return: Landmarks of network
+        """
+        graphs: Dict[str, Tuple[csr_matrix, csr_matrix]] = {}
+        for metric in cls.METRICS:
+            graph: csr_matrix = costs.get_graph(metric)
+            graphs[metric] = (graph, graph.transpose().tocsr())
+        landmarks: np.ndarray = cls.select_landmarks(csr, *graphs["length"], count)
+        tables: Dict[str, np.ndarray] = {}
+        for metric, (graph, reversed_graph) in graphs.items():
+            tables[f"{metric}_from"] = dijkstra(graph, indices=landmarks).reshape(len(landmarks), csr.route_count)
+            tables[f"{metric}_to"] = dijkstra(reversed_graph, indices=landmarks).reshape(len(landmarks), csr.route_count)
+        return cls(landmarks, tables)
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> Optional['Landmarks']:
+        """
+        :param arrays: loaded from network snapshot (created by 'to_arrays' method)
+        :return: Landmarks, None if arrays do not contain them
+        """
+        if "landmark_routes" not in arrays:
+            return None
+        return cls(arrays["landmark_routes"], {
+            f"{metric}_{direction}": arrays[f"landmark_{metric}_{direction}"]
+            for metric in cls.METRICS for direction in ("from", "to")
+        })
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        :return: Dictionary mapping name of array to array (stored in network snapshot)
+        """
+        arrays: Dict[str, np.ndarray] = {"landmark_routes": self.landmarks}
+        arrays.update({f"landmark_{name}": table for name, table in self.tables.items()})
+        return arrays
+
+    # ------------------------------------------ Getters ------------------------------------------
+
+    def get_bounds(self, metric: str, goal_route: int) -> np.ndarray:
+        """
+        :param metric: of distances (length, free_flow)
+        :param goal_route: internal id of goal route
+        :return: Lower bounds on distance from each route to goal route (indexed by internal id's of routes),
+        infinity for routes from which goal route cannot be reached
+        """
+        table_from: np.ndarray = self.tables[f"{metric}_from"]
+        table_to: np.ndarray = self.tables[f"{metric}_to"]
+        # Differences of infinite distances are undefined (landmark does not bound such routes)
+        with np.errstate(invalid="ignore"):
+            bounds: np.ndarray = np.maximum(
+                table_from[:, goal_route, None] - table_from, table_to - table_to[:, goal_route, None]
+            )
+        bounds[np.isnan(bounds)] = 0
+        return np.maximum(bounds.max(axis=0, initial=0), 0)
+
+    # ------------------------------------------ Utils ------------------------------------------
+
+    @staticmethod
+    def select_landmarks(csr: CsrGraph, graph: csr_matrix, reversed_graph: csr_matrix, count: int) -> np.ndarray:
+        """
+        :param csr: array representation of network
+        :param graph: turn-expanded graph of network
+        :param reversed_graph: transposed turn-expanded graph
+        :param count: number of landmarks
+        :return: Internal id's of routes, each being the farthest from previously chosen landmarks
+        (sum of distances in both directions, unreachable directions are not counted)
+        """
+        routes: np.ndarray = np.flatnonzero(csr.route_mask)
+        if len(routes) == 0:
+            return np.zeros(0, dtype=np.int64)
+        # First landmark is the farthest route from arbitrary route
+        landmarks: List[int] = [int(routes[np.argmax(Landmarks.round_trip(graph, reversed_graph, routes[0], routes))])]
+        closest: np.ndarray = Landmarks.round_trip(graph, reversed_graph, landmarks[0], routes)
+        while len(landmarks) < min(count, len(routes)):
+            closest[np.isin(routes, landmarks)] = -1
+            landmarks.append(int(routes[np.argmax(closest)]))
+            np.minimum(closest, Landmarks.round_trip(graph, reversed_graph, landmarks[-1], routes), out=closest)
+        return np.array(landmarks, dtype=np.int64)
+
+    @staticmethod
+    def round_trip(graph: csr_matrix, reversed_graph: csr_matrix, route: int, routes: np.ndarray) -> np.ndarray:
+        """
+        :param graph: turn-expanded graph of network
+        :param reversed_graph: transposed turn-expanded graph
+        :param route: internal id of route
+        :param routes: internal id's of routes
+        :return: Sum of distances from and to route for each of routes (unreachable directions are not counted)
+        """
+        return (
+            np.nan_to_num(dijkstra(graph, indices=route)[routes], posinf=0) +
+            np.nan_to_num(dijkstra(reversed_graph, indices=route)[routes], posinf=0)
+        )
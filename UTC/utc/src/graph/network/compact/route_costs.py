@@ -0,0 +1,110 @@
+from utc.src.graph.network.compact.csr_graph import CsrGraph
+from utc.src.constants.static.pddl_constants import NetworkCapacity
+from scipy.sparse import csr_matrix
+import numpy as np
+from typing import Dict, List, Tuple, Iterable
+
+
+class RouteCosts:
+    """
+    Costs of routes (length, free-flow travel time, capacity and current travel time)
+    stored in arrays indexed by internal id's of routes, computed from edges of routes at once
+    (instead of summing over edges of route on each query). Travel times are updated in bulk,
+    each update increases 'epoch' (cached lists and graphs are rebuilt only after change).
+    """
+    def __init__(self, csr: CsrGraph):
+        """
+        :param csr: array representation of road network
+        """
+        self.csr: CsrGraph = csr
+        self.epoch: int = 0  # Number of travel time updates
+        # Route of each edge in 'csr.route_edges'
+        self.edge_route: np.ndarray = np.repeat(np.arange(csr.route_count), np.diff(csr.route_offsets))
+        # ------------------------------ Edges ------------------------------
+        speed: np.ndarray = np.where(csr.edge_speed > 0, csr.edge_speed, 1)
+        self.edge_free_flow: np.ndarray = csr.edge_length / speed
+        self.edge_travel_time: np.ndarray = np.zeros(csr.edge_count, dtype=np.float64)
+        # ------------------------------ Routes ------------------------------
+        self.length: np.ndarray = self.sum_edges(csr.edge_length)
+        self.free_flow: np.ndarray = self.sum_edges(self.edge_free_flow)
+        self.capacity: np.ndarray = self.get_capacities()
+        self.travel_time: np.ndarray = np.zeros(csr.route_count, dtype=np.float64)
+        self._lists: Dict[str, Tuple[int, List[float]]] = {}
+        self._graphs: Dict[str, Tuple[int, csr_matrix]] = {}
+        self.load_travel_time()
+
+    # ------------------------------------------ Getters ------------------------------------------
+
+    def get_list(self, name: str) -> List[float]:
+        """
+        :param name: of cost array (length, free_flow, capacity, travel_time)
+        :return: Cost array as python list (faster to index in pure python loops than arrays),
+        cached until travel times are updated
+        """
+        epoch, values = self._lists.get(name, (-1, None))
+        if epoch != self.epoch:
+            values = getattr(self, name).tolist()
+            self._lists[name] = (self.epoch, values)
+        return values
+
+    def get_graph(self, name: str) -> csr_matrix:
+        """
+        :param name: of cost array (length, free_flow, capacity, travel_time)
+        :return: Turn-expanded graph of routes (see 'CsrGraph.get_route_graph'), transition from route 'i'
+        to route 'j' costs cost of route 'j', cached until travel times are updated (static costs are kept)
+        """
+        epoch: int = self.epoch if name == "travel_time" else 0
+        cached_epoch, graph = self._graphs.get(name, (-1, None))
+        if cached_epoch != epoch:
+            graph = self.csr.get_route_graph(getattr(self, name))
+            self._graphs[name] = (epoch, graph)
+        return graph
+
+    def get_capacities(self) -> np.ndarray:
+        """
+        :return: Capacities of routes (same as 'Route.get_capacity')
+        """
+        # Lowest number of lanes on route, at least 1
+        lanes: np.ndarray = np.full(self.csr.route_count, np.iinfo(np.int32).max, dtype=np.int64)
+        np.minimum.at(lanes, self.edge_route, self.csr.edge_lanes[self.csr.route_edges])
+        lanes = np.maximum(lanes, 1)
+        vehicles: np.ndarray = (self.length / (NetworkCapacity.CAR_LENGTH + NetworkCapacity.MIN_GAP)).astype(np.int64)
+        return np.maximum(vehicles, 1) * lanes
+
+    # ------------------------------------------ Travel time ------------------------------------------
+
+    def update_travel_time(self, edge_indexes: Iterable[int], travel_time: Iterable[float]) -> None:
+        """
+        Sets current travel time of edges and recomputes travel time of all routes
+
+        :param edge_indexes: internal id's of edges
+        :param travel_time: of edges (seconds)
+        :return: None
+        """
+        self.edge_travel_time[np.fromiter(edge_indexes, dtype=np.int64)] = np.fromiter(travel_time, dtype=np.float64)
+        self.travel_time = self.sum_edges(self.edge_travel_time)
+        self.epoch += 1
+
+    def load_travel_time(self) -> None:
+        """
+        Reads current travel time of edges from their 'travelTime' attribute
+        (free-flow travel time is used for edges without it).
+
+        :return: None
+        """
+        edge_indexes: np.ndarray = np.flatnonzero(self.csr.edge_mask)
+        self.update_travel_time(edge_indexes, (
+            self.csr.edges[index].attributes.get("travelTime", self.edge_free_flow[index])
+            for index in edge_indexes.tolist()
+        ))
+
+    # ------------------------------------------ Utils ------------------------------------------
+
+    def sum_edges(self, values: np.ndarray) -> np.ndarray:
+        """
+        :param values: of edges (indexed by internal id's of edges)
+        :return: Sums of values over edges of each route (indexed by internal id's of routes)
+        """
+        return np.bincount(
+            self.edge_route, weights=values[self.csr.route_edges], minlength=self.csr.route_count
+        ).astype(np.float64)
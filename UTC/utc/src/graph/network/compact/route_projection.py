@@ -0,0 +1,90 @@
+from utc.src.graph.network.compact.csr_graph import CsrGraph
+from utc.src.graph.network.parts import Edge
+from utc.src.constants.file_system.file_types.xml_file import XmlFile
+import numpy as np
+from typing import List, Tuple, Iterator
+
+
+class RouteProjection:
+    """
+    Projects routes (sequences of original edge id's) onto network, i.e. finds the longest run
+    of consecutive edges of route which are in network (same as 'EdgeManager.get_longest_sequence').
+    Routes are processed in batches, edges are mapped to integer membership mask and runs of edges
+    in network are found by run-length encoding of this mask, for all routes at once.
+    """
+    def __init__(self, csr: CsrGraph):
+        """
+        :param csr: array representation of network on which routes are projected
+        """
+        self.csr: CsrGraph = csr
+
+    def project(self, sequences: List[List[str]]) -> np.ndarray:
+        """
+        :param sequences: of edges (original id's), e.g. routes of scenario
+        :return: Array of shape (len(sequences), 2), containing indexes (start, end) of longest run
+        of edges in network for each sequence (end is excluded), (-1, -1) if sequence has no edge in network
+        """
+        bounds: np.ndarray = np.full((len(sequences), 2), -1, dtype=np.int64)
+        lengths: np.ndarray = np.fromiter((len(sequence) for sequence in sequences), dtype=np.int64, count=len(sequences))
+        offsets: np.ndarray = np.zeros(len(sequences) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        if offsets[-1] == 0:
+            return bounds
+        # Membership mask of edges, padded by 'False' on both sides of each sequence
+        inside: np.ndarray = self.csr.get_edge_indexes(
+            edge_id for sequence in sequences for edge_id in sequence
+        ) >= 0
+        padded: np.ndarray = np.zeros(offsets[-1] + len(sequences) + 1, dtype=np.int8)
+        padded[np.arange(offsets[-1]) + np.repeat(np.arange(1, len(sequences) + 1), lengths)] = inside
+        # Runs of edges in network (start and end indexes in padded array)
+        changes: np.ndarray = np.diff(padded)
+        starts: np.ndarray = np.flatnonzero(changes == 1)
+        ends: np.ndarray = np.flatnonzero(changes == -1)
+        if len(starts) == 0:
+            return bounds
+        # Sequence of each run (padded index of sequence start is 'offsets[i] + i + 1')
+        sequence_ids: np.ndarray = np.searchsorted(
+            offsets[:-1] + np.arange(len(sequences)) + 1, starts + 1, side="right"
+        ) - 1
+        # Longest run of each sequence (first one, in case of ties)
+        order: np.ndarray = np.lexsort((starts, starts - ends, sequence_ids))
+        best_sequences, positions = np.unique(sequence_ids[order], return_index=True)
+        best: np.ndarray = order[positions]
+        padding: np.ndarray = offsets[best_sequences] + best_sequences + 1
+        bounds[best_sequences, 0] = starts[best] + 1 - padding
+        bounds[best_sequences, 1] = ends[best] + 1 - padding
+        return bounds
+
+    def project_edges(self, sequence: List[str]) -> Tuple[List[Edge], Tuple[int, int]]:
+        """
+        :param sequence: of edges (original id's)
+        :return: Longest sequence of edges that is in network (can be empty),
+        along with indexes of where the sequence was found ((-1, -1) if it is empty)
+        """
+        start, end = self.project([sequence])[0].tolist()
+        if start < 0:
+            return [], (-1, -1)
+        return [self.csr.edges[self.csr.edge_index[edge_id]] for edge_id in sequence[start:end]], (start, end)
+
+    def project_file(self, routes_file: XmlFile, batch_size: int = 10000) -> Iterator[Tuple[str, List[str], Tuple[int, int]]]:
+        """
+        Projects routes of file in batches, in streaming mode of file only the current batch is kept in memory.
+
+        :param routes_file: file containing 'route' elements (children of root)
+        :param batch_size: number of routes projected at once
+        :return: Generator of route id, edges of route (original id's) and indexes (start, end) of longest
+        run of edges in network, in order of file ((-1, -1) if route has no edge in network)
+        """
+        route_ids: List[str] = []
+        sequences: List[List[str]] = []
+        for route in routes_file.get_children({"route"}):
+            # Elements are cleared in streaming mode, only their attributes are kept
+            route_ids.append(route.attrib["id"])
+            sequences.append(route.attrib["edges"].split())
+            if len(sequences) < batch_size:
+                continue
+            for route_id, sequence, bounds in zip(route_ids, sequences, self.project(sequences).tolist()):
+                yield route_id, sequence, tuple(bounds)
+            route_ids, sequences = [], []
+        for route_id, sequence, bounds in zip(route_ids, sequences, self.project(sequences).tolist()):
+            yield route_id, sequence, tuple(bounds)
@@ -0,0 +1,77 @@
+from utc.src.graph.network.compact.csr_graph import CsrGraph
+from typing import List
+
+
+class SearchTree:
+    """
+    Arena of search nodes (parallel lists indexed by node id), each node represents path trough
+    network by its route and pointer to parent node (paths are shared, instead of being copied).
+    Edges on path of node are summarized by bit signature (edge id modulo signature size),
+    loops are checked trough parent pointers only when signature does not rule them out.
+    Paths are materialized only when requested (e.g. for found routes).
+    """
+    __slots__ = ("route_edges", "bits", "parent", "route", "cost", "on_path", "signature")
+
+    def __init__(self, csr: CsrGraph, bits: int = 256):
+        """
+        :param csr: array representation of network (edges of routes)
+        :param bits: size of bit signature of nodes (signature is exact for networks with fewer edges)
+        """
+        self.route_edges: List[List[int]] = csr.get_route_edge_lists()
+        self.bits: int = bits
+        self.parent: List[int] = []
+        self.route: List[int] = []
+        self.cost: List[float] = []
+        self.on_path: List[bool] = []
+        self.signature: List[int] = []
+
+    def add_node(self, parent: int, route_id: int, cost: float, on_path: bool = True) -> int:
+        """
+        :param parent: id of parent node (-1 for root)
+        :param route_id: internal id of route
+        :param cost: of path ending with route
+        :param on_path: True if edges of route are part of path (False e.g. for incoming route of starting junction)
+        :return: Id of new node
+        """
+        signature: int = self.signature[parent] if parent >= 0 else 0
+        if on_path:
+            for edge_id in self.route_edges[route_id]:
+                signature |= 1 << (edge_id % self.bits)
+        self.parent.append(parent)
+        self.route.append(route_id)
+        self.cost.append(cost)
+        self.on_path.append(on_path)
+        self.signature.append(signature)
+        return len(self.parent) - 1
+
+    def has_edge(self, node: int, edge_id: int) -> bool:
+        """
+        :param node: id of node
+        :param edge_id: internal id of edge
+        :return: True if edge is on path of node, False otherwise
+        """
+        if not (self.signature[node] >> (edge_id % self.bits)) & 1:
+            return False
+        while node >= 0:
+            if self.on_path[node] and edge_id in self.route_edges[self.route[node]]:
+                return True
+            node = self.parent[node]
+        return False
+
+    def get_path(self, node: int) -> List[int]:
+        """
+        :param node: id of node
+        :return: Internal id's of edges on path of node (from root)
+        """
+        routes: List[int] = []
+        while node >= 0:
+            if self.on_path[node]:
+                routes.append(self.route[node])
+            node = self.parent[node]
+        return [edge_id for route_id in reversed(routes) for edge_id in self.route_edges[route_id]]
+
+    def __len__(self) -> int:
+        """
+        :return: Number of nodes in tree
+        """
+        return len(self.parent)
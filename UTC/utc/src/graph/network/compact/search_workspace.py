@@ -0,0 +1,81 @@
+from typing import List
+
+
+class SearchWorkspace:
+    """
+    Reusable state of graph searches (distances, parents) indexed by internal id's of routes. Entry is valid
+    only if its stamp equals the current generation, so workspace is reset in O(1) by incrementing
+    the generation, instead of allocating new containers for every search. Each searching instance
+    (or thread) has to own its workspace. Values are python lists (faster to index in pure python loops than arrays).
+    """
+    def __init__(self, size: int = 0):
+        """
+        :param size: number of routes (internal id's), grows on demand
+        """
+        self.distances: List[float] = [float("inf")] * size
+        self.parents: List[int] = [-1] * size
+        self.stamps: List[int] = [0] * size
+        self.generation: int = 1  # Stamps of new entries are always older
+
+    def prepare(self, size: int) -> 'SearchWorkspace':
+        """
+        Invalidates all entries (start of new search), grows workspace if needed
+
+        :param size: number of routes (internal id's) of searched network
+        :return: Self
+        """
+        if size > len(self.stamps):
+            missing: int = size - len(self.stamps)
+            self.distances.extend([float("inf")] * missing)
+            self.parents.extend([-1] * missing)
+            self.stamps.extend([0] * missing)
+        self.generation += 1
+        return self
+
+    # ------------------------------------------ Getters ------------------------------------------
+
+    def get_distance(self, route_id: int) -> float:
+        """
+        :param route_id: internal id of route
+        :return: Distance of route, infinity if route was not reached by the current search
+        """
+        return self.distances[route_id] if self.stamps[route_id] == self.generation else float("inf")
+
+    def get_parent(self, route_id: int) -> int:
+        """
+        :param route_id: internal id of route
+        :return: Internal id of parent route, -1 if route has no parent (or was not reached by the current search)
+        """
+        return self.parents[route_id] if self.stamps[route_id] == self.generation else -1
+
+    def get_path(self, route_id: int) -> List[int]:
+        """
+        :param route_id: internal id of reached route
+        :return: Internal id's of routes from root of search to given route (following parents)
+        """
+        path: List[int] = []
+        while route_id != -1:
+            path.append(route_id)
+            route_id = self.get_parent(route_id)
+        path.reverse()
+        return path
+
+    def reached(self, route_id: int) -> bool:
+        """
+        :param route_id: internal id of route
+        :return: True if route was reached by the current search, False otherwise
+        """
+        return self.stamps[route_id] == self.generation
+
+    # ------------------------------------------ Setters ------------------------------------------
+
+    def set(self, route_id: int, distance: float, parent: int = -1) -> None:
+        """
+        :param route_id: internal id of route
+        :param distance: of route
+        :param parent: internal id of parent route (default -1)
+        :return: None
+        """
+        self.distances[route_id] = distance
+        self.parents[route_id] = parent
+        self.stamps[route_id] = self.generation
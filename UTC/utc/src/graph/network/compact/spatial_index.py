@@ -0,0 +1,207 @@
+from utc.src.graph.network.parts import Junction, Edge
+from scipy.spatial import cKDTree
+import numpy as np
+from typing import List, Tuple, TYPE_CHECKING
+if TYPE_CHECKING:
+    from utc.src.graph.network.road_network import RoadNetwork
+
+
+class SpatialIndex:
+    """
+    Spatial index (KD-trees) over junctions (positions) and edges (centroids & bounding boxes
+    of their lane shapes) of road network, answers nearest, radius and bounding box queries
+    without scanning all objects. Geometry of edges is computed once (stored in network snapshot).
+    """
+    def __init__(
+            self, junction_ids: List[str], junction_index: np.ndarray, junction_xy: np.ndarray,
+            edge_ids: List[str], edge_index: np.ndarray, edge_centroid: np.ndarray, edge_bbox: np.ndarray
+        ):
+        """
+        :param junction_ids: original id's of junctions
+        :param junction_index: internal id's of junctions
+        :param junction_xy: positions of junctions (shape: (N, 2))
+        :param edge_ids: original id's of edges
+        :param edge_index: internal id's of edges
+        :param edge_centroid: centroids of edges (shape: (M, 2))
+        :param edge_bbox: bounding boxes of edges -> [x_min, y_min, x_max, y_max] (shape: (M, 4))
+        """
+        self.junction_ids: List[str] = junction_ids
+        self.junction_index: np.ndarray = np.asarray(junction_index, dtype=np.int32)
+        self.junction_xy: np.ndarray = np.asarray(junction_xy, dtype=np.float64).reshape(-1, 2)
+        self.edge_ids: List[str] = edge_ids
+        self.edge_index: np.ndarray = np.asarray(edge_index, dtype=np.int32)
+        self.edge_centroid: np.ndarray = np.asarray(edge_centroid, dtype=np.float64).reshape(-1, 2)
+        self.edge_bbox: np.ndarray = np.asarray(edge_bbox, dtype=np.float64).reshape(-1, 4)
+        assert (len(junction_ids) == len(self.junction_index) == len(self.junction_xy))
+        assert (len(edge_ids) == len(self.edge_index) == len(self.edge_centroid) == len(self.edge_bbox))
+        self.junction_tree: cKDTree = cKDTree(self.junction_xy)
+        self.edge_tree: cKDTree = cKDTree(self.edge_centroid)
+        # Largest distance between centroid of edge and corner of its bounding box,
+        # every edge intersecting query region has centroid closer than query radius + this value
+        extent: np.ndarray = np.maximum(
+            self.edge_centroid - self.edge_bbox[:, :2], self.edge_bbox[:, 2:] - self.edge_centroid
+        )
+        self.edge_extent: float = float(np.max(np.hypot(extent[:, 0], extent[:, 1]), initial=0))
+
+    # ------------------------------------------ Junctions ------------------------------------------
+
+    def nearest_junctions(self, x: float, y: float, k: int = 1) -> List[str]:
+        """
+        :param x: coordinate of point
+        :param y: coordinate of point
+        :param k: number of junctions
+        :return: Id's of (at most) k junctions closest to point, sorted by distance
+        """
+        return [self.junction_ids[i] for i in self.query_nearest(self.junction_tree, x, y, k)]
+
+    def junctions_in_radius(self, x: float, y: float, radius: float) -> List[str]:
+        """
+        :param x: coordinate of center
+        :param y: coordinate of center
+        :param radius: of circle (meters)
+        :return: Id's of junctions inside of circle
+        """
+        return [self.junction_ids[i] for i in sorted(self.junction_tree.query_ball_point((x, y), radius))]
+
+    def junctions_in_box(self, x_min: float, y_min: float, x_max: float, y_max: float) -> List[str]:
+        """
+        :param x_min: lower left corner of box
+        :param y_min: lower left corner of box
+        :param x_max: upper right corner of box
+        :param y_max: upper right corner of box
+        :return: Id's of junctions inside of box
+        """
+        candidates: np.ndarray = self.box_candidates(self.junction_tree, x_min, y_min, x_max, y_max, 0)
+        xy: np.ndarray = self.junction_xy[candidates]
+        inside: np.ndarray = (xy[:, 0] >= x_min) & (xy[:, 0] <= x_max) & (xy[:, 1] >= y_min) & (xy[:, 1] <= y_max)
+        return [self.junction_ids[i] for i in candidates[inside].tolist()]
+
+    # ------------------------------------------ Edges ------------------------------------------
+
+    def nearest_edges(self, x: float, y: float, k: int = 1) -> List[str]:
+        """
+        :param x: coordinate of point
+        :param y: coordinate of point
+        :param k: number of edges
+        :return: Id's of (at most) k edges, which centroids are closest to point, sorted by distance
+        """
+        return [self.edge_ids[i] for i in self.query_nearest(self.edge_tree, x, y, k)]
+
+    def edges_in_radius(self, x: float, y: float, radius: float) -> List[str]:
+        """
+        :param x: coordinate of center
+        :param y: coordinate of center
+        :param radius: of circle (meters)
+        :return: Id's of edges, which bounding boxes intersect circle
+        """
+        candidates: np.ndarray = np.array(
+            sorted(self.edge_tree.query_ball_point((x, y), radius + self.edge_extent)), dtype=np.int64
+        )
+        bbox: np.ndarray = self.edge_bbox[candidates]
+        # Distance from center to the closest point of bounding box
+        dx: np.ndarray = np.maximum(np.maximum(bbox[:, 0] - x, x - bbox[:, 2]), 0)
+        dy: np.ndarray = np.maximum(np.maximum(bbox[:, 1] - y, y - bbox[:, 3]), 0)
+        return [self.edge_ids[i] for i in candidates[np.hypot(dx, dy) <= radius].tolist()]
+
+    def edges_in_box(self, x_min: float, y_min: float, x_max: float, y_max: float) -> List[str]:
+        """
+        :param x_min: lower left corner of box
+        :param y_min: lower left corner of box
+        :param x_max: upper right corner of box
+        :param y_max: upper right corner of box
+        :return: Id's of edges, which bounding boxes intersect box
+        """
+        candidates: np.ndarray = self.box_candidates(self.edge_tree, x_min, y_min, x_max, y_max, self.edge_extent)
+        bbox: np.ndarray = self.edge_bbox[candidates]
+        inside: np.ndarray = (
+            (bbox[:, 0] <= x_max) & (bbox[:, 2] >= x_min) & (bbox[:, 1] <= y_max) & (bbox[:, 3] >= y_min)
+        )
+        return [self.edge_ids[i] for i in candidates[inside].tolist()]
+
+    # ------------------------------------------ Utils ------------------------------------------
+
+    def subset(self, junction_mask: np.ndarray, edge_mask: np.ndarray) -> 'SpatialIndex':
+        """
+        :param junction_mask: boolean mask of junctions kept (indexed by internal id's)
+        :param edge_mask: boolean mask of edges kept (indexed by internal id's)
+        :return: Spatial index containing only junctions and edges selected by masks
+        """
+        junctions: np.ndarray = np.flatnonzero(junction_mask[self.junction_index])
+        edges: np.ndarray = np.flatnonzero(edge_mask[self.edge_index])
+        return SpatialIndex(
+            [self.junction_ids[i] for i in junctions.tolist()], self.junction_index[junctions],
+            self.junction_xy[junctions], [self.edge_ids[i] for i in edges.tolist()], self.edge_index[edges],
+            self.edge_centroid[edges], self.edge_bbox[edges]
+        )
+
+    @staticmethod
+    def from_network(road_network: 'RoadNetwork') -> 'SpatialIndex':
+        """
+        :param road_network: from which spatial index is built
+        :return: SpatialIndex of road network
+        """
+        junctions: List[Junction] = list(road_network.junctions.values())
+        edges: List[Edge] = list(road_network.edges.values())
+        edge_centroid, edge_bbox = SpatialIndex.get_edge_geometry(edges)
+        return SpatialIndex(
+            [junction.id for junction in junctions], [junction.internal_id for junction in junctions],
+            [junction.get_position() for junction in junctions], [edge.id for edge in edges],
+            [edge.internal_id for edge in edges], edge_centroid, edge_bbox
+        )
+
+    @staticmethod
+    def get_edge_geometry(edges: List[Edge]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :param edges: of road network
+        :return: Centroids (same as 'Edge.get_centroid') and bounding boxes of lane shapes of edges
+        """
+        centroid: np.ndarray = np.zeros((len(edges), 2), dtype=np.float64)
+        bbox: np.ndarray = np.zeros((len(edges), 4), dtype=np.float64)
+        for index, edge in enumerate(edges):
+            coords: np.ndarray = np.concatenate([
+                np.asarray(lane["shape"], dtype=np.float64).reshape(-1, 2) for lane in edge.lanes.values()
+            ])
+            centroid[index] = edge.get_centroid()
+            bbox[index, :2] = coords.min(axis=0)
+            bbox[index, 2:] = coords.max(axis=0)
+        return centroid, bbox
+
+    @staticmethod
+    def query_nearest(tree: cKDTree, x: float, y: float, k: int) -> List[int]:
+        """
+        :param tree: KD-tree
+        :param x: coordinate of point
+        :param y: coordinate of point
+        :param k: number of points
+        :return: Indexes of (at most) k points of tree closest to given point
+        """
+        k = min(k, tree.n)
+        if k < 1:
+            return []
+        _, indexes = tree.query((x, y), k=[i + 1 for i in range(k)])
+        return indexes.tolist()
+
+    @staticmethod
+    def box_candidates(
+            tree: cKDTree, x_min: float, y_min: float,
+            x_max: float, y_max: float, extent: float
+        ) -> np.ndarray:
+        """
+        :param tree: KD-tree
+        :param x_min: lower left corner of box
+        :param y_min: lower left corner of box
+        :param x_max: upper right corner of box
+        :param y_max: upper right corner of box
+        :param extent: maximal distance of object from its point in tree
+        :return: Sorted indexes of points of tree inside the square enclosing box (enlarged by extent)
+        """
+        center: Tuple[float, float] = ((x_min + x_max) / 2, (y_min + y_max) / 2)
+        radius: float = max(x_max - x_min, y_max - y_min) / 2 + extent
+        # Chebyshev distance (p=inf), ball is axis aligned square
+        return np.array(sorted(tree.query_ball_point(center, radius, p=np.inf)), dtype=np.int64)
+
+    def info(self) -> str:
+        """
+        :return: String describing size of index
+        """
+        return f"SpatialIndex: junctions: {len(self.junction_ids)}, edges: {len(self.edge_ids)}"
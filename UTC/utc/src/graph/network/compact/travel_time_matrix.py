@@ -0,0 +1,113 @@
+from utc.src.graph.network.compact.csr_graph import CsrGraph
+from utc.src.graph.network.compact.route_costs import RouteCosts
+from utc.src.graph.network.parts import Edge
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+import numpy as np
+from typing import Dict, List, Iterable, Optional, Set, Tuple, Union
+
+
+class TravelTimeMatrix:
+    """
+    Many-to-many matrices of costs between edges, computed by searches over turn-expanded graph of routes
+    (csgraph Dijkstra from all sources at once). Cost between edges is the same as in DUO, i.e. cost of
+    routes entered after leaving the source edge, up to the target edge (0 if edges are equal). Distances
+    from each source are cached per travel time epoch (of RouteCosts), so that repeated queries within
+    the same traffic window only search from new sources (searches with higher limit are reused).
+    """
+    WEIGHTS: Tuple[str, ...] = ("travel_time", "free_flow", "length")
+
+    def __init__(self, csr: CsrGraph, costs: RouteCosts, cache_size: int = 1024):
+        """
+        :param csr: array representation of network
+        :param costs: of routes
+        :param cache_size: maximal number of cached searches (per weight), default 1024
+        """
+        self.csr: CsrGraph = csr
+        self.costs: RouteCosts = costs
+        self.cache_size: int = cache_size
+        # Routes ending with edge 'e' are: end_routes[end_offsets[e]:end_offsets[e+1]]
+        self.end_routes, self.end_offsets = csr.get_end_table()
+        # Mapping of weight to epoch and (limit of search, distances of routes) from source routes
+        self._rows: Dict[str, Tuple[int, Dict[int, Tuple[float, np.ndarray]]]] = {}
+
+    def get_matrix(
+            self, sources: Iterable[Union[str, int, Edge]], targets: Iterable[Union[str, int, Edge]],
+            weight: str = "travel_time", limit: float = np.inf, sparse: bool = False
+        ) -> Optional[Union[np.ndarray, csr_matrix]]:
+        """
+        :param sources: original id's of edges, internal id's of edges or Edge instances
+        :param targets: original id's of edges, internal id's of edges or Edge instances
+        :param weight: of routes ('travel_time', 'free_flow' or 'length'), default 'travel_time'
+        :param limit: maximal cost, higher costs are considered unreachable (faster searches), default infinity
+        :param sparse: if matrix should be sparse (unreachable pairs are missing), default False
+        :return: Matrix of costs (shape: (sources, targets)), infinity for unreachable pairs
+        and edges which are not in network, None if weight is unknown
+        """
+        if weight not in self.WEIGHTS:
+            print(f"Unknown weight: '{weight}', expected one of: {self.WEIGHTS} !")
+            return None
+        source_routes: np.ndarray = self.csr.get_edge_indexes(sources)
+        target_edges: np.ndarray = self.csr.get_edge_indexes(targets)
+        # Single-edge routes share internal id with their edge
+        valid: np.ndarray = (source_routes >= 0) & (source_routes < self.csr.route_count)
+        valid[valid] = self.csr.route_mask[source_routes[valid]]
+        unique_routes, inverse = np.unique(source_routes[valid], return_inverse=True)
+        rows: Dict[int, np.ndarray] = self.get_rows(unique_routes.tolist(), weight, limit)
+        # Cost of target edge is the lowest cost of routes ending with it
+        target_edges[(target_edges < 0) | (target_edges >= self.csr.edge_count)] = self.csr.edge_count
+        offsets: np.ndarray = np.append(self.end_offsets, self.end_offsets[-1])
+        counts: np.ndarray = offsets[target_edges + 1] - offsets[target_edges]
+        starts: np.ndarray = np.cumsum(counts) - counts
+        positions: np.ndarray = np.repeat(offsets[target_edges] - starts, counts) + np.arange(counts.sum())
+        matrix: np.ndarray = np.full((len(source_routes), len(target_edges)), np.inf)
+        if positions.size != 0 and unique_routes.size != 0:
+            # Only costs of routes ending with target edges are gathered (once for each source)
+            columns: np.ndarray = self.end_routes[positions]
+            target_costs: np.ndarray = np.minimum.reduceat(
+                np.array([rows[route_id][columns] for route_id in unique_routes.tolist()]), starts[counts > 0], axis=1
+            )
+            # Rows can come from searches with higher limit
+            target_costs[target_costs > limit] = np.inf
+            matrix[np.ix_(np.flatnonzero(valid), np.flatnonzero(counts > 0))] = target_costs[inverse]
+        if not sparse:
+            return matrix
+        reachable: np.ndarray = np.isfinite(matrix)
+        return csr_matrix((matrix[reachable], np.nonzero(reachable)), shape=matrix.shape)
+
+    # ------------------------------------------ Getters ------------------------------------------
+
+    def get_rows(self, source_routes: List[int], weight: str, limit: float) -> Dict[int, np.ndarray]:
+        """
+        :param source_routes: internal id's of starting routes
+        :param weight: of routes ('travel_time', 'free_flow' or 'length')
+        :param limit: maximal cost of searches
+        :return: Mapping of starting route to costs of all routes from it, costs above limit can be finite
+        (routes missing or searched with lower limit are searched)
+        """
+        epoch: int = self.get_epoch(weight)
+        cached_epoch, rows = self._rows.get(weight, (-1, {}))
+        if cached_epoch != epoch:
+            rows = {}
+            self._rows[weight] = (epoch, rows)
+        missing: List[int] = [route_id for route_id in source_routes if rows.get(route_id, (-1, None))[0] < limit]
+        if missing:
+            found: np.ndarray = dijkstra(self.costs.get_graph(weight), indices=missing, limit=limit)
+            for route_id, row in zip(missing, found):
+                rows.pop(route_id, None)  # Searched again, moved to the end
+                rows[route_id] = (limit, row)
+        # Drop the oldest searches (not needed by current query)
+        requested: Set[int] = set(source_routes)
+        for route_id in list(rows.keys()):
+            if len(rows) <= self.cache_size:
+                break
+            elif route_id not in requested:
+                rows.pop(route_id)
+        return {route_id: rows[route_id][1] for route_id in source_routes}
+
+    def get_epoch(self, weight: str) -> int:
+        """
+        :param weight: of routes ('travel_time', 'free_flow' or 'length')
+        :return: Epoch of travel times for 'travel_time', 0 for static weights
+        """
+        return self.costs.epoch if weight == "travel_time" else 0
@@ -0,0 +1,158 @@
+from utc.src.graph.network.compact.csr_graph import CsrGraph
+from utc.src.graph.network.compact.route_costs import RouteCosts
+from utc.src.constants.file_system.file_types.dump_file import DumpFile
+import numpy as np
+from typing import Dict, List, Iterable
+
+
+class TravelTimeProfiles:
+    """
+    Time-dependent travel times of edges and routes, stored as arrays of travel time per time bucket
+    (shape: (buckets, edges/routes)) and initialized by free-flow travel times. Profiles are filled from
+    edge data dumps (historical travel times) and corrected by live observations, which update only the bucket
+    of observation time, so that predictions for later buckets are kept without recomputing the whole network.
+    Buckets without dump or observation take travel times of the closest previous observed bucket (or of the
+    first observed bucket), so that live congestion is not replaced by free-flow travel times.
+    Travel time at given time is linearly interpolated between centers of buckets (times outside of profile
+    use the first or last bucket), which keeps FIFO property unless travel time drops faster than time passes.
+    """
+    def __init__(self, csr: CsrGraph, costs: RouteCosts, bucket_size: float = 900, horizon: float = 86400):
+        """
+        :param csr: array representation of network
+        :param costs: of routes (free-flow travel times)
+        :param bucket_size: duration of time bucket (seconds), default 900
+        :param horizon: duration of profiles from time 0 (seconds), default 86400 (one day)
+        """
+        assert (bucket_size > 0 and horizon > 0)
+        self.csr: CsrGraph = csr
+        self.costs: RouteCosts = costs
+        self.bucket_size: float = bucket_size
+        self.buckets: int = max(int(np.ceil(horizon / bucket_size)), 1)
+        self.edges: np.ndarray = np.tile(costs.edge_free_flow, (self.buckets, 1))
+        self.routes: np.ndarray = np.tile(costs.free_flow, (self.buckets, 1))
+        self.observed: np.ndarray = np.zeros(self.buckets, dtype=bool)  # Buckets filled by dump or observation
+        self._lists: Dict[int, List[float]] = {}  # Buckets of routes as python lists (built on demand)
+
+    # ------------------------------------------ Getters ------------------------------------------
+
+    def get_travel_time(self, route_id: int, time: float) -> float:
+        """
+        :param route_id: internal id of route
+        :param time: of entering route (seconds of simulation)
+        :return: Travel time of route (seconds), interpolated between neighbouring buckets
+        """
+        position: float = min(max(time / self.bucket_size - 0.5, 0), self.buckets - 1)
+        lower: int = int(position)
+        fraction: float = position - lower
+        if fraction == 0:
+            return self.get_bucket(lower)[route_id]
+        return (1 - fraction) * self.get_bucket(lower)[route_id] + fraction * self.get_bucket(lower + 1)[route_id]
+
+    def get_bucket(self, bucket: int) -> List[float]:
+        """
+        :param bucket: index of time bucket
+        :return: Travel times of routes in bucket as python list (faster to index in pure python loops than arrays)
+        """
+        if bucket not in self._lists:
+            self._lists[bucket] = self.routes[bucket].tolist()
+        return self._lists[bucket]
+
+    def get_bucket_index(self, time: float) -> int:
+        """
+        :param time: seconds of simulation
+        :return: Index of bucket containing given time
+        """
+        return min(max(int(time // self.bucket_size), 0), self.buckets - 1)
+
+    # ------------------------------------------ Updates ------------------------------------------
+
+    def load_dump(self, dump_file: DumpFile, attribute: str = "traveltime") -> bool:
+        """
+        Sets travel times of edges in buckets covered by intervals of edge data dump
+        (edges without measured value keep their previous travel time)
+
+        :param dump_file: edge data dump (".out.xml") with intervals of edges
+        :param attribute: of edges holding travel time, default 'traveltime'
+        :return: True on success, False otherwise
+        """
+        if not dump_file.is_loaded():
+            print("Edge data dump is not loaded, cannot load travel time profiles!")
+            return False
+        updated: List[int] = []
+        for interval in dump_file.root.findall("interval"):
+            first: int = self.get_bucket_index(float(interval.attrib["begin"]))
+            # Bucket is covered by interval, if interval contains its center
+            last: int = self.get_bucket_index(float(interval.attrib["end"]) - self.bucket_size / 2)
+            indexes: List[int] = []
+            values: List[float] = []
+            for edge in interval.findall("edge"):
+                index: int = self.csr.edge_index.get(edge.attrib["id"], -1)
+                if index >= 0 and attribute in edge.attrib:
+                    indexes.append(index)
+                    values.append(float(edge.attrib[attribute]))
+            if not indexes or last < first:
+                continue
+            self.edges[first:last + 1, indexes] = values
+            updated.extend(range(first, last + 1))
+        for bucket in sorted(set(updated)):
+            self.observed[bucket] = True
+            self.update_bucket(bucket)
+        self.fill_buckets()
+        return True
+
+    def observe(
+            self, time: float, edge_indexes: Iterable[int],
+            travel_time: Iterable[float], weight: float = 1.0
+        ) -> None:
+        """
+        Blends live travel times of edges into bucket of observation time (other buckets are kept)
+
+        :param time: of observation (seconds of simulation)
+        :param edge_indexes: internal id's of edges
+        :param travel_time: of edges (seconds)
+        :param weight: of observation against previous value of bucket (1 replaces it), default 1
+        :return: None
+        """
+        assert (0 < weight <= 1)
+        bucket: int = self.get_bucket_index(time)
+        indexes: np.ndarray = np.fromiter(edge_indexes, dtype=np.int64)
+        values: np.ndarray = np.fromiter(travel_time, dtype=np.float64)
+        self.edges[bucket, indexes] = (1 - weight) * self.edges[bucket, indexes] + weight * values
+        self.observed[bucket] = True
+        self.update_bucket(bucket)
+        self.fill_buckets()
+
+    def record(self, time: float, weight: float = 1.0) -> None:
+        """
+        Observes the current travel times of edges (from route costs) at given time
+
+        :param time: of observation (seconds of simulation)
+        :param weight: of observation against previous value of bucket (1 replaces it), default 1
+        :return: None
+        """
+        self.observe(time, range(len(self.costs.edge_travel_time)), self.costs.edge_travel_time, weight)
+
+    def update_bucket(self, bucket: int) -> None:
+        """
+        :param bucket: index of time bucket, whose travel times of routes are recomputed from edges
+        :return: None
+        """
+        self.routes[bucket] = self.costs.sum_edges(self.edges[bucket])
+        self._lists.pop(bucket, None)
+
+    def fill_buckets(self) -> None:
+        """
+        Copies travel times of observed buckets into buckets without observation, which follow them
+        (buckets before the first observed bucket take its travel times)
+
+        :return: None
+        """
+        observed: np.ndarray = np.flatnonzero(self.observed)
+        missing: np.ndarray = np.flatnonzero(~self.observed)
+        if observed.size == 0 or missing.size == 0:
+            return
+        sources: np.ndarray = observed[np.maximum(np.searchsorted(observed, missing, side="right") - 1, 0)]
+        self.edges[missing] = self.edges[sources]
+        self.routes[missing] = self.routes[sources]
+        for bucket in missing.tolist():
+            self._lists.pop(bucket, None)
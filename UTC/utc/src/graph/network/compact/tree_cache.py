@@ -0,0 +1,49 @@
+from utc.src.graph.network.compact.csr_graph import CsrGraph
+from utc.src.graph.network.compact.route_costs import RouteCosts
+from utc.src.graph.network.compact.dynamic_tree import DynamicTree
+from typing import Dict, Tuple
+
+
+class TreeCache:
+    """
+    Shortest path trees of the most frequently used origins (or destinations), which are kept between
+    changes of travel times and repaired on their next use. When limit of trees is reached, the least
+    used tree is replaced.
+    """
+    def __init__(self, csr: CsrGraph, costs: RouteCosts, max_size: int = 64):
+        """
+        :param csr: array representation of network
+        :param costs: of routes (current travel times)
+        :param max_size: maximal number of kept trees, default 64
+        """
+        assert (max_size > 0)
+        self.csr: CsrGraph = csr
+        self.costs: RouteCosts = costs
+        self.max_size: int = max_size
+        # Mapping of root and direction to tree
+        self.trees: Dict[Tuple[int, bool], DynamicTree] = {}
+        # Mapping of root and direction to number of queries
+        self.uses: Dict[Tuple[int, bool], int] = {}
+        self.settled: int = 0  # Total number of routes settled by builds and repairs of trees
+
+    def get_tree(self, root: int, reverse: bool = False) -> DynamicTree:
+        """
+        :param root: internal id of origin route (or destination route, if tree is reversed)
+        :param reverse: if tree holds paths to root (instead of paths from root), default False
+        :return: Shortest path tree, valid for current travel times
+        """
+        key: Tuple[int, bool] = (root, reverse)
+        self.uses[key] = self.uses.get(key, 0) + 1
+        tree: DynamicTree = self.trees.get(key)
+        if tree is not None:
+            self.settled += tree.update()
+            return tree
+        tree = DynamicTree(self.csr, self.costs, root, reverse)
+        self.settled += tree.settled
+        if len(self.trees) >= self.max_size:
+            least: Tuple[int, bool] = min(self.trees.keys(), key=lambda other: self.uses[other])
+            if self.uses[least] > self.uses[key]:
+                return tree
+            self.trees.pop(least)
+        self.trees[key] = tree
+        return tree
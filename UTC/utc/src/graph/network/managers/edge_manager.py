@@ -110,23 +110,14 @@ class EdgeManager:
         elif None not in edges:
             return edges, (0, len(edges))
         edges.append(None)  # Add None in the back as stopping condition
-        # Build sequence, filter 'None'
-        best_left, best_right, left, right = 0, 0, 0, 0
-        result: List[Edge] = []
-        temp: List[Edge] = []
-        while edges:
-            current: Optional[Edge] = edges.pop(0)
-            right += 1
+        # Find the longest run of edges between 'None' values (single pass)
+        best_left, best_right, left = 0, 0, 0
+        for right, current in enumerate(edges):
             if current is None:
-                if len(temp) > len(result):
-                    best_left = left
-                    best_right = right-1
-                    result = temp
-                temp = []
-                left = right
-                continue
-            temp.append(current)
-        return result, (best_left, best_right)
+                if right - left > best_right - best_left:
+                    best_left, best_right = left, right
+                left = right + 1
+        return edges[best_left:best_right], (best_left, best_right)
 
     def check_edge_sequence(self, sequence: List[Union[int, str, Edge]]) -> bool:
         """
@@ -0,0 +1,194 @@
+from utc.src.graph.network.parts import Junction, Edge, Route
+from utc.src.graph.network.compact import CsrGraph, SpatialIndex, Landmarks
+from utc.src.graph.network.road_network import RoadNetwork
+from copy import copy, deepcopy
+from typing import Dict, List, Tuple, Optional, Union
+import numpy as np
+
+
+class NetworkView(RoadNetwork):
+    """
+    Sub-graph of road network defined by masks over internal id's of junctions and edges of parent network.
+    Edges and Routes are shared with the parent network (only Junctions are created, since their
+    connections differ), the view behaves as RoadNetwork, objects are copied (view is materialized)
+    before the first modification of view, after which it is independent of parent network.
+    """
+    def __init__(self, parent: RoadNetwork, junction_mask: np.ndarray, edge_mask: np.ndarray, name: str = ""):
+        """
+        :param parent: network from which view is created (objects of parent must not be modified)
+        :param junction_mask: boolean mask of junctions kept in view (indexed by internal id's of parent)
+        :param edge_mask: boolean mask of edges kept in view (indexed by internal id's of parent),
+        edges are kept only if their junctions are kept
+        :param name: of network (optional parameter)
+        """
+        super().__init__(name)
+        # Views of views are created over the original network (internal id's are the same)
+        if isinstance(parent, NetworkView) and not parent.is_materialized():
+            junction_mask = junction_mask & parent.junction_mask
+            edge_mask = edge_mask & parent.edge_mask
+            parent = parent.parent
+        csr: CsrGraph = parent.get_csr()
+        assert (junction_mask.shape == csr.junction_mask.shape and edge_mask.shape == csr.edge_mask.shape)
+        self.parent: Optional[RoadNetwork] = parent
+        self.junction_mask: np.ndarray = junction_mask & csr.junction_mask
+        # Keep only edges which have both junctions (junction of edge can be missing in simplified networks)
+        self.edge_mask: np.ndarray = edge_mask & csr.edge_mask & (
+            (csr.edge_from < 0) | self.junction_mask[csr.edge_from]
+        ) & ((csr.edge_to < 0) | self.junction_mask[csr.edge_to])
+        self.route_mask: np.ndarray = self.get_route_mask(csr)
+        self.map_name = parent.map_name
+        self.roundabouts = [] + parent.roundabouts
+        self.build(csr)
+
+    def build(self, csr: CsrGraph) -> None:
+        """
+        Fills containers of network with objects of parent network selected by masks
+
+        :param csr: array representation of parent network
+        :return: None
+        """
+        route_mask: List[bool] = self.route_mask.tolist()
+        for index in np.flatnonzero(self.junction_mask).tolist():
+            junction: Junction = copy(csr.junctions[index])
+            junction.connections = self.filter_connections(csr.junctions[index], route_mask)
+            self._junction_container.add_object(junction)
+            self.check_fringe(junction)
+        for index in np.flatnonzero(self.edge_mask).tolist():
+            self._edge_container.add_object(csr.edges[index])
+        for index in np.flatnonzero(self.route_mask).tolist():
+            self._route_container.add_object(csr.routes[index])
+        self.edge_connections = self.get_edges_connections()
+
+    # -------------------------------------------------- Getters --------------------------------------------------
+
+    def get_route_mask(self, csr: CsrGraph) -> np.ndarray:
+        """
+        :param csr: array representation of parent network
+        :return: Boolean mask of routes, which are kept (all of their edges and their junctions are in view)
+        """
+        # Number of missing edges on each route
+        missing: np.ndarray = np.zeros(csr.route_count, dtype=np.int32)
+        np.add.at(
+            missing, np.repeat(np.arange(csr.route_count), np.diff(csr.route_offsets)),
+            ~self.edge_mask[csr.route_edges]
+        )
+        return (
+            csr.route_mask & (missing == 0) & (csr.route_from >= 0) & (csr.route_to >= 0) &
+            self.junction_mask[csr.route_from] & self.junction_mask[csr.route_to]
+        )
+
+    def get_spatial_index(self) -> SpatialIndex:
+        # Geometry of objects is taken from spatial index of parent
+        if self._spatial_index is None and not self.is_materialized():
+            self._spatial_index = self.parent.get_spatial_index().subset(self.junction_mask, self.edge_mask)
+        return super().get_spatial_index()
+
+    def get_landmarks(self) -> Landmarks:
+        # Distances in view are not shorter than in parent, bounds of parent remain admissible
+        if self._landmarks is None and not self.is_materialized():
+            self._landmarks = self.parent.get_landmarks()
+        return super().get_landmarks()
+
+    @staticmethod
+    def filter_connections(junction: Junction, route_mask: List[bool]) -> Dict[Optional[Route], List[Route]]:
+        """
+        :param junction: of parent network
+        :param route_mask: mask of routes which are kept
+        :return: Connections of junction with routes which are kept, out-going routes
+        of incoming routes which are not kept are used as starting (incoming route is 'None')
+        """
+        connections: Dict[Optional[Route], List[Route]] = {}
+        starting: List[Route] = []
+        for in_route, out_routes in junction.connections.items():
+            kept: List[Route] = [out_route for out_route in out_routes if route_mask[out_route.internal_id]]
+            if in_route is not None and route_mask[in_route.internal_id]:
+                connections[in_route] = kept
+            else:
+                starting += kept
+        if starting:  # Remove duplicates (keep order)
+            connections[None] = list(dict.fromkeys(starting))
+        return connections
+
+    # -------------------------------------------------- Adders --------------------------------------------------
+
+    def add_junction(self, junction: Junction, replace: bool = False) -> bool:
+        self.materialize()
+        return super().add_junction(junction, replace)
+
+    def add_edge(self, edge: Edge, replace: bool = False) -> bool:
+        self.materialize()
+        return super().add_edge(edge, replace)
+
+    def add_route(self, route: Route, replace: bool = False) -> bool:
+        self.materialize()
+        return super().add_route(route, replace)
+
+    # -------------------------------------------------- Removers --------------------------------------------------
+
+    def remove_junction(
+            self, junction: Union[str, int, Junction],
+            edge_removal: bool = True, route_removal: bool = True
+        ) -> bool:
+        self.materialize()
+        # Objects of view are replaced by materialization, use id's
+        return super().remove_junction(self.unpack(junction), edge_removal, route_removal)
+
+    def remove_edge(self, edge: Union[str, int, Edge], route_removal: bool = True) -> bool:
+        self.materialize()
+        return super().remove_edge(self.unpack(edge), route_removal)
+
+    def remove_route(self, route: Union[str, int, Route], edge_removal: bool = True) -> bool:
+        self.materialize()
+        return super().remove_route(self.unpack(route), edge_removal)
+
+    # -------------------------------------------------- Utils --------------------------------------------------
+
+    def materialize(self) -> None:
+        """
+        Copies objects of view, so that they can be modified without affecting the parent network
+        (masks of view are no longer used afterwards).
+
+        :return: None
+        """
+        if self.is_materialized():
+            return
+        # Copy all objects at once (references between them are kept)
+        junctions, edges, routes = deepcopy((self.junctions, self.edges, self.routes))
+        # Edges are referenced only by routes of this network
+        references: Dict[str, int] = {edge_id: 0 for edge_id in edges}
+        for route in routes.values():
+            for edge in route.edge_list:
+                references[edge.id] += 1
+        for edge in list(edges.values()) + [edge for route in routes.values() for edge in route.edge_list]:
+            edge.references = references[edge.id]
+        # Replace objects (dictionaries are shared with containers)
+        self.junctions.update(junctions)
+        self.edges.update(edges)
+        self.routes.update(routes)
+        spatial_index: Optional[SpatialIndex] = self._spatial_index
+        self.parent = None
+        self.reset_csr()
+        self._spatial_index = spatial_index  # Copied objects have the same geometry
+
+    def get_masks(self) -> Tuple[RoadNetwork, np.ndarray, np.ndarray]:
+        if self.is_materialized():
+            return super().get_masks()
+        return self.parent, self.junction_mask.copy(), self.edge_mask.copy()
+
+    def is_materialized(self) -> bool:
+        """
+        :return: True if view owns its objects (was materialized), False if objects are shared with parent
+        """
+        return self.parent is None
+
+    def load(self, other: RoadNetwork) -> bool:
+        self.parent = None  # Objects are replaced by copies of other network
+        return super().load(other)
+
+    @staticmethod
+    def unpack(obj: Union[str, int, Junction, Edge, Route]) -> Union[str, int]:
+        """
+        :param obj: id (internal or original) of object or class instance
+        :return: Original id of object, if class instance was given, otherwise the given id
+        """
+        return obj.get_id() if isinstance(obj, (Junction, Edge, Route)) else obj
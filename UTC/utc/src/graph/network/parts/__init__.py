@@ -1,3 +1,4 @@
+from utc.src.graph.network.parts.shape import Shape
 from utc.src.graph.network.parts.edge import Edge
 from utc.src.graph.network.parts.route import Route
 from utc.src.graph.network.parts.junction import Junction
@@ -4,11 +4,12 @@ from typing import Tuple, List, Dict, Any
 
 class Edge(XmlObject):
     """ Class describing Edge of road network from SUMO '.net.xml' file """
+    __slots__ = ("from_junction", "to_junction", "speed", "length", "references", "lanes")
 
     def __init__(self, attributes: Dict[str, str], lanes: Dict[str, Dict[str, Any]], internal_id: int):
         """
         :param attributes: attributes extracted from xml element
-        :param lanes: xml elements of edge lanes
+        :param lanes: attributes of edge lanes (mapping of lane id to attributes)
         :param internal_id: internal if of object
         """
         super().__init__("edge", attributes["id"], internal_id, attributes)
@@ -9,6 +9,8 @@ class Junction(XmlObject):
     contains mapping of incoming routes to outgoing routes
     (If incoming is of type 'None' Junction is starting)
     """
+    __slots__ = ("x", "y", "traffic_lights", "connections")
+
     def __init__(self, attributes: Dict[str, str], internal_id: int):
         """
         :param attributes: extracted from xml element
@@ -5,6 +5,7 @@ from typing import List, Tuple, Dict, Union, Optional
 
 class Route(XmlObject):
     """ Route is class holding edges, trough which the route goes """
+    __slots__ = ("edge_list", "allowed_first", "allowed_last")
 
     def __init__(
             self, edges: Union[List[Edge], Edge], identifier: str = "TEMPORARY",
@@ -0,0 +1,102 @@
+import numpy as np
+from typing import List, Optional, Iterator, Union
+
+
+class Shape:
+    """
+    Read-only sequence of [x, y] coordinates (shape of lane, or edge), coordinates of all shapes
+    of road network are stored in one shared buffer, shape only references its part of buffer.
+    """
+    __slots__ = ("buffer", "start", "end")
+
+    def __init__(self, buffer: np.ndarray, start: int, end: int):
+        """
+        :param buffer: array of coordinates (shape: (N, 2)), shared by multiple shapes
+        :param start: index of first coordinate of shape in buffer
+        :param end: index after the last coordinate of shape in buffer
+        """
+        self.buffer: np.ndarray = buffer
+        self.start: int = start
+        self.end: int = end
+
+    # ------------------------------------------ Getters ------------------------------------------
+
+    def get_coords(self) -> np.ndarray:
+        """
+        :return: Array of coordinates forming shape (view of buffer)
+        """
+        return self.buffer[self.start:self.end]
+
+    def tolist(self) -> List[List[float]]:
+        """
+        :return: List of coordinates forming shape -> [[x1, y1], ...]
+        """
+        return self.get_coords().tolist()
+
+    # ------------------------------------------ Utils ------------------------------------------
+
+    @staticmethod
+    def create_shapes(shapes: List[Optional[Union[List[List[float]], 'Shape']]]) -> List[Optional['Shape']]:
+        """
+        :param shapes: list of shapes (list of coordinates), can be None
+        :return: List of shapes backed by one shared buffer, None for shapes which were not present
+        """
+        coords: List[List[float]] = []
+        offsets: List[int] = [0]
+        for shape in shapes:
+            if shape is not None:
+                coords.extend(shape)
+            offsets.append(len(coords))
+        buffer: np.ndarray = np.array(coords, dtype=np.float64).reshape(-1, 2)
+        return Shape.from_buffer(buffer, offsets, [shape is not None for shape in shapes])
+
+    @staticmethod
+    def from_buffer(buffer: np.ndarray, offsets: List[int], mask: List[bool]) -> List[Optional['Shape']]:
+        """
+        :param buffer: array of coordinates (shape: (N, 2)) of all shapes
+        :param offsets: of shapes in buffer, coordinates of shape 'i' are: buffer[offsets[i]:offsets[i+1]]
+        :param mask: of shapes which are present
+        :return: List of shapes, None for shapes which were not present
+        """
+        buffer.flags.writeable = False  # Shapes are shared (also between copies of objects)
+        return [
+            Shape(buffer, offsets[i], offsets[i + 1]) if present else None
+            for i, present in enumerate(mask)
+        ]
+
+    # ------------------------------------------ Magics ------------------------------------------
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __iter__(self) -> Iterator[List[float]]:
+        return iter(self.tolist())
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[List[float], List[List[float]]]:
+        return self.get_coords()[index].tolist()
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        return self.get_coords() if dtype is None else self.get_coords().astype(dtype)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Shape):
+            other = other.tolist()
+        return self.tolist() == other
+
+    def __hash__(self) -> int:
+        # Equal shapes can be stored in different buffers
+        return hash(tuple(map(tuple, self.tolist())))
+
+    def __copy__(self) -> 'Shape':
+        return self
+
+    def __deepcopy__(self, memo: dict) -> 'Shape':
+        # Shape is immutable, buffer would otherwise be copied with each object
+        return self
+
+    def __reduce__(self):
+        # Pickle only the referenced part of buffer
+        return Shape, (np.array(self.get_coords()), 0, len(self))
+
+    def __repr__(self) -> str:
+        return str(self.tolist())
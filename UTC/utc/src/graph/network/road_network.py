@@ -1,6 +1,12 @@
 from utc.src.graph.network import Junction, Edge, Route
 from utc.src.graph.network.managers import JunctionManager, EdgeManager, RouteManager
-from typing import Dict, List, Set, Optional, Union
+from utc.src.graph.network.compact import (
+    CsrGraph, SpatialIndex, RouteCosts, Corridor, Landmarks, ContractionHierarchy, TravelTimeProfiles, TravelTimeMatrix,
+    TreeCache
+)
+from scipy.sparse import csr_matrix
+from typing import Dict, List, Set, Tuple, Optional, Union, Callable, Iterable
+import numpy as np
 
 
 class RoadNetwork(JunctionManager, EdgeManager, RouteManager):
@@ -15,9 +21,28 @@ class RoadNetwork(JunctionManager, EdgeManager, RouteManager):
         self.name: str = name
         self.map_name: str = ""  # Name of map network was loaded from
         self.roundabouts: List[List[str]] = []
+        self._csr: Optional[CsrGraph] = None  # Array representation of network (built on demand)
+        self._spatial_index: Optional[SpatialIndex] = None  # Spatial index of network (built on demand)
+        self._route_costs: Optional[RouteCosts] = None  # Costs of routes (built on demand)
+        self._corridor: Optional[Corridor] = None  # Pruning of routes by distances (built on demand)
+        self._time_corridor: Optional[Tuple[int, Corridor]] = None  # Pruning by travel times (of epoch)
+        self._landmarks: Optional[Landmarks] = None  # Lower bounds on distances (built on demand)
+        self._hierarchy: Optional[ContractionHierarchy] = None  # Travel time queries (built on demand)
+        self._profiles: Optional[TravelTimeProfiles] = None  # Time-dependent travel times (built on demand)
+        self._matrix: Optional[TravelTimeMatrix] = None  # Many-to-many travel times (built on demand)
+        self._trees: Optional[TreeCache] = None  # Repaired shortest path trees (built on demand)
 
     # -------------------------------------------------- Adders --------------------------------------------------
 
+    def add_junction(self, junction: Junction, replace: bool = False) -> bool:
+        """
+        :param junction: to be added
+        :param replace: True if junction should be replaced (in case it already exists), False by default
+        :return: True on success, false otherwise
+        """
+        self.reset_csr()
+        return super().add_junction(junction, replace)
+
     def add_edge(self, edge: Edge, replace: bool = False) -> bool:
         """
         :param edge: to be added (must be added in order of their internal id's)
@@ -26,11 +51,13 @@ class RoadNetwork(JunctionManager, EdgeManager, RouteManager):
         """
         if not (self.junction_exists(edge.from_junction) and self.junction_exists(edge.to_junction)):
             return False
+        self.reset_csr()
         return super().add_edge(edge, replace)
 
     def add_route(self, route: Route, replace: bool = False) -> bool:
         if not all(self.edge_exists(edge) for edge in route.edge_list):
             return False
+        self.reset_csr()
         return super().add_route(route, replace)
 
     # -------------------------------------------------- Removers --------------------------------------------------
@@ -49,6 +76,7 @@ class RoadNetwork(JunctionManager, EdgeManager, RouteManager):
         junction: Optional[Junction] = self.get_junction(junction)
         if junction is None:
             return False
+        self.reset_csr()
         # Remove outgoing routes first
         # Transform into set -> can have multiple same out-routes, coming from different in-routes
         if route_removal:
@@ -71,6 +99,7 @@ class RoadNetwork(JunctionManager, EdgeManager, RouteManager):
         edge: Optional[Edge] = self.get_edge(edge)
         if edge is None:
             return False
+        self.reset_csr()
         # Find all routes containing this edge, remove them
         if route_removal and edge.references != 0:
             for route in list(self.routes.values()):  # Convert to list to iterate and remove
@@ -88,6 +117,7 @@ class RoadNetwork(JunctionManager, EdgeManager, RouteManager):
         route: Optional[Route] = self.get_route(route)
         if route is None or route.is_temporary():
             return False
+        self.reset_csr()
         # Remove route from corresponding junctions
         start_junction: Junction = self.get_junction(route.get_start())
         end_junction: Junction = self.get_junction(route.get_destination())
@@ -163,8 +193,167 @@ class RoadNetwork(JunctionManager, EdgeManager, RouteManager):
         out_connections: Optional[List[Edge]] = self.get_out_edge_neighbours(edge)
         return None if (in_connections is None or out_connections is None) else (in_connections + out_connections)
 
+    # -------------------------------------------------- Arrays --------------------------------------------------
+
+    def get_csr(self) -> CsrGraph:
+        """
+        :return: Array (CSR) representation of network, built on first call after network was changed
+        """
+        if self._csr is None:
+            self._csr = CsrGraph(self)
+        return self._csr
+
+    def get_route_costs(self) -> RouteCosts:
+        """
+        :return: Costs of routes (indexed by their internal id's), built on first call after network was changed
+        """
+        if self._route_costs is None:
+            self._route_costs = RouteCosts(self.get_csr())
+        return self._route_costs
+
+    def get_corridor(self, metric: str = "length") -> Corridor:
+        """
+        :param metric: cost of routes, 'length' or 'travel_time' (built again after travel times change), default 'length'
+        :return: Corridor pruning of routes (caches distances between routes), built on first call after network was changed
+        """
+        if metric == "travel_time":
+            costs: RouteCosts = self.get_route_costs()
+            if self._time_corridor is None or self._time_corridor[0] != costs.epoch:
+                self._time_corridor = (costs.epoch, Corridor(costs, "travel_time"))
+            return self._time_corridor[1]
+        elif self._corridor is None:
+            self._corridor = Corridor(self.get_route_costs(), "length")
+        return self._corridor
+
+    def get_landmarks(self) -> Landmarks:
+        """
+        :return: Landmark lower bounds on distances between routes, built on first call after network was changed
+        """
+        if self._landmarks is None:
+            self._landmarks = Landmarks.from_network(self.get_csr(), self.get_route_costs())
+        return self._landmarks
+
+    def get_contraction_hierarchy(self) -> ContractionHierarchy:
+        """
+        :return: Contraction hierarchy of routes (travel time metric, customized again when travel times
+        are updated), built on first call after network was changed
+        """
+        if self._hierarchy is None:
+            self._hierarchy = ContractionHierarchy(self.get_csr(), self.get_route_costs())
+        return self._hierarchy
+
+    def get_travel_time_profiles(self) -> TravelTimeProfiles:
+        """
+        :return: Time-dependent travel times of routes (free-flow until filled by dumps or observations),
+        built on first call after network was changed
+        """
+        if self._profiles is None:
+            self._profiles = TravelTimeProfiles(self.get_csr(), self.get_route_costs())
+        return self._profiles
+
+    def set_travel_time_profiles(self, profiles: Optional[TravelTimeProfiles]) -> None:
+        """
+        :param profiles: of network (must match routes of network), None to build new (free-flow) profiles on next call
+        :return: None
+        """
+        self._profiles = profiles
+
+    def get_travel_time_matrix(self) -> TravelTimeMatrix:
+        """
+        :return: Many-to-many travel time matrices between edges (cached per travel time epoch),
+        built on first call after network was changed
+        """
+        if self._matrix is None:
+            self._matrix = TravelTimeMatrix(self.get_csr(), self.get_route_costs())
+        return self._matrix
+
+    def get_tree_cache(self) -> TreeCache:
+        """
+        :return: Shortest path trees of frequently used origins (destinations), repaired
+        after travel times change, built on first call after network was changed
+        """
+        if self._trees is None:
+            self._trees = TreeCache(self.get_csr(), self.get_route_costs())
+        return self._trees
+
+    def get_route_graph(self, weight: str = "length") -> Tuple[csr_matrix, List[Optional[Route]]]:
+        """
+        Exports turn-expanded (line) graph of network for 'scipy.sparse.csgraph' algorithms,
+        only transitions allowed by connections of junctions are present.
+
+        :param weight: of routes ('length', 'free_flow', 'travel_time' or 'capacity'), default 'length'
+        :return: Sparse matrix (transition from route 'i' to route 'j' costs weight of route 'j'), cached until
+        travel times are updated, and routes of rows/columns (index is internal id, None for missing routes)
+        """
+        return self.get_route_costs().get_graph(weight), self.get_csr().routes
+
+    def set_landmarks(self, landmarks: Landmarks) -> None:
+        """
+        :param landmarks: of network (e.g. restored from snapshot), must match routes of network
+        :return: None
+        """
+        self._landmarks = landmarks
+
+    def get_spatial_index(self) -> SpatialIndex:
+        """
+        :return: Spatial index of junctions and edges, built on first call after network was changed
+        """
+        if self._spatial_index is None:
+            self._spatial_index = SpatialIndex.from_network(self)
+        return self._spatial_index
+
+    def set_spatial_index(self, spatial_index: SpatialIndex) -> None:
+        """
+        :param spatial_index: of network (e.g. restored from snapshot), must match objects of network
+        :return: None
+        """
+        self._spatial_index = spatial_index
+
+    def reset_csr(self) -> None:
+        """
+        Discards array representation, spatial index, route costs, corridor, landmarks, contraction hierarchy,
+        travel time profiles, matrices and dynamic trees of network, must be called when objects of network
+        (e.g. connections of junctions) are modified directly.
+
+        :return: None
+        """
+        self._csr = None
+        self._route_costs = None
+        self._corridor = None
+        self._time_corridor = None
+        self._landmarks = None
+        self._hierarchy = None
+        self._profiles = None
+        self._matrix = None
+        self._trees = None
+        self._spatial_index = None
+
+    def check_edge_sequences(
+            self, sequences: Iterable[Union[np.ndarray, List[Union[int, str, Edge]]]]
+        ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Batch version of 'check_edge_sequence', checks all sequences at once against array representation of network
+
+        :param sequences: of edges (original id's, internal id's or Edge instances), or arrays of internal id's
+        :return: Boolean array (True if sequence is correct), array of indexes of first invalid edge
+        in each sequence (-1 if sequence is correct, 0 if sequence is empty)
+        """
+        csr: CsrGraph = self.get_csr()
+        return csr.check_edge_sequences([
+            sequence if isinstance(sequence, np.ndarray) else csr.get_edge_indexes(sequence) for sequence in sequences
+        ])
+
     # -------------------------------------------------- Utils --------------------------------------------------
 
+    def materialize(self) -> None:
+        """
+        Makes sure objects of network are owned by it (are not shared with other network),
+        must be called before objects of network are modified directly (views copy their objects).
+
+        :return: None
+        """
+        return
+
     def load(self, other: 'RoadNetwork') -> bool:
         """
         Loads skeleton from another skeleton class (deep copy)
@@ -182,6 +371,7 @@ class RoadNetwork(JunctionManager, EdgeManager, RouteManager):
             return False
         elif not self.load_routes(other):
             return False
+        self.reset_csr()
         self.name = other.name
         self.map_name = other.map_name
         self.roundabouts = [] + other.roundabouts
@@ -194,59 +384,157 @@ class RoadNetwork(JunctionManager, EdgeManager, RouteManager):
         Performs set intersection on RoadNetwork classes (graphs of road networks), based on objects id's.
 
         :param other: RoadNetwork class, must have at least 1 common junction
-        :return: New skeleton class, None if error occurred
+        :return: New RoadNetwork class (view, if both networks share parent network), None if error occurred
         """
         if not isinstance(other, RoadNetwork):
             print(f"Graph intersection operation expects 'other' to be of type 'RoadNetwork', got: '{type(other)}'")
             return None
-        # Get common Junctions, remove others
-        common_junctions: Set[str] = self.junctions.keys() & other.junctions.keys()
-        if not common_junctions:  # Empty
+        elif not (self.junctions.keys() & other.junctions.keys()):
             print(f"Cannot perform intersection on RoadNetworks, no common junctions found !")
             return None
-        # Prepare new Graph
-        ret_val: RoadNetwork = RoadNetwork()
-        ret_val.load(self)
-        # Remove other junctions
-        for junction_id in (self.junctions.keys() ^ common_junctions):
-            ret_val.remove_junction(junction_id)
-        return ret_val
+        return self.combine(other, np.logical_and, np.logical_and)
 
     def union(self, other: 'RoadNetwork') -> Optional['RoadNetwork']:
         """
         Performs set union on RoadNetwork classes (graphs of road networks), based on objects id's.
 
-        :param other: RoadNetwork class, must have at least one common junction
-        :return: New RoadNetwork class, None if error occurred
+        :param other: RoadNetwork class
+        :return: New RoadNetwork class (view, if both networks share parent network), None if error occurred
         """
         if not isinstance(other, RoadNetwork):
             print(f"Graph union operation expects 'other' to be of type 'RoadNetwork', got: '{type(other)}'")
             return None
-        elif not (self.edges.keys() & other.edges.keys()):
-            print(f"Graph union cannot be executed, graphs have no common edge!")
-            return None
-        raise NotImplementedError("Error, union of graphs is not implemented!")
+        return self.combine(other, np.logical_or, np.logical_or)
 
     def difference(self, other: 'RoadNetwork') -> Optional['RoadNetwork']:
         """
-        Performs set difference on RoadNetwork classes (graphs of road networks), based on objects id's.
+        Performs set difference on RoadNetwork classes (graphs of road networks), based on objects id's,
+        i.e. union of networks without their common junctions (and edges connected to them).
 
-        :param other: RoadNetwork class, must have at least one common junction
-        :return: New skeleton class, None if error occurred
+        :param other: RoadNetwork class
+        :return: New RoadNetwork class (view, if both networks share parent network), None if error occurred
         """
         if not isinstance(other, RoadNetwork):
             print(f"Graph difference operation expects 'other' to be of type 'RoadNetwork', got: '{type(other)}'")
             return None
-        # Prepare new Graph
+        return self.combine(other, np.logical_xor, np.logical_or)
+
+    def combine(
+            self, other: 'RoadNetwork',
+            junction_operation: Callable[[np.ndarray, np.ndarray], np.ndarray],
+            edge_operation: Callable[[np.ndarray, np.ndarray], np.ndarray]
+        ) -> Optional['RoadNetwork']:
+        """
+        Combines networks by performing operations on masks of their junctions and edges,
+        edges are kept only if both of their junctions are kept.
+
+        :param other: RoadNetwork class
+        :param junction_operation: performed on masks of junctions (e.g. np.logical_and)
+        :param edge_operation: performed on masks of edges
+        :return: View of parent network (if both networks share it), otherwise new RoadNetwork
+        with connections of both networks, None if error occurred
+        """
+        # Avoid circular import (NetworkView is subclass of RoadNetwork)
+        from utc.src.graph.network.network_view import NetworkView
+        parent, junction_mask, edge_mask = self.get_masks()
+        other_parent, other_junction_mask, other_edge_mask = other.get_masks()
+        if parent is other_parent:
+            return NetworkView(
+                parent, junction_operation(junction_mask, other_junction_mask),
+                edge_operation(edge_mask, other_edge_mask)
+            )
+        # Networks were loaded from different files, internal id's are not comparable, use original id's
+        junction_ids: np.ndarray = np.unique(np.array(list(self.junctions) + list(other.junctions), dtype=str))
+        edge_ids: np.ndarray = np.unique(np.array(list(self.edges) + list(other.edges), dtype=str))
+        junction_ids = junction_ids[junction_operation(
+            np.isin(junction_ids, list(self.junctions)), np.isin(junction_ids, list(other.junctions))
+        )]
+        edge_ids = edge_ids[edge_operation(np.isin(edge_ids, list(self.edges)), np.isin(edge_ids, list(other.edges)))]
+        return self.rebuild(other, junction_ids.tolist(), edge_ids.tolist())
+
+    def rebuild(self, other: 'RoadNetwork', junction_ids: List[str], edge_ids: List[str]) -> Optional['RoadNetwork']:
+        """
+        Creates new network from objects of both networks (objects of this network are preferred),
+        connections between edges are merged, routes of both networks must have exactly one edge.
+
+        :param other: RoadNetwork class
+        :param junction_ids: id's of junctions to be kept
+        :param edge_ids: id's of edges to be kept (only if both of their junctions are kept)
+        :return: New RoadNetwork class, None if error occurred
+        """
+        if any(len(route.edge_list) != 1 for network in (self, other) for route in network.routes.values()):
+            print("Cannot combine networks loaded from different files, routes must have exactly one edge!")
+            return None
         ret_val: RoadNetwork = RoadNetwork()
-        ret_val.load(self)
-        # Unite both together
-        ret_val = ret_val.union(other)
-        # Remove what is common for both graphs
-        for common_junction_id in (self.junctions.keys() & other.junctions.keys()):
-            ret_val.remove_junction(common_junction_id)
+        for index, junction_id in enumerate(junction_ids):
+            junction: Junction = self.junctions.get(junction_id, None) or other.junctions[junction_id]
+            if not ret_val.add_junction(Junction({"id": junction.id, **junction.attributes}, index)):
+                return None
+        for edge_id in edge_ids:
+            edge: Edge = self.edges.get(edge_id, None) or other.edges[edge_id]
+            if not ret_val.junction_exists(edge.from_junction, False) or \
+                    not ret_val.junction_exists(edge.to_junction, False):
+                continue
+            index: int = len(ret_val.edges)
+            new_edge: Edge = Edge(
+                dict(edge.attributes), {lane_id: dict(lane) for lane_id, lane in edge.lanes.items()}, index
+            )
+            if not ret_val.add_edge(new_edge) or not ret_val.add_route(Route(new_edge, f"r{index}", index)):
+                return None
+        # Merge connections of both networks
+        connections: Dict[str, Set[str]] = {}
+        for network in (self, other):
+            for to_edge, from_edges in network.get_edges_connections().items():
+                if to_edge in ret_val.edges and (from_edges & ret_val.edges.keys()):
+                    connections[to_edge] = connections.get(to_edge, set()) | (from_edges & ret_val.edges.keys())
+        if not ret_val.assign_connections(connections):
+            return None
+        ret_val.edge_connections = ret_val.get_edges_connections()
+        ret_val.map_name = self.map_name if self.map_name == other.map_name else ""
+        for roundabout in self.roundabouts + other.roundabouts:
+            if roundabout not in ret_val.roundabouts and all(ret_val.junction_exists(j, False) for j in roundabout):
+                ret_val.roundabouts.append(roundabout)
         return ret_val
 
+    def get_masks(self) -> Tuple['RoadNetwork', np.ndarray, np.ndarray]:
+        """
+        :return: Network over whose internal id's are masks defined, mask of junctions, mask of edges
+        """
+        csr: CsrGraph = self.get_csr()
+        return self, csr.junction_mask.copy(), csr.edge_mask.copy()
+
+    def assign_connections(self, connections: Dict[str, Set[str]]) -> bool:
+        """
+        Assigns routes to junctions, based on connections between edges (edge without incoming
+        edges is starting), identifies starting/ending junctions. Each edge must be represented
+        by route with the same internal id (network was not modified after loading).
+
+        :param connections: mapping of edge id to incoming edge id's
+        :return: True on success, false otherwise
+        """
+        for route in self.routes.values():
+            # Routes only have 1 edge each
+            edge_id: str = route.first_edge().get_id()
+            from_junction: Optional[Junction] = self.get_junction(route.get_start())
+            to_junction: Optional[Junction] = self.get_junction(route.get_destination())
+            if from_junction is None or to_junction is None:
+                return False
+            to_junction.add_connection(route, None)
+            if edge_id in connections:
+                for in_edge_id in connections[edge_id]:
+                    # Map internal edge id into route (when network is not modified, mapping is 1:1),
+                    # meaning, internal id of edge corresponds to route that represents this edge
+                    from_junction.add_connection(self.get_route(self.edges[in_edge_id].get_id(internal=True)), route)
+            else:  # No connection to this edge, from_junction is fringe (starting)
+                from_junction.add_connection(None, route)
+                # print(f"Junction: {from_junction.get_id(False)} is starting !")
+        for junction in self.junctions.values():
+            # Check junctions if they are on fringe
+            self.check_fringe(junction)
+        # Connections were assigned to junctions directly
+        self.reset_csr()
+        return True
+
     # -------------------------------------------------- Magics --------------------------------------------------
 
     def __eq__(self, other: 'RoadNetwork') -> bool:
@@ -287,7 +575,7 @@ class RoadNetwork(JunctionManager, EdgeManager, RouteManager):
         """
         Performs set intersection on skeleton classes (graphs of road networks), based on objects id's
 
-        :param other: skeleton class, must be loaded from the same network
+        :param other: skeleton class (networks sharing parent network are combined into view)
         :return: New skeleton class, None if error occurred
         """
         return self.intersection(other)
@@ -296,7 +584,7 @@ class RoadNetwork(JunctionManager, EdgeManager, RouteManager):
         """
         Performs set union on skeleton classes (graphs of road networks), based on objects id's
 
-        :param other: skeleton class, must be loaded from the same network
+        :param other: skeleton class (networks sharing parent network are combined into view)
         :return: New skeleton class, None if error occurred
         """
         return self.union(other)
@@ -305,7 +593,7 @@ class RoadNetwork(JunctionManager, EdgeManager, RouteManager):
         """
         Performs set difference on skeleton classes (graphs of road networks), based on objects id's
 
-        :param other: skeleton class, must be loaded from the same network
+        :param other: skeleton class (networks sharing parent network are combined into view)
         :return: New skeleton class, None if error occurred
         """
         return self.difference(other)
@@ -118,15 +118,24 @@ class Scheduler:
 
     # ------------------------------------------- ETA -------------------------------------------
 
-    def update_travel_time(self) -> None:
+    def update_travel_time(self, current_time: Optional[float] = None) -> None:
         """
-        Updates edge attributes based on current travel time, given by TraCI.
+        Updates edge attributes based on current travel time, given by TraCI,
+        travel times of routes are then updated at once.
 
+        :param current_time: of simulation (seconds), if given travel times are also
+        recorded into travel time profiles of network (time-dependent routing)
         :return: None
         """
         # print("Updating travel time on edges")
         for edge in self.road_network.edges.values():
             edge.attributes["travelTime"] = round(traci.edge.getTraveltime(edge.id), 3)
+        self.road_network.get_route_costs().update_travel_time(
+            (edge.internal_id for edge in self.road_network.edges.values()),
+            (edge.attributes["travelTime"] for edge in self.road_network.edges.values())
+        )
+        if current_time is not None:
+            self.road_network.get_travel_time_profiles().record(current_time)
         return
 
     def schedule_vehicles(self, cut_off: float) -> List[ControlledVehicle]:
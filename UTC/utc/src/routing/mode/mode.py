@@ -64,6 +64,19 @@ class Mode:
         """
         raise NotImplementedError("Error, method 'run' must be implemented by children of 'Mode' class!")
 
+    def close(self) -> None:
+        """
+        Terminates worker processes of network builders (if there are any)
+
+        :return: None
+        """
+        builders: List[NetworkBuilder] = (
+            self.network_builder if isinstance(self.network_builder, list) else [self.network_builder]
+        )
+        for builder in builders:
+            if builder is not None:
+                builder.close()
+
     def save_results(self, problems: List[TrafficProblem]) -> None:
         """
         Saves new routes with vehicles into a new scenario.
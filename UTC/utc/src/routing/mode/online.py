@@ -4,6 +4,7 @@ from utc.src.routing.control.scheduler import Scheduler, ControlledVehicle, Segm
 from utc.src.routing.traffic.dso import DSO
 from utc.src.routing.traffic.duo import DUO
 from utc.src.graph import Route
+from utc.src.constants.file_system.file_types.dump_file import DumpFile
 from utc.src.simulator.simulation import Simulation, traci
 # from xml.etree.ElementTree import Element
 # from copy import deepcopy
@@ -31,13 +32,29 @@ class Online(Mode):
             for edge in region.road_network.get_edge_list():
                 edge.attributes = self.graph.road_network.get_edge(edge.id).attributes
                 edge.attributes["region"] = region_id
+            region.road_network.get_route_costs().load_travel_time()
+        self.graph.road_network.get_route_costs().load_travel_time()
+        # Fill travel time profiles by historical travel times (time-dependent routing)
+        if self.options.init.mode.time_dependent and self.options.init.mode.profiles:
+            dump_file: DumpFile = DumpFile(self.options.init.mode.profiles)
+            for graph in [self.graph] + self.sub_graphs:
+                if not graph.road_network.get_travel_time_profiles().load_dump(dump_file):
+                    return False
         # TODO Initialize DSO/DUO if enabled
         self.dso = DSO(self.new_scenario, self.sub_graphs, self.options.builder)
-        self.duo = DUO(self.graph, self.sub_graphs)
+        self.duo = DUO(
+            self.graph, self.sub_graphs, self.options.init.mode.duo,
+            time_dependent=self.options.init.mode.time_dependent
+        )
         # At least one routing type has to be active
         assert(self.duo is not None or self.dso is not None)
         return True
 
+    def close(self) -> None:
+        super().close()
+        if self.dso is not None:
+            self.dso.close()
+
     # -------------------------------------------- Simulation --------------------------------------------
 
     def run(self) -> List[ControlledVehicle]:
@@ -60,7 +77,7 @@ class Online(Mode):
                         break
                     # Check for DUO - immediate vehicle routing for each new entry (if enabled)
                     if self.duo is not None and departed_vehicles:
-                        duo_routes, duo_time = self.duo.route_vehicles(departed_vehicles)
+                        duo_routes, duo_time = self.duo.route_vehicles(departed_vehicles, simulation.get_time())
                         # print(f"Duo found: {(len(duo_routes) - duo_routes.count(None))}/{len(departed_vehicles)} routes in {duo_time}[s].")
                         self.scheduler.assign_routes(departed_vehicles, duo_routes, "DUO")
                         # TODO Check route from DUO for segment changes
@@ -73,7 +90,14 @@ class Online(Mode):
                 if not simulation.is_running():
                     break
                 # ---------------------- Schedule ----------------------
-                self.scheduler.update_travel_time()
+                # Live travel times are recorded into profiles only by time-dependent routing
+                current_time: Optional[float] = simulation.get_time() if self.options.init.mode.time_dependent else None
+                self.scheduler.update_travel_time(current_time)
+                # Regions share attributes of edges with network, reload their travel times
+                for region in self.sub_graphs:
+                    region.road_network.get_route_costs().load_travel_time()
+                    if current_time is not None:
+                        region.road_network.get_travel_time_profiles().record(current_time)
                 if self.sub_graphs: # There is only global DUO available without controlled regions
                     scheduled: List[ControlledVehicle] = self.scheduler.schedule_vehicles(self.options.init.mode.interval[1])
                 else:
@@ -82,7 +106,7 @@ class Online(Mode):
                 if scheduled:
                     # DUO can be assigned immediately, as it is very fast
                     if self.duo is not None:
-                        duo_routes, duo_time = self.duo.route_vehicles(scheduled)
+                        duo_routes, duo_time = self.duo.route_vehicles(scheduled, simulation.get_time())
                         self.scheduler.assign_routes(scheduled, duo_routes, "DUO")
                     # Generate DSO routes asynchronously (i.e. assign after the time needed already passed)
                     if self.dso is not None:
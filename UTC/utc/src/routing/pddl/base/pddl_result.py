@@ -4,7 +4,7 @@ from utc.src.graph import Edge, Route
 from utc.src.routing.base.controlled_vehicle import ControlledVehicle
 from utc.src.routing.base.traffic_info import ResultInfo
 from utc.src.routing.base.traffic_problem import TrafficProblem
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 
 
 class PddlResult:
@@ -43,16 +43,20 @@ class PddlResult:
             return None
         # Internal ID's mapping to original
         vehicle_abstraction: Dict[int, str] = {vehicle.internal_id: vehicle.id for vehicle in problem.vehicles.values()}
-        new_paths: Dict[str, Route] = {}
+        candidates: List[Tuple[ControlledVehicle, List[Edge]]] = []
         for vehicle_iid, path in paths.items():
             if vehicle_iid not in vehicle_abstraction:
                 print(f"Error, received invalid vehicle internal id '{vehicle_iid}'")
                 continue
-            vehicle: ControlledVehicle = problem.vehicles[vehicle_abstraction[vehicle_iid]]
+            candidates.append((problem.vehicles[vehicle_abstraction[vehicle_iid]], problem.network.get_edges(path)))
+        # Check route validity (all at once), error can happen due to killing process while result file is being written
+        valid: List[bool] = problem.network.check_edge_sequences(
+            [new_edges if None not in new_edges else [] for _, new_edges in candidates]
+        )[0].tolist()
+        new_paths: Dict[str, Route] = {}
+        for (vehicle, new_edges), is_valid in zip(candidates, valid):
             original_edges: List[str] = vehicle.route.get_segment_edges(vehicle.route.get_current_segment())
-            new_edges: List[Edge] = problem.network.get_edges(path)
-            # Check route validity, error can happen due to killing process while result file is being written, etc.
-            if not new_edges or None in new_edges or not problem.network.check_edge_sequence(new_edges):
+            if not is_valid:
                 print(f"Error, invalid path generated for vehicle: '{vehicle.id}'")
                 continue
             elif not (original_edges[0] == new_edges[0].id and original_edges[-1] == new_edges[-1].id):
@@ -2,6 +2,7 @@ from utc.src.constants.static.pddl_constants import NetworkCapacity
 from utc.src.routing.base.traffic_problem import TrafficProblem
 from utc.src.routing.pddl.base.pddl_problem import PddlProblem
 from utc.src.graph import Route, Junction
+from utc.src.graph.network import RouteCosts
 from typing import Dict, List, Set
 
 
@@ -124,13 +125,15 @@ class NetworkDomain:
                 occupied[edge] += 1
         # Add predicates: 'connected', 'length', 'use', 'cap', 'using', 'light, medium, heavy'
         max_capacity: int = 0
+        costs: RouteCosts = traffic_problem.network.get_route_costs()
+        capacities: List[int] = costs.get_list("capacity")
         for route in traffic_problem.network.routes.values():
             problem.add_object(self.route_group_name, f"r{route.get_id(True)}")
-            capacity: int = route.get_capacity()
+            capacity: int = capacities[route.internal_id]
             assert (capacity > 0)
             max_capacity = max(max_capacity, capacity)
             # Route penalization
-            for predicate in self.add_penalization(route):
+            for predicate in self.add_penalization(route, costs):
                 problem.add_init_state(predicate)
             # Route capacity thresholds
             for predicate in self.add_thresholds(route, capacity):
@@ -257,16 +260,18 @@ class NetworkDomain:
                 index += 1
         return predicates
 
-    def add_penalization(self, route: Route) -> List[str]:
+    def add_penalization(self, route: Route, costs: RouteCosts) -> List[str]:
         """
         :param route: to be calculated
+        :param costs: of routes of network
         :return: List of predicates representing penalization based on route congestion
         """
         assert(len(route.edge_list) == 1)
         if not self.dynamic_cost:
-            cost: float = route.get_average_traveling_time()
+            # Free-flow travel time, equal to average traveling time for routes with single edge
+            cost: float = costs.get_list("free_flow")[route.internal_id]
         else:
-            cost: float = min(route.get_travel_time(), 5000) #
+            cost: float = min(costs.get_list("travel_time")[route.internal_id], 5000) #
         cost = max(cost, 1)
         assert (cost >= 1)
         route_id: str = f"r{route.get_id(True)}"
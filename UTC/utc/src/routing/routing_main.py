@@ -34,8 +34,11 @@ class RoutingMain:
         #     self.mode = Offline(self.options)
         # else:
         self.mode = Online(self.options)
-        # Run the routing
-        vehicle_mapping: Dict[str, ControlledVehicle] = {vehicle.id: vehicle for vehicle in self.mode.run()}
+        # Run the routing (worker processes are terminated after simulation ends, or fails)
+        try:
+            vehicle_mapping: Dict[str, ControlledVehicle] = {vehicle.id: vehicle for vehicle in self.mode.run()}
+        finally:
+            self.mode.close()
         if not vehicle_mapping:
             print(f"Error, no vehicles were routed!")
             return False
@@ -4,7 +4,7 @@ from utc.src.constants.options.general_options import GeneralOptions
 from dataclasses import dataclass, asdict, fields
 from typing import List, Tuple, Dict, Any, Optional
 
-from utc.src.graph.graph_options import TopkaOptions
+from utc.src.graph.graph_options import TopkaOptions, AlternativesOptions
 
 
 # ----------------------- Init -----------------------
@@ -19,6 +19,9 @@ class ModeOptions(Options):
     dynamic_cost: bool
     domain: str
     window: int
+    duo: str = "dijkstra"  # Algorithm of DUO routing ('dijkstra', 'cch', 'bidirectional' or 'dynamic')
+    time_dependent: bool = False  # Evaluate travel times of DUO routing at expected time of entering edges
+    profiles: str = ""  # Optional path to edge data dump (".out.xml") with historical travel times
 
     def validate_options(self) -> bool:
         return True
@@ -75,7 +78,11 @@ class NetworkBuilderOptions(Options):
     regions: List[str] = None
     simplify: bool = True
     cache_size: int = 2000
+    cache_policy: str = "lru"  # Eviction of sub-graphs from full cache ('lru' or 'lfu')
+    cache_memory: float = 0  # Maximal estimated memory of cached sub-graphs in MB (0 is unlimited)
+    processes: int = 1  # Number of worker processes running TopKA* (1 runs it in main process)
     topka: TopkaOptions = None
+    alternatives: AlternativesOptions = None  # Generator of routes used instead of TopKA* (if set)
     dbscan: DbscanOptions = None
 
     def validate_options(self) -> bool:
@@ -1,19 +1,72 @@
 from utc.src.graph import Route
+from collections import OrderedDict
 from typing import Optional, List, Dict, Tuple, FrozenSet, Set
+import sys
 
 
 class Cache:
     """
     Class used for holding generated sub-graphs, provides utility methods.
+    Cache is bounded by number of mappings (and optionally by estimated memory of sub-graphs), when limit is reached
+    mappings are evicted by policy ('lru' - least recently used, 'lfu' - least frequently used). Invalid mappings
+    (pairs of edges without alternative routes) are stored as None and evicted the same way. Statistics of hits,
+    misses, evictions and time saved by hits (time taken to generate the found sub-graph) are collected for tuning
+    of cache size.
     """
-    def __init__(self, max_size: int = 1500):
+    POLICIES: Tuple[str, ...] = ("lru", "lfu")
+
+    def __init__(self, max_size: int = 1500, policy: str = "lru", max_memory: float = 0):
         """
-        :param max_size: maximal number of sub-graphs which can be stored
+        :param max_size: maximal number of mappings (sub-graphs and invalid mappings) which can be stored
+        :param policy: of eviction ('lru' or 'lfu'), default 'lru'
+        :param max_memory: maximal estimated memory of sub-graphs (MB), default 0 (unlimited)
         """
-        self._memory: Dict[Tuple[int, int], FrozenSet[int]] = {} # (incoming_edge, outgoing_edge) -> subgraph
-        self.invalid: Set[Tuple[int, int]] = set() # (incoming_edge, outgoing_edge)
+        assert (max_size > 0 and policy in self.POLICIES and max_memory >= 0)
+        # (incoming_edge, outgoing_edge) -> subgraph (None if invalid), ordered from the least recently used
+        self._memory: Dict[Tuple[int, int], Optional[FrozenSet[int]]] = OrderedDict()
         self.size: int = 0
         self.max_size: int = max_size
+        self.policy: str = policy
+        self.memory: int = 0  # Estimated memory of sub-graphs (bytes)
+        self.max_memory: float = max_memory
+        # (incoming_edge, outgoing_edge) -> number of uses (for 'lfu' policy)
+        self._uses: Dict[Tuple[int, int], int] = {}
+        # Number of uses -> mappings used that many times, ordered from the least recently used (only non-empty)
+        self._frequencies: Dict[int, Dict[Tuple[int, int], None]] = {}
+        # (incoming_edge, outgoing_edge) -> seconds taken to generate mapping
+        self._costs: Dict[Tuple[int, int], float] = {}
+        # Mappings generated in advance (e.g. by worker processes), which were not requested yet
+        self.pending: Set[Tuple[int, int]] = set()
+        # Statistics
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.time_saved: float = 0.
+
+    def lookup(self, in_edge: int, out_edge: int) -> bool:
+        """
+        Request for mapping, counted as hit if mapping exists (and was not generated in advance
+        for this request), otherwise as miss
+
+        :param in_edge: incoming edge (internal ID)
+        :param out_edge: outgoing edge (internal ID)
+        :return: True if mapping exists, False otherwise
+        """
+        key: Tuple[int, int] = (in_edge, out_edge)
+        if not self.has_mapping(in_edge, out_edge):
+            self.misses += 1
+            return False
+        elif key in self.pending:
+            self.pending.discard(key)
+            self.misses += 1
+            return True
+        self.hits += 1
+        self.time_saved += self._costs[key]
+        self._memory.move_to_end(key)
+        self.set_uses(key, self._uses[key] + 1)
+        return True
+
+    # ------------------------------------------ Getters ------------------------------------------
 
     def get_mapping(self, in_edge: int, out_edge: int) -> Optional[FrozenSet[int]]:
         """
@@ -27,12 +80,33 @@ class Cache:
         """
         :param in_edge: incoming edge
         :param out_edge: outgoing edge
-        :return: True if mapping exists, False otherwise
+        :return: True if mapping exists (also invalid), False otherwise
         """
-        if (in_edge, out_edge) in self.invalid:
-            return True
         return (in_edge, out_edge) in self._memory
 
+    def get_stats(self) -> Dict[str, float]:
+        """
+        :return: Statistics of cache (size, memory in MB, hits, misses, hit rate, evictions and time saved in seconds)
+        """
+        requests: int = self.hits + self.misses
+        return {
+            "size": self.size, "memory": round(self.memory / 2**20, 3), "hits": self.hits, "misses": self.misses,
+            "hit_rate": round(self.hits / requests, 3) if requests else 0., "evictions": self.evictions,
+            "time_saved": round(self.time_saved, 3)
+        }
+
+    @staticmethod
+    def get_memory(sub_graph: Optional[FrozenSet[int]]) -> int:
+        """
+        :param sub_graph: set of edges id's forming sub-graph, None if mapping is invalid
+        :return: Estimated memory of sub-graph (bytes), 0 for invalid mapping
+        """
+        if sub_graph is None:
+            return 0
+        return sys.getsizeof(sub_graph) + sum(map(sys.getsizeof, sub_graph))
+
+    # ------------------------------------------ Setters ------------------------------------------
+
     def save_mapping(
             self, in_edge: int, out_edge: int,
             routes: List[Route], replace: bool = False
@@ -46,25 +120,102 @@ class Cache:
         """
         # Invalid mapping
         if routes is None or not routes:
-            self.invalid.add((in_edge, out_edge))
-            return None
-        elif not replace and self.get_mapping(in_edge, out_edge) is not None:
-            print(f"Cannot replace mapping: {in_edge} -> {out_edge}, as replace is set to false!")
-            return None
-        elif self.size + 1 > self.max_size:
-            print(f"Cannot add mapping: {in_edge} -> {out_edge}, size: {self.size} is at maximum !")
+            return self.save_sub_graph(in_edge, out_edge, None, replace)
+        return self.save_sub_graph(
+            in_edge, out_edge, frozenset([edge_id for route in routes for edge_id in route.get_edge_ids(True)]), replace
+        )
+
+    def save_sub_graph(
+            self, in_edge: int, out_edge: int, sub_graph: Optional[FrozenSet[int]],
+            replace: bool = False, cost: float = 0., pending: bool = False
+        ) -> Optional[FrozenSet[int]]:
+        """
+        :param in_edge: incoming edge (internal ID)
+        :param out_edge: outgoing edges(internal ID)
+        :param sub_graph: set of edges id's forming sub-graph (e.g. computed by worker process)
+        :param replace: if previous mapping should be replaced
+        :param cost: seconds taken to generate sub-graph (saved by each hit), default 0
+        :param pending: if mapping was generated in advance (its first request is not counted as hit), default False
+        :return: Set of edges id's forming sub-graph, None if mapping is invalid or error occurred
+        """
+        key: Tuple[int, int] = (in_edge, out_edge)
+        # Invalid mapping
+        if not sub_graph:
+            sub_graph = None
+        # Mapping is rejected, nothing is stored
+        if not replace and self.get_mapping(in_edge, out_edge) is not None:
+            if sub_graph is not None:
+                print(f"Cannot replace mapping: {in_edge} -> {out_edge}, as replace is set to false!")
             return None
+        self.remove(key)
+        memory: int = self.get_memory(sub_graph)
+        self.evict(1, memory)
         self.size += 1
-        sub_graph: FrozenSet[int] = frozenset([edge_id for route in routes for edge_id in route.get_edge_ids(True)])
-        self._memory[(in_edge, out_edge)] = sub_graph
+        self.memory += memory
+        self._memory[key] = sub_graph
+        self.set_uses(key, 1)
+        self._costs[key] = cost
+        if pending:
+            self.pending.add(key)
         return sub_graph
 
+    def set_uses(self, key: Tuple[int, int], uses: int) -> None:
+        """
+        :param key: incoming and outgoing edge (internal ID's) of mapping
+        :param uses: new number of uses of mapping (0 removes it from frequencies)
+        :return: None
+        """
+        previous: int = self._uses.pop(key, 0)
+        if previous in self._frequencies:
+            self._frequencies[previous].pop(key, None)
+            if not self._frequencies[previous]:
+                self._frequencies.pop(previous)
+        if uses > 0:
+            self._uses[key] = uses
+            self._frequencies.setdefault(uses, OrderedDict())[key] = None
+
+    # ------------------------------------------ Eviction ------------------------------------------
+
+    def evict(self, size: int, memory: int) -> None:
+        """
+        Evicts sub-graphs by policy, until there is space for new ones
+
+        :param size: number of new sub-graphs
+        :param memory: estimated memory of new sub-graphs (bytes)
+        :return: None
+        """
+        limit: float = self.max_memory * 2**20 if self.max_memory > 0 else float("inf")
+        while self._memory and (self.size + size > self.max_size or self.memory + memory > limit):
+            if self.policy == "lru":
+                key: Tuple[int, int] = next(iter(self._memory))
+            else:  # Least used sub-graph, the least recently used one from ties (only few distinct frequencies exist)
+                key: Tuple[int, int] = next(iter(self._frequencies[min(self._frequencies)]))
+            self.remove(key)
+            self.evictions += 1
+
+    def remove(self, key: Tuple[int, int]) -> None:
+        """
+        :param key: incoming and outgoing edge (internal ID's) of mapping, which is removed (if it exists)
+        :return: None
+        """
+        if key not in self._memory:
+            return
+        self.size -= 1
+        self.memory -= self.get_memory(self._memory.pop(key))
+        self.set_uses(key, 0)
+        self._costs.pop(key, None)
+        self.pending.discard(key)
+
     def clear(self) -> None:
         """
-        Resets mapping, clears memory
+        Resets mapping, clears memory (statistics are kept)
 
         :return: None
         """
         self._memory.clear()
-        self.invalid.clear()
+        self._uses.clear()
+        self._frequencies.clear()
+        self._costs.clear()
+        self.pending.clear()
         self.size = 0
+        self.memory = 0
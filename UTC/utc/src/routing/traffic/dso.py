@@ -72,6 +72,15 @@ class DSO:
                 routes[vehicle_id] = route
         return list(routes.values()), round(time.time() - now, 3)
 
+    def close(self) -> None:
+        """
+        Terminates worker processes of network builders (if there are any)
+
+        :return: None
+        """
+        for builder in self.builders:
+            builder.close()
+
     def construct_traffic_problems(self, vehicles: List[ControlledVehicle]) -> List[TrafficProblem]:
         """
         :return:
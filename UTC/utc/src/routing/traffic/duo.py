@@ -1,5 +1,9 @@
 from utc.src.graph import RoadNetwork, Junction, Edge, Route, Graph
+from utc.src.graph.network import (
+    CsrGraph, Landmarks, BidirectionalSearch, SearchWorkspace, TravelTimeProfiles, DynamicTree
+)
 from utc.src.routing.base.controlled_vehicle import ControlledVehicle
+import numpy as np
 import heapq
 import time
 from typing import Optional, List, Set, Tuple, Dict
@@ -9,90 +13,427 @@ class DUO:
     """
     Class dealing with decentralized routing approach, i.e. other vehicles are not taken into account
     """
-    def __init__(self, graph: Graph, sub_graphs: List[Graph] = None):
+    ALGORITHMS: Tuple[str, ...] = ("dijkstra", "cch", "bidirectional", "dynamic")
+    HEURISTICS: Tuple[str, ...] = ("none", "landmarks")
+    def __init__(
+            self, graph: Graph, sub_graphs: List[Graph] = None, algorithm: str = "dijkstra",
+            heuristic: str = "none", speed_factor: float = 1.2, time_dependent: bool = False
+        ):
         """
         :param graph: the graph on which routing takes place
         :param sub_graphs: sub-graphs (controlled regions) of road network
+        :param algorithm: of routing, 'dijkstra' (search over network), 'cch' (queries on contraction
+        hierarchy of network, customized when travel times change), 'bidirectional' (bidirectional
+        Dijkstra's search from incoming and outgoing edge) or 'dynamic' (shortest path trees of
+        incoming or outgoing edges, repaired when travel times change), default 'dijkstra'
+        :param heuristic: of 'dijkstra' search, 'none' (Dijkstra) or 'landmarks' (A* guided by
+        landmark lower bounds on free-flow travel time), default 'none'
+        :param speed_factor: the highest ratio of vehicle speed to speed limit, travel times
+        can be shorter than free-flow travel times (keeps 'landmarks' heuristic admissible)
+        :param time_dependent: if travel time of each route is evaluated at the expected time of entering it
+        (from travel time profiles of network), vehicles are then routed by 'dijkstra' search, default False
         """
+        assert (algorithm in self.ALGORITHMS), f"Unknown algorithm: '{algorithm}', expected one of: {self.ALGORITHMS} !"
+        assert (heuristic in self.HEURISTICS), f"Unknown heuristic: '{heuristic}', expected one of: {self.HEURISTICS} !"
+        assert (speed_factor >= 1), f"Parameter 'speed_factor' has to be at least 1, got: '{speed_factor}' !"
         self.graph: Graph = graph
         self.sub_graphs: Optional[List[Graph]] = sub_graphs
+        self.algorithm: str = algorithm
+        self.heuristic: str = heuristic
+        self.speed_factor: float = speed_factor
+        self.time_dependent: bool = time_dependent
+        # Forward and backward search state (reused between searches)
+        self.workspaces: Tuple[SearchWorkspace, SearchWorkspace] = (SearchWorkspace(), SearchWorkspace())
         print("Successfully initialized DUO routing")
 
-    def route_vehicles(self, vehicles: List[ControlledVehicle]) -> Tuple[List[Optional[Route]], float]:
+    def route_vehicles(
+            self, vehicles: List[ControlledVehicle], current_time: Optional[float] = None
+        ) -> Tuple[List[Optional[Route]], float]:
         """
+        Vehicles are routed in batches grouped by network (region) and starting edge, so that
+        vehicles with the same starting edge (or exit edge) share the same search. Time-dependent
+        searches are shared only by vehicles which also enter their current segment at the same time.
+        Trees of 'dynamic' algorithm are rooted at exit edges, if vehicles share exit edges more than starting edges.
+
         :param vehicles: list of vehicles scheduled for routing
+        :param current_time: of simulation (seconds), required by time-dependent routing
         :return: List of new routes for vehicles current segments (some can be invalid - None) and time taken
         """
         now: float = time.time()
-        return [self.route_vehicle(vehicle) for vehicle in vehicles], round(time.time() - now, 3)
+        routes: List[Optional[Route]] = [None] * len(vehicles)
+        # Mapping of region id to starting edge, to indexes of vehicles and their exit edges
+        groups: Dict[int, Dict[str, List[Tuple[int, str]]]] = {}
+        for index, vehicle in enumerate(vehicles):
+            edges: List[str] = vehicle.route.get_segment_edges(vehicle.route.get_current_segment())
+            region_id: int = vehicle.route.get_current_segment().region_id
+            if self.get_network(region_id) is None:
+                print(f"Error, unable to route vehicle {vehicle.id} with DUO, missing sub-graph!")
+                continue
+            groups.setdefault(region_id, {}).setdefault(edges[0], []).append((index, edges[-1]))
+        for region_id, starts in groups.items():
+            network: RoadNetwork = self.get_network(region_id)
+            if self.algorithm == "cch" and not (self.time_dependent and current_time is not None):
+                pairs: List[Tuple[int, str, str]] = [
+                    (index, in_edge, out_edge) for in_edge, targets in starts.items() for index, out_edge in targets
+                ]
+                found: List[Optional[Route]] = self.contraction_many(
+                    [(in_edge, out_edge) for _, in_edge, out_edge in pairs], network
+                )
+                for (index, _, _), route in zip(pairs, found):
+                    routes[index] = route
+                continue
+            elif self.algorithm == "dynamic" and not (self.time_dependent and current_time is not None):
+                # Mapping of exit edge to indexes of vehicles and their starting edges
+                ends: Dict[str, List[Tuple[int, str]]] = {}
+                for in_edge, targets in starts.items():
+                    for index, out_edge in targets:
+                        ends.setdefault(out_edge, []).append((index, in_edge))
+                if len(ends) < len(starts) and self.has_single_ends(list(ends.keys()), network):
+                    for out_edge, sources in ends.items():
+                        found: List[Optional[Route]] = self.dynamic_reverse_many(
+                            [in_edge for _, in_edge in sources], out_edge, network
+                        )
+                        for (index, _), route in zip(sources, found):
+                            routes[index] = route
+                    continue
+                for in_edge, targets in starts.items():
+                    found: List[Optional[Route]] = self.dynamic_many(
+                        in_edge, [out_edge for _, out_edge in targets], network
+                    )
+                    for (index, _), route in zip(targets, found):
+                        routes[index] = route
+                continue
+            for in_edge, targets in starts.items():
+                if self.algorithm == "bidirectional" and not (self.time_dependent and current_time is not None):
+                    for index, out_edge in targets:
+                        routes[index] = self.bidirectional(in_edge, out_edge, network)
+                    continue
+                # Mapping of departure time to indexes of vehicles and their exit edges
+                departures: Dict[Optional[float], List[Tuple[int, str]]] = {}
+                for index, out_edge in targets:
+                    departures.setdefault(self.get_departure(vehicles[index], current_time), []).append((index, out_edge))
+                for departure, batch in departures.items():
+                    found: List[Optional[Route]] = self.dijkstra_many(
+                        in_edge, [out_edge for _, out_edge in batch], network, departure
+                    )
+                    for (index, _), route in zip(batch, found):
+                        routes[index] = route
+        return routes, round(time.time() - now, 3)
 
-    def route_vehicle(self, vehicle: ControlledVehicle) -> Optional[Route]:
+    def route_vehicle(self, vehicle: ControlledVehicle, current_time: Optional[float] = None) -> Optional[Route]:
         """
         :param vehicle: current vehicle scheduled for routing
+        :param current_time: of simulation (seconds), required by time-dependent routing
         :return: New route for vehicle's current segment, None if it does not exist
         """
         edges: List[str] = vehicle.route.get_segment_edges(vehicle.route.get_current_segment())
-        region_id: int = vehicle.route.get_current_segment().region_id
-        if region_id == -1:
-            return self.dijkstra(edges[0], edges[-1], self.graph.road_network)
-        elif self.sub_graphs is None or not self.sub_graphs or region_id >= len(self.sub_graphs):
+        network: Optional[RoadNetwork] = self.get_network(vehicle.route.get_current_segment().region_id)
+        if network is None:
             print(f"Error, unable to route vehicle {vehicle.id} with DUO, missing sub-graph!")
             return None
-        # Else
-        return self.dijkstra(edges[0], edges[-1], self.sub_graphs[region_id].road_network)
+        elif self.time_dependent and current_time is not None:
+            return self.dijkstra(edges[0], edges[-1], network, self.get_departure(vehicle, current_time))
+        elif self.algorithm == "cch":
+            return self.contraction(edges[0], edges[-1], network)
+        elif self.algorithm == "bidirectional":
+            return self.bidirectional(edges[0], edges[-1], network)
+        elif self.algorithm == "dynamic":
+            return self.dynamic_many(edges[0], [edges[-1]], network)[0]
+        return self.dijkstra(edges[0], edges[-1], network)
 
     # ---------------------------------------- Routing ----------------------------------------
 
-    def dijkstra(self, in_edge: str, out_edge: str, network: RoadNetwork) -> Optional[Route]:
+    def contraction(self, in_edge: str, out_edge: str, network: RoadNetwork) -> Optional[Route]:
+        """
+        Computes the fastest (in terms of travel time) route for vehicle, trough contraction hierarchy
+        of network (hierarchy is customized again, after travel times of network were updated).
+
+        :param in_edge: incoming edge
+        :param out_edge: outgoing edge
+        :param network: road network on which the computation takes place
+        :return: Fastest travel time route, None if it does not exist
+        """
+        return self.contraction_many([(in_edge, out_edge)], network)[0]
+
+    def contraction_many(self, pairs: List[Tuple[str, str]], network: RoadNetwork) -> List[Optional[Route]]:
+        """
+        Batch version of 'contraction', searches from the same incoming edge
+        (and to the same outgoing edge) are performed only once.
+
+        :param pairs: of incoming and outgoing edges
+        :param network: road network on which the computation takes place
+        :return: Fastest travel time route for each pair, None if it does not exist
+        """
+        found: List[Optional[Route]] = [None] * len(pairs)
+        indexes: List[int] = []
+        queries: List[Tuple[int, int]] = []
+        for index, (in_edge, out_edge) in enumerate(pairs):
+            routes: Optional[Tuple[Route, Route]] = self.get_routes(in_edge, out_edge, network)
+            if routes is not None:
+                indexes.append(index)
+                queries.append((routes[0].internal_id, routes[1].internal_id))
+        csr_routes: List[Route] = network.get_csr().routes
+        for index, (_, path) in zip(indexes, network.get_contraction_hierarchy().query_many(queries)):
+            if not path:
+                print(f"Unable to find path between: {pairs[index]} !")
+                continue
+            edges: List[Edge] = [edge for route_id in path for edge in csr_routes[route_id].edge_list]
+            assert(network.check_edge_sequence(edges))
+            found[index] = Route(edges)
+        return found
+
+    def dijkstra(
+            self, in_edge: str, out_edge: str, network: RoadNetwork, departure: Optional[float] = None
+        ) -> Optional[Route]:
         """
         Computes the fastest (in terms of travel time) route for vehicle.
 
         :param in_edge: incoming edge
         :param out_edge: outgoing edge
         :param network: road network on which the computation takes place
+        :param departure: time of entering incoming edge, if given travel times are time-dependent
         :return: Fastest travel time route, None if it does not exist
         """
+        return self.dijkstra_many(in_edge, [out_edge], network, departure)[0]
+
+    def dijkstra_many(
+            self, in_edge: str, out_edges: List[str], network: RoadNetwork, departure: Optional[float] = None
+        ) -> List[Optional[Route]]:
+        """
+        Computes the fastest (in terms of travel time) routes from incoming edge to all outgoing edges,
+        by single search (routes are extracted from the same shortest path tree). If departure is given,
+        travel time of each route is taken from travel time profiles at the expected time of entering it
+        (departure + travel time of incoming edge + cost of path to route), FIFO profiles keep the search label-setting.
+
+        :param in_edge: incoming edge
+        :param out_edges: outgoing edges (can repeat)
+        :param network: road network on which the computation takes place
+        :param departure: time of entering incoming edge (seconds of simulation), default None (static travel times)
+        :return: Fastest travel time route for each outgoing edge, None if it does not exist
+        """
+        found: List[Optional[Route]] = [None] * len(out_edges)
         # ---------- Checks ----------
-        if not network.edge_exists(in_edge) or not network.edge_exists(out_edge):
-            return None
-        start_edge, exit_edge = network.get_edges([in_edge, out_edge])
-        if not network.route_exists(start_edge.internal_id) or not network.route_exists(exit_edge.internal_id):
-            return None
-        start_route, exit_route = network.get_routes([start_edge.internal_id, exit_edge.internal_id])
-        assert(start_route.edge_list[0].id == in_edge and exit_route.edge_list[-1].id == out_edge)
+        # Mapping of outgoing edge to indexes of results
+        targets: Dict[str, List[int]] = {}
+        exit_routes: List[Route] = []
+        start_route: Optional[Route] = None
+        for index, out_edge in enumerate(out_edges):
+            routes: Optional[Tuple[Route, Route]] = self.get_routes(in_edge, out_edge, network)
+            if routes is None:
+                continue
+            start_route = routes[0]
+            if out_edge not in targets:
+                exit_routes.append(routes[1])
+            targets.setdefault(out_edge, []).append(index)
+        if start_route is None:
+            return found
         # ---------- Init ----------
-        costs: Dict[str, float] = {start_route.id: 0}
-        prev: Dict[Route, Optional[Route]] = {start_route: None}
-        queue: List[Tuple[float, Junction, Route]] = []
-        heapq.heappush(queue, (0, network.get_junction(start_route.get_destination()), start_route))
+        # Travel times of routes are read from arrays (indexed by internal id's of routes)
+        travel_times: List[float] = network.get_route_costs().get_list("travel_time")
+        profiles: Optional[TravelTimeProfiles] = None
+        if departure is not None:
+            profiles = network.get_travel_time_profiles()
+            # Searched routes are entered after leaving incoming edge
+            departure += profiles.get_travel_time(start_route.internal_id, departure)
+        destinations: List[Junction] = network.get_csr().get_destinations()
+        csr_routes: List[Route] = network.get_csr().routes
+        bounds: Optional[List[float]] = self.get_bounds(network, exit_routes)
+        # Costs and previous routes (internal id's) of reached routes
+        costs: SearchWorkspace = self.workspaces[0].prepare(network.get_csr().route_count)
+        costs.set(start_route.internal_id, 0)
+        # priority (cost + lower bound on remaining cost), cost, junction, route
+        queue: List[Tuple[float, float, Junction, Route]] = []
+        heapq.heappush(queue, (0, 0, network.get_junction(start_route.get_destination()), start_route))
         # ---------- Path finding ----------
-        while queue:
-            total_cost, junction, in_route = heapq.heappop(queue)
-            # Skip already explored
-            # if costs[in_route.id] != total_cost:
-            #     continue
-            # Reached target, reconstruct route
-            if in_route.edge_list[-1].id == out_edge:
-                edges: List[Edge] = []
-                current = in_route
-                while current is not None:
-                    edges += current.edge_list
-                    current = prev[current]
-                edges.reverse()
+        while queue and targets:
+            _, total_cost, junction, in_route = heapq.heappop(queue)
+            # Reached target, reconstruct route (search continues until all targets are reached)
+            if in_route.edge_list[-1].id in targets:
+                edges: List[Edge] = [
+                    edge for route_id in costs.get_path(in_route.internal_id) for edge in csr_routes[route_id].edge_list
+                ]
                 assert(network.check_edge_sequence(edges))
                 # Special case of vehicle only driving over one edge
                 if total_cost == 0:
-                    assert(in_edge == out_edge)
-                return Route(edges)
-
+                    assert(in_edge == in_route.edge_list[-1].id)
+                for index in targets.pop(in_route.edge_list[-1].id):
+                    found[index] = Route(edges)
+                if not targets:
+                    break
             for out_route in junction.travel(in_route):
-                cost, dest = out_route.travel()
+                if profiles is None:
+                    cost: float = travel_times[out_route.internal_id]
+                else:
+                    cost: float = profiles.get_travel_time(out_route.internal_id, departure + total_cost)
                 assert(cost > 0)
                 cost += total_cost
-                if cost < costs.get(out_route.id, float("inf")):
-                    prev[out_route] = in_route
-                    costs[out_route.id] = cost
-                    heapq.heappush(queue, (cost, network.get_junction(dest), out_route))
-        print(f"Unable to find path between: {in_edge, out_edge} !")
-        return None
+                if cost < costs.get_distance(out_route.internal_id):
+                    costs.set(out_route.internal_id, cost, in_route.internal_id)
+                    heapq.heappush(queue, (
+                        cost + (bounds[out_route.internal_id] if bounds is not None else 0),
+                        cost, destinations[out_route.internal_id], out_route
+                    ))
+        for out_edge in targets:
+            print(f"Unable to find path between: {in_edge, out_edge} !")
+        return found
+
+    def bidirectional(self, in_edge: str, out_edge: str, network: RoadNetwork) -> Optional[Route]:
+        """
+        Computes the fastest (in terms of travel time) route for vehicle, by bidirectional
+        Dijkstra's search (from incoming edge and backwards from outgoing edge).
+
+        :param in_edge: incoming edge
+        :param out_edge: outgoing edge
+        :param network: road network on which the computation takes place
+        :return: Fastest travel time route, None if it does not exist
+        """
+        routes: Optional[Tuple[Route, Route]] = self.get_routes(in_edge, out_edge, network)
+        if routes is None:
+            return None
+        _, path = BidirectionalSearch(network.get_csr()).search(
+            {routes[0].internal_id: 0}, {routes[1].internal_id: 0},
+            network.get_route_costs().get_list("travel_time"), self.workspaces
+        )
+        if not path:
+            print(f"Unable to find path between: {in_edge, out_edge} !")
+            return None
+        csr_routes: List[Route] = network.get_csr().routes
+        edges: List[Edge] = [edge for route_id in path for edge in csr_routes[route_id].edge_list]
+        assert(network.check_edge_sequence(edges))
+        return Route(edges)
+
+    def dynamic_many(self, in_edge: str, out_edges: List[str], network: RoadNetwork) -> List[Optional[Route]]:
+        """
+        Computes the fastest (in terms of travel time) routes from incoming edge to all outgoing edges,
+        routes are extracted from shortest path tree of incoming edge (kept by network and repaired
+        after travel times change, instead of being computed again).
 
+        :param in_edge: incoming edge
+        :param out_edges: outgoing edges (can repeat)
+        :param network: road network on which the computation takes place
+        :return: Fastest travel time route for each outgoing edge, None if it does not exist
+        """
+        found: List[Optional[Route]] = [None] * len(out_edges)
+        tree: Optional[DynamicTree] = None
+        csr: CsrGraph = network.get_csr()
+        for index, out_edge in enumerate(out_edges):
+            routes: Optional[Tuple[Route, Route]] = self.get_routes(in_edge, out_edge, network)
+            if routes is None:
+                continue
+            elif tree is None:
+                tree = network.get_tree_cache().get_tree(routes[0].internal_id)
+            # Any route ending with outgoing edge reaches it
+            exit_routes: List[int] = csr.get_end_routes(routes[1].edge_list[-1].internal_id).tolist()
+            exit_route: int = min(exit_routes, key=tree.get_distance)
+            path: List[int] = tree.get_path(exit_route)
+            if not path:
+                print(f"Unable to find path between: {in_edge, out_edge} !")
+                continue
+            edges: List[Edge] = [edge for route_id in path for edge in csr.routes[route_id].edge_list]
+            assert(network.check_edge_sequence(edges))
+            found[index] = Route(edges)
+        return found
+
+    def dynamic_reverse_many(self, in_edges: List[str], out_edge: str, network: RoadNetwork) -> List[Optional[Route]]:
+        """
+        Computes the fastest (in terms of travel time) routes from all incoming edges to outgoing edge,
+        routes are extracted from reversed shortest path tree of outgoing edge (kept by network and repaired
+        after travel times change). Outgoing edge has to be the last edge of only one route ('has_single_ends').
+
+        :param in_edges: incoming edges (can repeat)
+        :param out_edge: outgoing edge
+        :param network: road network on which the computation takes place
+        :return: Fastest travel time route for each incoming edge, None if it does not exist
+        """
+        found: List[Optional[Route]] = [None] * len(in_edges)
+        tree: Optional[DynamicTree] = None
+        csr: CsrGraph = network.get_csr()
+        for index, in_edge in enumerate(in_edges):
+            routes: Optional[Tuple[Route, Route]] = self.get_routes(in_edge, out_edge, network)
+            if routes is None:
+                continue
+            elif tree is None:
+                tree = network.get_tree_cache().get_tree(routes[1].internal_id, True)
+            path: List[int] = tree.get_path(routes[0].internal_id)
+            if not path:
+                print(f"Unable to find path between: {in_edge, out_edge} !")
+                continue
+            edges: List[Edge] = [edge for route_id in path for edge in csr.routes[route_id].edge_list]
+            assert(network.check_edge_sequence(edges))
+            found[index] = Route(edges)
+        return found
+
+    # ---------------------------------------- Utils ----------------------------------------
+
+    # noinspection PyMethodMayBeStatic
+    def has_single_ends(self, out_edges: List[str], network: RoadNetwork) -> bool:
+        """
+        :param out_edges: outgoing edges
+        :param network: road network on which the computation takes place
+        :return: True if each existing outgoing edge is the last edge of only one route
+        (reversed tree of that route holds all paths ending with edge), False otherwise
+        """
+        csr: CsrGraph = network.get_csr()
+        return all(
+            len(csr.get_end_routes(network.get_edge(out_edge).internal_id)) == 1
+            for out_edge in out_edges if network.edge_exists(out_edge, False)
+        )
+
+    def get_network(self, region_id: int) -> Optional[RoadNetwork]:
+        """
+        :param region_id: id of region (-1 for the whole road network)
+        :return: Road network of region, None if sub-graph of region is missing
+        """
+        if region_id == -1:
+            return self.graph.road_network
+        elif self.sub_graphs is None or not self.sub_graphs or region_id >= len(self.sub_graphs):
+            return None
+        return self.sub_graphs[region_id].road_network
+
+    def get_departure(self, vehicle: ControlledVehicle, current_time: Optional[float]) -> Optional[float]:
+        """
+        :param vehicle: scheduled for routing
+        :param current_time: of simulation (seconds)
+        :return: Expected time of vehicle entering its current segment, None if routing is not time-dependent
+        """
+        if not self.time_dependent or current_time is None:
+            return None
+        return current_time + max(vehicle.route.get_current_segment().eta, 0)
+
+    # noinspection PyMethodMayBeStatic
+    def get_routes(self, in_edge: str, out_edge: str, network: RoadNetwork) -> Optional[Tuple[Route, Route]]:
+        """
+        :param in_edge: incoming edge
+        :param out_edge: outgoing edge
+        :param network: road network on which the computation takes place
+        :return: Starting and exit routes (routes sharing internal id with edges), None if they do not exist
+        """
+        if not network.edge_exists(in_edge) or not network.edge_exists(out_edge):
+            return None
+        start_edge, exit_edge = network.get_edges([in_edge, out_edge])
+        if not network.route_exists(start_edge.internal_id) or not network.route_exists(exit_edge.internal_id):
+            return None
+        start_route, exit_route = network.get_routes([start_edge.internal_id, exit_edge.internal_id])
+        assert(start_route.edge_list[0].id == in_edge and exit_route.edge_list[-1].id == out_edge)
+        return start_route, exit_route
+
+    def get_bounds(self, network: RoadNetwork, exit_routes: List[Route]) -> Optional[List[float]]:
+        """
+        :param network: road network on which the computation takes place
+        :param exit_routes: goals of search
+        :return: Lower bounds on travel time from each route to the closest exit route (indexed by
+        internal id's of routes), None if search is not guided by heuristic
+        """
+        if self.heuristic != "landmarks" or not exit_routes:
+            return None
+        csr: CsrGraph = network.get_csr()
+        landmarks: Landmarks = network.get_landmarks()
+        # Minimum of consistent bounds is consistent, each exit route is still reached by the fastest route
+        bounds: np.ndarray = np.minimum.reduce([
+            landmarks.get_bounds("free_flow", exit_route.internal_id) for exit_route in exit_routes
+        ]) / self.speed_factor
+        # Search ends on any route ending with the last edge of exit route
+        bounds[np.isin(
+            csr.route_edges[csr.route_offsets[1:] - 1], [exit_route.edge_list[-1].internal_id for exit_route in exit_routes]
+        )] = 0
+        return bounds.tolist()
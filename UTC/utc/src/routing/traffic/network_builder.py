@@ -2,14 +2,23 @@ from utc.src.routing.base.traffic_problem import TrafficProblem, ControlledVehic
 from utc.src.routing.routing_options import NetworkBuilderOptions
 from utc.src.routing.traffic.cache import Cache
 from utc.src.graph import Graph, RoadNetwork, Route, Junction, Edge
+from utc.src.graph.network import RouteCosts
 from utc.src.clustering.similarity.similarity_clustering import SimilarityClustering
-from typing import Optional, List, Dict, Set, FrozenSet
+from multiprocessing import get_context, get_all_start_methods
+from multiprocessing.pool import Pool
+from typing import Optional, List, Dict, Set, FrozenSet, Tuple
+import numpy as np
+import atexit
+import time
 
 
 class NetworkBuilder:
     """
     Class simplifying and build road network for routing solvers
     """
+    # Builder of worker process (snapshot of main process builder and its network, inherited by fork)
+    WORKER: Optional['NetworkBuilder'] = None
+
     def __init__(self, graph: Graph, options: NetworkBuilderOptions):
         """
         :param graph: on which re-routing takes place
@@ -22,7 +31,14 @@ class NetworkBuilder:
             None if options.dbscan is None else
             SimilarityClustering(options.dbscan)
         )
-        self.cache: Cache = Cache(options.cache_size)  # Memory of previously constructed sub-graphs
+        # Memory of previously constructed sub-graphs
+        self.cache: Cache = Cache(options.cache_size, options.cache_policy, options.cache_memory)
+        self.pool: Optional[Pool] = None  # Persistent worker processes (started on demand)
+        self.pool_epoch: int = -1  # Epoch of travel times shared with worker processes
+        # Travel times of edges and their epoch, shared with worker processes searching by travel time
+        self.shared_times = None
+        self.shared_epoch = None
+        self.cache_epoch: int = -1  # Epoch of travel times, by which cached sub-graphs were found
 
     # ------------------------------------------ Network construction ------------------------------------------
 
@@ -38,17 +54,25 @@ class NetworkBuilder:
         if not problem.vehicles:
             print("Invalid vehicles, mapping is empty, cannot construct road network!")
             return False
+        self.check_cache()
         edges: Set[int] = set()
+        vehicles: List[ControlledVehicle] = [
+            vehicle for vehicle in problem.vehicles.values() if self.check_route(vehicle, problem.info.vehicle_info)
+        ]
+        # Sub-graphs missing in cache are generated by worker processes first
+        if self.simplifies() and self.options.processes > 1:
+            self.generate_graphs(vehicles, problem.info.vehicle_info)
         # For all vehicle generate corresponding sub-graph (all found edges)
-        for vehicle in problem.vehicles.values():
-            sub_graph : Optional[FrozenSet[int]] = self.generate_graph(vehicle, problem.info.vehicle_info)
+        for vehicle in vehicles:
+            sub_graph : Optional[FrozenSet[int]] = self.generate_graph(vehicle, problem.info.vehicle_info, False)
             if sub_graph is not None:
                 edges |= sub_graph
                 problem.sub_graphs[vehicle.id] = sub_graph
         # TODO Check if all simplification is turned off (parameter)
-        if self.options.topka is not None:
+        if self.simplifies():
             problem.info.vehicle_info.scheduled = len(problem.sub_graphs)
             print(f"Built sub-graphs for {len(problem.sub_graphs)}/{len(problem.vehicles)} vehicles")
+            print(f"Cache statistics: {self.get_cache_stats()}")
             if edges: # Combine parts to build graph (allowed-subgraph unique to vehicle)
                 problem.network = self.graph.sub_graph.create_sub_graph(self.graph.road_network.get_edges(edges))
         else: # Simplifying is turned off, use whole network
@@ -57,48 +81,239 @@ class NetworkBuilder:
 
     # ------------------------------------------ Route generation ------------------------------------------
 
-    def generate_graph(self, vehicle: ControlledVehicle, info: VehicleInfo) -> Optional[FrozenSet[int]]:
+    def generate_graph(
+            self, vehicle: ControlledVehicle, info: VehicleInfo, check: bool = True
+        ) -> Optional[FrozenSet[int]]:
         """
         :param vehicle: class holding attributes of vehicle
         :param info: information about vehicles
+        :param check: if route of vehicle should be checked (default True)
         :return: Subgraph as set of edge (internal) id's forming it
         """
         # Check if vehicle has valid route
-        if not self.check_route(vehicle, info):
+        if check and not self.check_route(vehicle, info):
             return None
         edges: List[Edge] = self.graph.road_network.get_edges(
             vehicle.route.get_segment_edges(vehicle.route.get_current_segment())
         )
         # Check if we already generated such sub-graph, if yes return it (can be also 'None')
-        if self.cache.has_mapping(edges[0].internal_id, edges[-1].internal_id):
+        if self.cache.lookup(edges[0].internal_id, edges[-1].internal_id):
             # print(f"Mapping for vehicle exists ...")
             return self.cache.get_mapping(edges[0].internal_id, edges[-1].internal_id)
         # # Extract second (i.e. we start on the edge) and ending junctions of route
         # start_junction: Junction = self.graph.road_network.get_junction(edges[0].to_junction)
         # end_junction: Junction = self.graph.road_network.get_junction(edges[-1].to_junction)
-        # Apply TopKA*
-        if self.options.topka is not None:
-            # Find routes
-            routes: List[Route] = self.graph.path_finder.top_k_a_star2(
-                edges[0].id, edges[-1].id,
-                c=self.options.topka.c, k=self.options.topka.k
+        # Apply TopKA* (or other generator of alternative routes)
+        if self.simplifies():
+            now: float = time.perf_counter()
+            sub_graph: Optional[FrozenSet[int]] = self.find_graph(edges[0].id, edges[-1].id)
+            return self.save_graph(
+                edges[0].internal_id, edges[-1].internal_id, sub_graph, info, time.perf_counter() - now
             )
-            # Invalid routes, or only shortest path was found
-            if routes is None or not routes or len(routes) == 1:
-                # print(f"TopKA* did not find any alternative routes for vehicle: {vehicle.id}")
-                info.invalid_route += 1
-                self.cache.invalid.add((edges[0].internal_id, edges[-1].internal_id))
-                return None
-            # Apply clustering on routes
-            if self.sim_clustering is not None:
-                indexes: Optional[List[int]] = self.sim_clustering.calculate(routes)
-                if indexes is not None and indexes:
-                    # print(f"Applied DBSCAN on routes ...")
-                    routes = [routes[index] for index in indexes]
-            return self.cache.save_mapping(edges[0].internal_id, edges[-1].internal_id, routes)
         # Other techniques ...
         return None
 
+    def generate_graphs(self, vehicles: List[ControlledVehicle], info: VehicleInfo) -> None:
+        """
+        Generates sub-graphs missing in cache by worker processes (each pair of edges is computed once),
+        results are saved to cache in order of vehicles, same as by sequential generation (i.e.
+        the result does not depend on the number of processes). Sub-graphs are saved as pending,
+        so that statistics of cache are also the same as by sequential generation (unless the cache
+        overflows within one window, then sub-graphs are evicted earlier).
+
+        :param vehicles: with checked routes
+        :param info: information about vehicles
+        :return: None
+        """
+        # Pairs of starting and ending edges (ID's) missing in cache
+        pairs: Dict[Tuple[int, int], Tuple[str, str]] = {}
+        for vehicle in vehicles:
+            edges: List[str] = vehicle.route.get_segment_edges(vehicle.route.get_current_segment())
+            in_edge, out_edge = self.graph.road_network.get_edges([edges[0], edges[-1]])
+            if not self.cache.has_mapping(in_edge.internal_id, out_edge.internal_id):
+                pairs.setdefault((in_edge.internal_id, out_edge.internal_id), (edges[0], edges[-1]))
+        if len(pairs) < 2 or self.get_pool() is None:
+            return
+        self.share_travel_time()
+        print(f"Generating {len(pairs)} sub-graphs with {self.options.processes} processes")
+        results: List[Tuple[Optional[FrozenSet[int]], float]] = self.pool.map(
+            NetworkBuilder.find_in_worker, pairs.values()
+        )
+        for (in_edge, out_edge), (sub_graph, duration) in zip(pairs, results):
+            self.save_graph(in_edge, out_edge, sub_graph, info, duration, True)
+
+    def find_graph(self, in_edge: str, out_edge: str) -> Optional[FrozenSet[int]]:
+        """
+        :param in_edge: starting edge (ID)
+        :param out_edge: ending edge (ID)
+        :return: Set of edge (internal) id's of routes found by generator of alternative routes if it is set,
+        otherwise by TopKA* (optionally clustered), None if alternative routes do not exist
+        """
+        # Find routes (generators of alternative routes produce small set of diverse routes, without clustering)
+        if self.options.alternatives is not None:
+            routes: Optional[List[Route]] = self.graph.alternatives.find_routes(
+                self.options.alternatives.generator, in_edge, out_edge,
+                count=self.options.alternatives.count, c=self.options.alternatives.c,
+                overlap=self.options.alternatives.overlap, penalty=self.options.alternatives.penalty
+            )
+        else:
+            routes: Optional[List[Route]] = self.graph.path_finder.top_k_a_star2(
+                in_edge, out_edge, c=self.options.topka.c, k=self.options.topka.k,
+                heuristic=self.options.topka.heuristic, metric=self.options.topka.metric
+            )
+        # Invalid routes, or only shortest path was found
+        if routes is None or not routes or len(routes) == 1:
+            return None
+        # Apply clustering on routes
+        if self.sim_clustering is not None and self.options.alternatives is None:
+            indexes: Optional[List[int]] = self.sim_clustering.calculate(routes)
+            if indexes is not None and indexes:
+                # print(f"Applied DBSCAN on routes ...")
+                routes = [routes[index] for index in indexes]
+        return frozenset([edge_id for route in routes for edge_id in route.get_edge_ids(True)])
+
+    def save_graph(
+            self, in_edge: int, out_edge: int, sub_graph: Optional[FrozenSet[int]],
+            info: VehicleInfo, duration: float = 0., pending: bool = False
+        ) -> Optional[FrozenSet[int]]:
+        """
+        :param in_edge: starting edge (internal ID)
+        :param out_edge: ending edge (internal ID)
+        :param sub_graph: found by TopKA* (None if there are no alternative routes)
+        :param info: information about vehicles
+        :param duration: of sub-graph generation (seconds), default 0
+        :param pending: if sub-graph was generated in advance (by worker process), default False
+        :return: Sub-graph saved in cache, None if it is invalid
+        """
+        if sub_graph is None:
+            # print(f"TopKA* did not find any alternative routes for vehicle: {vehicle.id}")
+            info.invalid_route += 1
+        return self.cache.save_sub_graph(in_edge, out_edge, sub_graph, cost=duration, pending=pending)
+
+    def check_cache(self) -> None:
+        """
+        Clears cache, if sub-graphs are found by travel time and travel times changed since they were found
+
+        :return: None
+        """
+        epoch: int = self.graph.road_network.get_route_costs().epoch
+        if self.uses_travel_time() and self.cache_epoch != epoch:
+            self.cache.clear()
+            self.cache_epoch = epoch
+
+    def get_cache_stats(self) -> Dict[str, float]:
+        """
+        :return: Statistics of cache of sub-graphs (size, memory in MB, hits, misses, hit rate,
+        evictions and time saved in seconds), used for tuning of 'cache_size'
+        """
+        return self.cache.get_stats()
+
+    def simplifies(self) -> bool:
+        """
+        :return: True if network is simplified to sub-graphs of alternative routes (by TopKA* or other generator)
+        """
+        return self.options.topka is not None or self.options.alternatives is not None
+
+    def uses_travel_time(self) -> bool:
+        """
+        :return: True if TopKA* searches by current travel times (sub-graphs change with them)
+        """
+        return (
+            self.options.alternatives is None and self.options.topka is not None
+            and self.options.topka.metric == "travel_time"
+        )
+
+    # ------------------------------------------ Workers ------------------------------------------
+
+    def get_pool(self) -> Optional[Pool]:
+        """
+        Starts worker processes by fork, so that they share (copy-on-write) the read-only network of builder
+        with its arrays, network must not be changed while the pool is running (otherwise call 'close').
+        Workers searching by travel time receive changed travel times through shared memory.
+
+        :return: Pool of worker processes, None if fork is not supported by platform
+        """
+        if self.pool is None:
+            if "fork" not in get_all_start_methods():
+                print("Unable to start worker processes by fork, generating sub-graphs sequentially!")
+                return None
+            # Build arrays used by TopKA* (or other generator) before fork, so that workers do not compute them
+            if self.options.alternatives is not None:
+                self.graph.alternatives.get_graphs()
+            else:
+                self.graph.road_network.get_corridor(self.options.topka.metric)
+                if self.options.topka.heuristic == "landmarks":
+                    self.graph.road_network.get_landmarks()
+            if self.uses_travel_time():
+                costs: RouteCosts = self.graph.road_network.get_route_costs()
+                self.shared_times = get_context("fork").RawArray("d", len(costs.edge_travel_time))
+                self.shared_epoch = get_context("fork").RawValue("q", costs.epoch)
+                np.frombuffer(self.shared_times)[:] = costs.edge_travel_time
+                self.pool_epoch = costs.epoch
+            self.pool = get_context("fork").Pool(
+                self.options.processes, initializer=NetworkBuilder.init_worker, initargs=(self,)
+            )
+            # Workers are terminated also when interpreter exits without closing builder
+            atexit.register(self.close)
+        return self.pool
+
+    def share_travel_time(self) -> None:
+        """
+        Writes current travel times of edges to memory shared with worker processes (if they changed)
+
+        :return: None
+        """
+        costs: RouteCosts = self.graph.road_network.get_route_costs()
+        if self.shared_times is None or self.pool_epoch == costs.epoch:
+            return
+        np.frombuffer(self.shared_times)[:] = costs.edge_travel_time
+        self.shared_epoch.value = costs.epoch
+        self.pool_epoch = costs.epoch
+
+    def load_travel_time(self) -> None:
+        """
+        Loads travel times shared by main process into network of worker process (if they changed)
+
+        :return: None
+        """
+        if self.shared_times is None or self.pool_epoch == self.shared_epoch.value:
+            return
+        travel_time: np.ndarray = np.frombuffer(self.shared_times)
+        self.graph.road_network.get_route_costs().update_travel_time(range(len(travel_time)), travel_time)
+        self.pool_epoch = self.shared_epoch.value
+
+    def close(self) -> None:
+        """
+        Terminates worker processes (if there are any)
+
+        :return: None
+        """
+        if self.pool is not None:
+            atexit.unregister(self.close)
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+            self.shared_times = self.shared_epoch = None
+
+    @staticmethod
+    def init_worker(builder: 'NetworkBuilder') -> None:
+        """
+        :param builder: of main process (inherited by fork)
+        :return: None
+        """
+        NetworkBuilder.WORKER = builder
+
+    @staticmethod
+    def find_in_worker(pair: Tuple[str, str]) -> Tuple[Optional[FrozenSet[int]], float]:
+        """
+        :param pair: starting and ending edge (ID's)
+        :return: Sub-graph found by builder of worker process, duration of its search (seconds)
+        """
+        NetworkBuilder.WORKER.load_travel_time()
+        now: float = time.perf_counter()
+        sub_graph: Optional[FrozenSet[int]] = NetworkBuilder.WORKER.find_graph(*pair)
+        return sub_graph, time.perf_counter() - now
+
     def check_route(self, vehicle: ControlledVehicle, info: VehicleInfo) -> bool:
         """
         :param vehicle: class representing vehicle
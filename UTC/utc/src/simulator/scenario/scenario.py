@@ -16,12 +16,15 @@ class Scenario:
     Items denoted as '*' are optional, all scenarios are located in '/data/scenarios'
     directory (scenario name is used as name space for all its associated files).
     """
-    def __init__(self, scenario_name: str, create_new: bool = False):
+    def __init__(self, scenario_name: str, create_new: bool = False, stream: bool = False):
         """
         :param scenario_name: name of scenario folder
         :param create_new: if new scenario should be created (only non-optional dirs will be created)
+        :param stream: True if routes and vehicles of existing scenario should be read element by element
+        (without keeping them in memory, files cannot be modified), default False
         """
         self.name: str = scenario_name
+        self.stream: bool = stream
         self.scenario_dir: Optional[ScenarioDir] = None
         # Main files associated with scenarios (can have multiple, but at least these must always be present)
         self.config_file: Optional[SumoConfigFile] = None
@@ -44,8 +47,8 @@ class Scenario:
             self.vehicles_file = SumoVehiclesFile(FilePaths.XmlTemplates.SUMO_VEHICLE)
         else:  # Load existing (have to exist)
             self.config_file = SumoConfigFile(FilePaths.SCENARIO_CONFIG.format(self.name, self.name))
-            self.routes_file = SumoRoutesFile(FilePaths.SCENARIO_ROUTES.format(self.name, self.name))
-            self.vehicles_file = SumoVehiclesFile(FilePaths.SCENARIO_VEHICLES.format(self.name, self.name))
+            self.routes_file = SumoRoutesFile(FilePaths.SCENARIO_ROUTES.format(self.name, self.name), self.stream)
+            self.vehicles_file = SumoVehiclesFile(FilePaths.SCENARIO_VEHICLES.format(self.name, self.name), self.stream)
 
     def save(self, road_network: str, with_directory: bool = True) -> bool:
         """
@@ -5,6 +5,7 @@ from typing import Dict
 class Vehicle(XmlObject):
     """ Class representing vehicle for SUMO """
     # https://sumo.dlr.de/docs/Definition_of_Vehicles%2C_Vehicle_Types%2C_and_Routes.html
+    __slots__ = ()
     _counter: int = 0  # Variable serving to count number of class instances (to assign id's to vehicles)
 
     def __init__(self, attributes: Dict[str, str], internal_id: int = -1):
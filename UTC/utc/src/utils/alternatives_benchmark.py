@@ -0,0 +1,93 @@
+from utc.src.graph import Graph, RoadNetwork, Route
+from utc.src.graph.modules import Alternatives
+from typing import List, Optional, Tuple, Dict
+import contextlib
+import random
+import time
+import io
+
+
+def diversity(routes: List[Route]) -> float:
+    """
+    :param routes: found between the same edges
+    :return: Mean of (1 - shared length / length of union) over pairs of routes, 0 for single route
+    """
+    if len(routes) < 2:
+        return 0.
+    edges: List[Dict[str, float]] = [{edge.id: edge.length for edge in route.edge_list} for route in routes]
+    distances: List[float] = []
+    for i in range(len(edges)):
+        for j in range(i + 1, len(edges)):
+            shared: float = sum(length for edge_id, length in edges[i].items() if edge_id in edges[j])
+            union: float = sum(edges[i].values()) + sum(edges[j].values()) - shared
+            distances.append(1 - shared / union)
+    return sum(distances) / len(distances)
+
+
+def generator_stats(
+        graph: Graph, generator: str, pairs: List[Tuple[str, str]], c: float, k: int, count: int
+    ) -> Tuple[float, float, float, float]:
+    """
+    :param graph: on which routes are generated
+    :param generator: of routes ('topka' or generator of Alternatives module)
+    :param pairs: of starting and goal edges
+    :param c: multiplier of the shortest path length (maximal length of routes)
+    :param k: limit of routes found by TopKA*
+    :param count: maximal number of routes of other generators
+    :return: Mean number of routes, mean sub-graph size (edges), mean diversity and mean time per pair (seconds)
+    """
+    routes_count, size, total_diversity, found = 0, 0, 0., 0
+    now: float = time.perf_counter()
+    for start, goal in pairs:
+        with contextlib.redirect_stdout(io.StringIO()):
+            if generator == "topka":
+                routes: Optional[List[Route]] = graph.path_finder.top_k_a_star2(start, goal, c, k)
+            else:
+                routes: Optional[List[Route]] = graph.alternatives.find_routes(generator, start, goal, count, c)
+        if routes is None:
+            continue
+        found += 1
+        routes_count += len(routes)
+        size += len({edge.id for route in routes for edge in route.edge_list})
+        total_diversity += diversity(routes)
+    elapsed: float = time.perf_counter() - now
+    found = max(found, 1)
+    return routes_count / found, size / found, total_diversity / found, elapsed / max(len(pairs), 1)
+
+
+def alternatives_benchmark(
+        networks: List[str], pairs: int = 20, c: float = 1.3,
+        k: int = 100, count: int = 5, seed: int = 42
+    ) -> None:
+    """
+    Prints comparison of TopKA* with generators of alternative routes (mean number of routes,
+    sub-graph size, diversity and runtime) on random pairs of edges
+
+    :param networks: names of networks (from utc/data/maps/sumo)
+    :param pairs: number of random pairs of edges, default 20
+    :param c: multiplier of the shortest path length, default 1.3
+    :param k: limit of routes found by TopKA*, default 100
+    :param count: maximal number of routes of other generators, default 5
+    :param seed: of random generator, default 42
+    :return: None
+    """
+    print(f"{'network':<15} {'generator':<10} {'routes':>7} {'edges':>7} {'diversity':>10} {'time (ms)':>10}")
+    for network in networks:
+        graph: Graph = Graph(RoadNetwork())
+        assert (graph.loader.load_map(network))
+        edges: List[str] = sorted(graph.road_network.edges.keys())
+        generator: random.Random = random.Random(seed)
+        edge_pairs: List[Tuple[str, str]] = [
+            (generator.choice(edges), generator.choice(edges)) for _ in range(pairs)
+        ]
+        for name in ("topka",) + Alternatives.GENERATORS:
+            routes_count, size, route_diversity, elapsed = generator_stats(graph, name, edge_pairs, c, k, count)
+            print(
+                f"{network:<15} {name:<10} {round(routes_count, 2):>7} {round(size, 1):>7} "
+                f"{round(route_diversity, 3):>10} {round(elapsed * 1000, 2):>10}"
+            )
+    return
+
+
+if __name__ == "__main__":
+    alternatives_benchmark(["DCC_central", "Dublin", "Sydney", "lust_central"])
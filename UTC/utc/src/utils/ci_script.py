@@ -168,10 +168,12 @@ class PddlNetwork:
         vehicles: Dict[str, List[str]] = self.parse_result(result_file)
         if vehicles is None or not vehicles:
             return False
-        for vehicle, routes in vehicles.items():
-            edges = network.get_edges([int(route_id[1:]) for route_id in routes])
-            if None in edges or not network.check_edge_sequence(edges):
-                print(f"Error at vehicle: {vehicle}, routes: {routes}")
+        valid, first_invalid = network.check_edge_sequences(
+            [[int(route_id[1:]) for route_id in routes] for routes in vehicles.values()]
+        )
+        for (vehicle, routes), is_valid, index in zip(vehicles.items(), valid.tolist(), first_invalid.tolist()):
+            if not is_valid:
+                print(f"Error at vehicle: {vehicle}, routes: {routes}, at index: {index}")
                 return False
         return True
 
@@ -0,0 +1,101 @@
+from utc.src.graph import Graph, RoadNetwork
+from utc.src.graph.network import CsrGraph, RouteCosts, DynamicTree
+from utc.src.constants.file_system.file_types.dump_file import DumpFile
+import numpy as np
+from typing import List, Optional, Tuple, Iterator
+import contextlib
+import time
+import io
+
+
+def dump_trace(network: RoadNetwork, dump_file: DumpFile) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    :param network: road network
+    :param dump_file: edge data dump (".out.xml") recorded by simulation of scenario
+    :return: Generator of internal id's of edges and their travel times (for each interval of dump)
+    """
+    csr: CsrGraph = network.get_csr()
+    for interval in dump_file.root.findall("interval"):
+        values: List[Tuple[int, float]] = [
+            (csr.edge_index[edge.attrib["id"]], float(edge.attrib["traveltime"]))
+            for edge in interval.findall("edge") if edge.attrib["id"] in csr.edge_index and "traveltime" in edge.attrib
+        ]
+        if values:
+            yield np.array([index for index, _ in values]), np.array([value for _, value in values])
+
+
+def random_trace(
+        network: RoadNetwork, windows: int, fraction: float, seed: int
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    :param network: road network
+    :param windows: number of traffic windows
+    :param fraction: of edges whose travel time changes in each window
+    :param seed: of random generator
+    :return: Generator of internal id's of edges and their travel times (congestion of up to 3x free-flow time)
+    """
+    csr: CsrGraph = network.get_csr()
+    costs: RouteCosts = network.get_route_costs()
+    generator: np.random.Generator = np.random.default_rng(seed)
+    edges: np.ndarray = np.flatnonzero(csr.edge_mask)
+    for _ in range(windows):
+        changed: np.ndarray = generator.choice(edges, max(int(len(edges) * fraction), 1), replace=False)
+        yield changed, costs.edge_free_flow[changed] * generator.uniform(1, 3, len(changed))
+
+
+def dynamic_benchmark(
+        networks: List[str], dump_path: Optional[str] = None, roots: int = 20,
+        windows: int = 20, fraction: float = 0.05, seed: int = 42
+    ) -> None:
+    """
+    Prints comparison of repairing shortest path trees (forward and reversed) with their full recomputation,
+    after each change of travel times (from edge data dump, or random if dump is not given)
+
+    :param networks: names of networks (from utc/data/maps/sumo)
+    :param dump_path: path to edge data dump of scenario (on the first network), default None (random trace)
+    :param roots: number of random roots of trees, default 20
+    :param windows: number of traffic windows of random trace, default 20
+    :param fraction: of edges changed in each window of random trace, default 0.05
+    :param seed: of random generator, default 42
+    :return: None
+    """
+    print(f"{'network':<15} {'windows':>8} {'settled (repair/full)':>22} {'time (repair/full) ms':>22} {'speedup':>8}")
+    for network_name in networks:
+        graph: Graph = Graph(RoadNetwork())
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert (graph.loader.load_map(network_name))
+        network: RoadNetwork = graph.road_network
+        csr: CsrGraph = network.get_csr()
+        costs: RouteCosts = network.get_route_costs()
+        generator: np.random.Generator = np.random.default_rng(seed)
+        trees: List[DynamicTree] = [
+            DynamicTree(csr, costs, root, reverse)
+            for root in generator.choice(np.flatnonzero(csr.route_mask), roots, replace=False).tolist()
+            for reverse in (False, True)
+        ]
+        if dump_path is not None and network_name == networks[0]:
+            dump_file: DumpFile = DumpFile(dump_path)
+            assert (dump_file.is_loaded())
+            trace: Iterator[Tuple[np.ndarray, np.ndarray]] = dump_trace(network, dump_file)
+        else:
+            trace = random_trace(network, windows, fraction, seed)
+        counts, repair_settled, full_settled, repair_time, full_time = 0, 0, 0, 0., 0.
+        for edge_indexes, travel_times in trace:
+            counts += 1
+            costs.update_travel_time(edge_indexes, travel_times)
+            now: float = time.perf_counter()
+            repair_settled += sum(tree.update() for tree in trees)
+            repair_time += time.perf_counter() - now
+            now = time.perf_counter()
+            full_settled += sum(DynamicTree(csr, costs, tree.root, tree.reverse).settled for tree in trees)
+            full_time += time.perf_counter() - now
+        print(
+            f"{network_name:<15} {counts:>8} {f'{repair_settled}/{full_settled}':>22} "
+            f"{f'{round(repair_time * 1000, 1)}/{round(full_time * 1000, 1)}':>22} "
+            f"{round(full_time / max(repair_time, 1e-9), 2):>8}"
+        )
+    return
+
+
+if __name__ == "__main__":
+    dynamic_benchmark(["DCC_central", "Dublin", "Sydney", "lust_central"])
@@ -1,7 +1,9 @@
 from utc.src.graph import Graph, RoadNetwork
+from utc.src.graph.network import RouteProjection
 from utc.src.simulator.scenario import Scenario
 from utc.src.utils.vehicle_extractor import VehicleExtractor, VehicleEntry
 from xml.etree.ElementTree import Element
+from copy import deepcopy
 from typing import Set, Dict, List
 
 
@@ -27,8 +29,8 @@ class GraphFilter:
         :param full_path: True if full path of vehicle should be in new simulation or only path on given network
         :return: True on success, false otherwise
         """
-        # Checks
-        original_scenario: Scenario = Scenario(scenario_name)
+        # Checks (routes and vehicles of original scenario are read in single pass, without keeping them in memory)
+        original_scenario: Scenario = Scenario(scenario_name, stream=True)
         graph: Graph = Graph(RoadNetwork())
         if not original_scenario.exists():
             print(f"Scenario: {scenario_name} does not exist!")
@@ -40,25 +42,19 @@ class GraphFilter:
         # Initialize new scenario
         new_scenario: Scenario = Scenario(new_scenario_name, True)
         routes_mapping: Dict[str, str] = {}
-        for original_route in original_scenario.routes_file.root.findall("route"):
-            sequence, indexes = graph.road_network.get_longest_sequence(original_route.attrib["edges"].split())
+        projection: RouteProjection = RouteProjection(graph.road_network.get_csr())
+        for route_id, edges, (start, end) in projection.project_file(original_scenario.routes_file):
             # Unable to find at any common edges with subgraph, this vehicle does not travel on subgraph
-            if not sequence:
-                continue
-            elif full_path:
-                routes_mapping[original_route.attrib["id"]] = new_scenario.routes_file.add_route(Element("route", {
-                    "id": original_route.attrib["id"],
-                    "edges": original_route.attrib["edges"],
-                }))
+            if start < 0:
                 continue
-            # Save new route with new edges, along with new id of route
-            routes_mapping[original_route.attrib["id"]] = new_scenario.routes_file.add_route(Element("route", {
-                "id": original_route.attrib["id"],
-                "edges": " ".join([edge.id for edge in sequence]),
+            # Save new route with new edges (or full path), along with new id of route
+            routes_mapping[route_id] = new_scenario.routes_file.add_route(Element("route", {
+                "id": route_id, "edges": " ".join(edges if full_path else edges[start:end]),
             }))
         # Change vehicles routes
-        for original_vehicle in original_scenario.vehicles_file.root.findall("vehicle"):
+        for original_vehicle in original_scenario.vehicles_file.get_children({"vehicle"}):
             if original_vehicle.attrib["route"] in routes_mapping:
+                original_vehicle = deepcopy(original_vehicle)  # Elements are cleared after being read
                 original_vehicle.attrib["route"] = routes_mapping[original_vehicle.attrib["route"]]
                 new_scenario.vehicles_file.add_vehicle(original_vehicle)
         return new_scenario.save(original_scenario.config_file.get_network())
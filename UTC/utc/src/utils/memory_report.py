@@ -0,0 +1,50 @@
+from utc.src.graph import Graph, RoadNetwork
+from utc.src.constants.static import DirPaths, FileExtension
+from utc.src.constants.file_system.my_file import MyFile
+from typing import List, Tuple
+import tracemalloc
+import time
+import os
+
+
+def network_memory(network: str, snapshot: bool = False) -> Tuple[int, int, float]:
+    """
+    :param network: name of network (from utc/data/maps/sumo)
+    :param snapshot: True if network should be loaded from snapshot, default False
+    :return: Memory held by loaded network (bytes), peak memory during loading (bytes), loading time (seconds)
+    """
+    graph: Graph = Graph(RoadNetwork())
+    tracemalloc.start()
+    now: float = time.perf_counter()
+    assert (graph.loader.load_map(network, snapshot=snapshot))
+    loading_time: float = time.perf_counter() - now
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, peak, loading_time
+
+
+def memory_report(networks: List[str], snapshot: bool = False) -> None:
+    """
+    Prints memory held by loaded road networks (measured by tracemalloc)
+
+    :param networks: names of networks (from utc/data/maps/sumo)
+    :param snapshot: True if networks should be loaded from snapshot, default False
+    :return: None
+    """
+    print(f"{'network':<20} {'edges':>6} {'network (MB)':>13} {'peak (MB)':>10} {'time (s)':>9}")
+    for network in networks:
+        current, peak, loading_time = network_memory(network, snapshot)
+        graph: Graph = Graph(RoadNetwork())
+        assert (graph.loader.load_map(network))
+        print(
+            f"{network:<20} {len(graph.road_network.edges):>6} {round(current / 2**20, 2):>13} "
+            f"{round(peak / 2**20, 2):>10} {round(loading_time, 3):>9}"
+        )
+    return
+
+
+if __name__ == "__main__":
+    memory_report(sorted(
+        MyFile.get_file_name(file_name) for file_name in os.listdir(DirPaths.MAPS_SUMO)
+        if file_name.endswith(FileExtension.SUMO_NETWORK)
+    ))
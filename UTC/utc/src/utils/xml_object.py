@@ -4,6 +4,8 @@ from typing import Dict, Union, Any
 
 class XmlObject:
     """ Class representing xml objects """
+    __slots__ = ("tag", "id", "internal_id", "attributes")
+
     def __init__(self, tag: str, identifier: str, internal_id: int, attributes: Dict[str, str] = None):
         """
         :param tag: name of object
@@ -1,5 +1,6 @@
 from utc.test.cases.converter_test import ConverterTest
 from utc.test.cases.graph_test import GraphTest
+from utc.test.cases.path_finder_test import PathFinderTest
 from utc.test.cases.pddl_test import PddlTest
 from utc.test.cases.simulator_test import SimulatorTest
 
@@ -0,0 +1,110 @@
+import unittest
+import contextlib
+import io
+from utc.src.routing.traffic.cache import Cache
+from typing import FrozenSet
+
+
+class CacheTest(unittest.TestCase):
+    """ Test eviction policies, limits and statistics of cache of sub-graphs """
+
+    @staticmethod
+    def sub_graph(index: int, size: int = 10) -> FrozenSet[int]:
+        """
+        :param index: of sub-graph
+        :param size: number of edges of sub-graph
+        :return: Set of edges id's forming sub-graph
+        """
+        return frozenset(range(index * 1000, index * 1000 + size))
+
+    def test_lru(self) -> None:
+        """
+        Checks that the least recently used mapping is evicted
+
+        :return: None
+        """
+        cache: Cache = Cache(3, "lru")
+        for index in range(3):
+            cache.save_sub_graph(index, index, self.sub_graph(index))
+        self.assertTrue(cache.lookup(0, 0))
+        cache.save_sub_graph(3, 3, self.sub_graph(3))
+        self.assertFalse(cache.has_mapping(1, 1))
+        self.assertEqual([key for key in cache._memory], [(2, 2), (0, 0), (3, 3)])
+        cache.save_sub_graph(4, 4, None)  # Invalid mappings are evicted the same way
+        self.assertFalse(cache.has_mapping(2, 2))
+        self.assertEqual((cache.size, cache.evictions), (3, 2))
+
+    def test_lfu(self) -> None:
+        """
+        Checks that the least frequently used mapping is evicted (the least recently used one from ties)
+
+        :return: None
+        """
+        cache: Cache = Cache(3, "lfu")
+        for index in range(3):
+            cache.save_sub_graph(index, index, self.sub_graph(index))
+        for _ in range(2):
+            cache.lookup(0, 0)
+        cache.lookup(1, 1)
+        cache.save_sub_graph(3, 3, self.sub_graph(3))
+        self.assertFalse(cache.has_mapping(2, 2))
+        cache.save_sub_graph(4, 4, self.sub_graph(4))
+        self.assertFalse(cache.has_mapping(3, 3))
+        cache.lookup(4, 4)
+        cache.lookup(4, 4)
+        cache.save_sub_graph(5, 5, self.sub_graph(5))
+        # Mappings (1, 1) and (4, 4) were both used twice, (1, 1) was used earlier
+        self.assertFalse(cache.has_mapping(1, 1))
+        self.assertEqual(sorted(cache._memory), [(0, 0), (4, 4), (5, 5)])
+        self.assertEqual(sorted(cache._uses), sorted(cache._memory))
+
+    def test_memory(self) -> None:
+        """
+        Checks that estimated memory of sub-graphs stays within limit
+
+        :return: None
+        """
+        memory: int = Cache.get_memory(self.sub_graph(0, 100))
+        cache: Cache = Cache(100, "lru", max_memory=2.5 * memory / 2**20)
+        for index in range(5):
+            cache.save_sub_graph(index, index, self.sub_graph(index, 100))
+            self.assertLessEqual(cache.memory, 2.5 * memory)
+        self.assertEqual(sorted(cache._memory), [(3, 3), (4, 4)])
+        self.assertEqual((cache.memory, cache.evictions), (2 * memory, 3))
+        cache.remove((3, 3))
+        self.assertEqual((cache.size, cache.memory), (1, memory))
+
+    def test_statistics(self) -> None:
+        """
+        Checks counters of hits, misses, evictions and time saved
+
+        :return: None
+        """
+        cache: Cache = Cache(2, "lru")
+        self.assertFalse(cache.lookup(0, 0))
+        cache.save_sub_graph(0, 0, self.sub_graph(0), cost=1.5)
+        self.assertTrue(cache.lookup(0, 0))
+        self.assertTrue(cache.lookup(0, 0))
+        # Mapping generated in advance is counted as miss by its first request
+        cache.save_sub_graph(1, 1, None, cost=0.5, pending=True)
+        self.assertTrue(cache.lookup(1, 1))
+        self.assertTrue(cache.lookup(1, 1))
+        self.assertIsNone(cache.get_mapping(1, 1))
+        # Rejected mapping does not change cache
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertIsNone(cache.save_sub_graph(0, 0, self.sub_graph(5)))
+        self.assertEqual(cache.get_mapping(0, 0), self.sub_graph(0))
+        cache.save_sub_graph(2, 2, self.sub_graph(2))
+        self.assertEqual(cache.get_stats(), {
+            "size": 2, "memory": round((Cache.get_memory(self.sub_graph(2))) / 2**20, 3), "hits": 3, "misses": 2,
+            "hit_rate": 0.6, "evictions": 1, "time_saved": 3.5
+        })
+        # Bookkeeping of evicted mappings is removed
+        for index in range(3, 100):
+            cache.save_sub_graph(index, index, None, cost=1.0, pending=True)
+        self.assertEqual(len(cache._costs) + len(cache._uses), 4)
+        self.assertLessEqual(len(cache.pending), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
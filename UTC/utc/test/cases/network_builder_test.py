@@ -0,0 +1,114 @@
+import unittest
+import contextlib
+import io
+import random
+import numpy as np
+from utc.src.graph import Graph, RoadNetwork, Route
+from utc.src.graph.graph_options import TopkaOptions
+from utc.src.graph.network import RouteCosts
+from utc.src.simulator.vehicle import Vehicle
+from utc.src.routing.base.controlled_vehicle import ControlledVehicle, Segment
+from utc.src.routing.base.traffic_problem import TrafficProblem
+from utc.src.routing.routing_options import NetworkBuilderOptions
+from utc.src.routing.traffic.network_builder import NetworkBuilder
+from typing import List, Optional
+
+
+def worker_travel_time() -> np.ndarray:
+    """
+    :return: Travel times of edges seen by worker process (after loading those shared by main process)
+    """
+    NetworkBuilder.WORKER.load_travel_time()
+    return NetworkBuilder.WORKER.graph.road_network.get_route_costs().edge_travel_time
+
+
+class NetworkBuilderTest(unittest.TestCase):
+    """ Test that sub-graphs built by worker processes are the same as sub-graphs built sequentially """
+    MAP: str = "lust_central"
+    SEGMENTS: int = 40
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.graph: Graph = Graph(RoadNetwork())
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert (cls.graph.loader.load_map(cls.MAP))
+        random.seed(11)
+        edges: List[str] = sorted(cls.graph.road_network.edges.keys())
+        cls.segments: List[List[str]] = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            while len(cls.segments) < cls.SEGMENTS:
+                route: Optional[Route] = cls.graph.path_finder.a_star2(random.choice(edges), random.choice(edges))[1]
+                if route is not None and len(route.edge_list) >= 3:
+                    cls.segments.append([edge.id for edge in route.edge_list])
+
+    def create_problem(self, name: str, segments: List[List[str]]) -> TrafficProblem:
+        """
+        :param name: of problem
+        :param segments: edges of vehicle routes (each forms single segment)
+        :return: Traffic problem with vehicles driving over segments
+        """
+        vehicles: List[ControlledVehicle] = []
+        for index, edges in enumerate(segments):
+            vehicle: ControlledVehicle = ControlledVehicle(Vehicle({"id": str(index), "route": f"r{index}"}, index), edges)
+            vehicle.route.segments.append(Segment(0, len(edges)))
+            vehicle.route.segments[0].eta = 10
+            vehicles.append(vehicle)
+        return TrafficProblem(name, vehicles)
+
+    def test_processes(self) -> None:
+        """
+        Compares sub-graphs and cache of builder using 4 worker processes with sequential builder,
+        over windows with changing travel times (TopKA* searches by travel time)
+
+        :return: None
+        """
+        costs: RouteCosts = self.graph.road_network.get_route_costs()
+        self.addCleanup(costs.load_travel_time)
+        edges: np.ndarray = np.flatnonzero(self.graph.road_network.get_csr().edge_mask)
+        results: List[list] = []
+        for processes in (1, 4):
+            costs.load_travel_time()
+            generator: np.random.Generator = np.random.default_rng(3)
+            builder: NetworkBuilder = NetworkBuilder(self.graph, NetworkBuilderOptions(
+                processes=processes, topka=TopkaOptions(c=1.2, k=30, metric="travel_time")
+            ))
+            self.addCleanup(builder.close)
+            result: list = []
+            for window in range(3):
+                changed: np.ndarray = generator.choice(edges, len(edges) // 10, replace=False)
+                costs.update_travel_time(changed, costs.edge_free_flow[changed] * generator.uniform(1, 4, len(changed)))
+                problem: TrafficProblem = self.create_problem(str(window), self.segments[window * 10:window * 10 + 20])
+                with contextlib.redirect_stdout(io.StringIO()):
+                    self.assertTrue(builder.build_network(problem))
+                result.append((
+                    problem.sub_graphs, vars(problem.info.vehicle_info),
+                    list(builder.cache._memory.items()), builder.get_cache_stats()["hits"]
+                ))
+            builder.close()
+            results.append(result)
+        self.assertTrue(any(sub_graphs for sub_graphs, *_ in results[0]))
+        self.assertEqual(results[0], results[1])
+
+    def test_shared_travel_time(self) -> None:
+        """
+        Checks that worker processes see travel times changed after they were started
+
+        :return: None
+        """
+        costs: RouteCosts = self.graph.road_network.get_route_costs()
+        self.addCleanup(costs.load_travel_time)
+        builder: NetworkBuilder = NetworkBuilder(self.graph, NetworkBuilderOptions(
+            processes=2, topka=TopkaOptions(c=1.2, k=30, metric="travel_time")
+        ))
+        self.addCleanup(builder.close)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertIsNotNone(builder.get_pool())
+        np.testing.assert_array_equal(builder.pool.apply(worker_travel_time), costs.edge_travel_time)
+        costs.update_travel_time(range(len(costs.edge_travel_time)), costs.edge_free_flow * 2)
+        builder.share_travel_time()
+        for travel_time in builder.pool.starmap(worker_travel_time, [()] * 4):
+            np.testing.assert_array_equal(travel_time, costs.edge_free_flow * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+import contextlib
+import io
+import random
+from utc.src.graph import Graph, RoadNetwork, Route
+from utc.src.graph.network import NetworkView
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+
+class NetworkOperationsTest(unittest.TestCase):
+    """ Test set operations on overlapping regions of network (views of the same network, or different networks) """
+    MAP: str = "lust_central"
+    OPERATIONS: Dict[str, Callable[[Set[str], Set[str]], Set[str]]] = {
+        "intersection": lambda first, second: first & second,
+        "union": lambda first, second: first | second,
+        "difference": lambda first, second: first ^ second,
+    }
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.graph: Graph = Graph(RoadNetwork())
+        cls.other_graph: Graph = Graph(RoadNetwork())
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert (cls.graph.loader.load_map(cls.MAP) and cls.other_graph.loader.load_map(cls.MAP))
+        positions: List[Tuple[float, float]] = [
+            junction.get_position() for junction in cls.graph.road_network.junctions.values()
+        ]
+        x_min, y_min = min(x for x, _ in positions), min(y for _, y in positions)
+        x_max, y_max = max(x for x, _ in positions), max(y for _, y in positions)
+        width: float = x_max - x_min
+        # Left and right region overlap in the middle of network, right region is also created from other network
+        with contextlib.redirect_stdout(io.StringIO()):
+            cls.left: RoadNetwork = cls.graph.sub_graph.create_box_region(x_min, y_min, x_min + 0.6 * width, y_max)
+            cls.right: RoadNetwork = cls.graph.sub_graph.create_box_region(x_min + 0.4 * width, y_min, x_max, y_max)
+            cls.other_right: RoadNetwork = cls.other_graph.sub_graph.create_box_region(
+                x_min + 0.4 * width, y_min, x_max, y_max
+            )
+        # Routes crossing boundary of regions (from left part to right part)
+        random.seed(3)
+        left_edges: List[str] = sorted(cls.left.edges.keys() - cls.right.edges.keys())
+        right_edges: List[str] = sorted(cls.right.edges.keys() - cls.left.edges.keys())
+        cls.routes: List[List[str]] = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            while len(cls.routes) < 30:
+                route: Optional[Route] = cls.graph.path_finder.a_star2(
+                    random.choice(left_edges), random.choice(right_edges)
+                )[1]
+                if route is not None:
+                    cls.routes.append([edge.id for edge in route.edge_list])
+
+    def get_expected(self, operation: str) -> Tuple[Set[str], Set[str]]:
+        """
+        :param operation: name of set operation
+        :return: Id's of junctions and edges of resulting network (edges are kept only if both junctions are kept)
+        """
+        junctions: Set[str] = self.OPERATIONS[operation](set(self.left.junctions), set(self.right.junctions))
+        # Difference removes common junctions, edges are joined
+        edges: Set[str] = self.OPERATIONS["union" if operation == "difference" else operation](
+            set(self.left.edges), set(self.right.edges)
+        )
+        network: RoadNetwork = self.graph.road_network
+        return junctions, {
+            edge_id for edge_id in edges if
+            network.get_edge(edge_id).from_junction in junctions and network.get_edge(edge_id).to_junction in junctions
+        }
+
+    def check_operation(self, operation: str, other: RoadNetwork) -> RoadNetwork:
+        """
+        :param operation: name of set operation
+        :param other: right region (view of the same network as left region, or of other network)
+        :return: Network resulting from operation on left and given right region
+        """
+        with contextlib.redirect_stdout(io.StringIO()):
+            result: Optional[RoadNetwork] = getattr(self.left, operation)(other)
+        self.assertIsNotNone(result, operation)
+        junctions, edges = self.get_expected(operation)
+        self.assertEqual(result.junctions.keys(), junctions, operation)
+        self.assertEqual(result.edges.keys(), edges, operation)
+        # Routes crossing boundary are valid only if all of their edges are kept, parts of them always
+        parts: List[List[str]] = []
+        for route in self.routes:
+            missing: List[int] = [index for index, edge_id in enumerate(route) if edge_id not in edges]
+            valid, first = result.check_edge_sequences([route])
+            self.assertEqual((bool(valid[0]), int(first[0])), (not missing, missing[0] if missing else -1), operation)
+            for start, end in zip([-1] + missing, missing + [len(route)]):
+                if end - start > 1:
+                    parts.append(route[start + 1:end])
+        self.assertTrue(parts)
+        self.assertTrue(result.check_edge_sequences(parts)[0].all(), operation)
+        return result
+
+    def test_views(self) -> None:
+        """
+        Checks operations on regions of the same network, which give views of network
+
+        :return: None
+        """
+        for operation in self.OPERATIONS:
+            result: RoadNetwork = self.check_operation(operation, self.right)
+            self.assertIsInstance(result, NetworkView)
+            self.assertIs(result.parent, self.graph.road_network)
+
+    def test_rebuild(self) -> None:
+        """
+        Checks operations on regions of different networks (loaded from the same file), which give new networks,
+        fails on networks with routes of multiple edges
+
+        :return: None
+        """
+        for operation in self.OPERATIONS:
+            result: RoadNetwork = self.check_operation(operation, self.other_right)
+            self.assertNotIsInstance(result, NetworkView)
+            self.assertEqual(result.edge_connections, result.get_edges_connections())
+        # Simplified network has routes of multiple edges
+        simplified: Graph = Graph(RoadNetwork())
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(simplified.loader.load_map(self.MAP) and simplified.simplify.simplify_junctions())
+        self.assertTrue(any(len(route.edge_list) > 1 for route in simplified.road_network.routes.values()))
+        output: io.StringIO = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertIsNone(simplified.road_network.union(self.left))
+        self.assertIn("routes must have exactly one edge", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import unittest
+import contextlib
+import io
+import random
+from utc.src.graph import Graph, RoadNetwork, Route
+from utc.src.graph.network import NetworkView, Junction
+from typing import Dict, List, Optional, Set, Tuple
+
+
+class NetworkViewTest(unittest.TestCase):
+    """ Test that sub-graphs created as views behave as sub-graphs created from copy of network """
+    MAP: str = "Dublin"
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.graph: Graph = Graph(RoadNetwork())
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert (cls.graph.loader.load_map(cls.MAP))
+        positions: List[Tuple[float, float]] = [
+            junction.get_position() for junction in cls.graph.road_network.junctions.values()
+        ]
+        x_min, y_min = min(x for x, _ in positions), min(y for _, y in positions)
+        x_max, y_max = max(x for x, _ in positions), max(y for _, y in positions)
+        cls.box: Tuple[float, float, float, float] = (x_min, y_min, (x_min + x_max) / 2, (y_min + y_max) / 2)
+
+    def create_view(self) -> NetworkView:
+        """
+        :return: View of network (region in lower left quarter of network)
+        """
+        with contextlib.redirect_stdout(io.StringIO()):
+            view: Optional[NetworkView] = self.graph.sub_graph.create_box_region(*self.box)
+        self.assertIsInstance(view, NetworkView)
+        return view
+
+    def create_copy(self, view: RoadNetwork) -> RoadNetwork:
+        """
+        :param view: sub-graph of network
+        :return: Sub-graph with the same junctions and edges, created by removing objects from copy of network
+        """
+        sub_graph: RoadNetwork = RoadNetwork()
+        self.assertTrue(sub_graph.load(self.graph.road_network))
+        with contextlib.redirect_stdout(io.StringIO()):
+            for junction_id in (sub_graph.junctions.keys() - view.junctions.keys()):
+                sub_graph.remove_junction(junction_id)
+            for edge_id in (sub_graph.edges.keys() - view.edges.keys()):
+                sub_graph.remove_edge(edge_id)
+        sub_graph.edge_connections = sub_graph.get_edges_connections()
+        return sub_graph
+
+    @staticmethod
+    def get_connections(network: RoadNetwork) -> Dict[str, Dict[Optional[str], List[str]]]:
+        """
+        :param network: road network
+        :return: Mapping of junction id to connections of junction (given by id's of routes)
+        """
+        return {
+            junction_id: {
+                (None if in_route is None else in_route.id): [out_route.id for out_route in out_routes]
+                for in_route, out_routes in junction.connections.items()
+            } for junction_id, junction in network.junctions.items()
+        }
+
+    def test_parity(self) -> None:
+        """
+        Compares query methods of view with sub-graph created from copy of network
+
+        :return: None
+        """
+        view: NetworkView = self.create_view()
+        expected: RoadNetwork = self.create_copy(view)
+        self.assertTrue(len(view.edges) > 100)
+        self.assertEqual(view.routes.keys(), expected.routes.keys())
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(view == expected)
+        self.assertEqual(self.get_connections(view), self.get_connections(expected))
+        self.assertEqual(view.edge_connections, expected.edge_connections)
+        for edge_id in view.edges:
+            for getter in ("get_in_edge_neighbours", "get_out_edge_neighbours", "get_edge_neighbours"):
+                self.assertEqual(
+                    [edge.id for edge in getattr(view, getter)(edge_id)],
+                    [edge.id for edge in getattr(expected, getter)(edge_id)], (getter, edge_id)
+                )
+        # Routes found in view are the same as in sub-graph
+        random.seed(5)
+        edges: List[str] = sorted(view.edges.keys())
+        view_graph, expected_graph = Graph(view), Graph(expected)
+        for _ in range(50):
+            start, goal = random.choice(edges), random.choice(edges)
+            with contextlib.redirect_stdout(io.StringIO()):
+                route: Optional[Route] = view_graph.path_finder.a_star2(start, goal, "landmarks")[1]
+                other: Optional[Route] = expected_graph.path_finder.a_star2(start, goal, "landmarks")[1]
+            self.assertEqual(route is None, other is None, (start, goal))
+            if route is not None:
+                self.assertTrue(expected.check_edge_sequence(route.edge_list))
+                self.assertAlmostEqual(route.get_length(), other.get_length(), places=3)
+
+    def test_materialize(self) -> None:
+        """
+        Checks that modification of view materializes it, without changing the parent network
+
+        :return: None
+        """
+        network: RoadNetwork = self.graph.road_network
+        view: NetworkView = self.create_view()
+        connections: Dict[str, Dict[Optional[str], List[str]]] = self.get_connections(network)
+        references: Dict[str, int] = {edge_id: edge.references for edge_id, edge in network.edges.items()}
+        edge_id: str = sorted(view.edges.keys())[0]
+        self.assertIs(view.get_edge(edge_id), network.get_edge(edge_id))
+        self.assertFalse(view.is_materialized())
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(view.remove_edge(edge_id))
+        self.assertTrue(view.is_materialized())
+        self.assertFalse(view.edge_exists(edge_id, False))
+        self.assertTrue(network.edge_exists(edge_id, False))
+        # Objects of view are copies, parent network is unchanged
+        for other_id, edge in view.edges.items():
+            self.assertIsNot(edge, network.get_edge(other_id))
+        for route in view.routes.values():
+            self.assertFalse(any(edge.id == edge_id for edge in route.edge_list))
+        self.assertEqual(self.get_connections(network), connections)
+        self.assertEqual({other_id: edge.references for other_id, edge in network.edges.items()}, references)
+
+    def test_filtered_connections(self) -> None:
+        """
+        Checks that junctions of view only reference routes of view, while junctions of parent keep theirs
+
+        :return: None
+        """
+        network: RoadNetwork = self.graph.road_network
+        view: NetworkView = self.create_view()
+        filtered: int = 0
+        for junction_id, junction in view.junctions.items():
+            parent_junction: Junction = network.get_junction(junction_id)
+            self.assertIsNot(junction, parent_junction)
+            routes: Set[Route] = {
+                route for in_route, out_routes in junction.connections.items()
+                for route in out_routes + [in_route] if route is not None
+            }
+            for route in routes:
+                self.assertIs(view.get_route(route.internal_id), route)
+            parent_routes: Set[Route] = {
+                route for in_route, out_routes in parent_junction.connections.items()
+                for route in out_routes + [in_route] if route is not None
+            }
+            self.assertLessEqual(routes, parent_routes)
+            filtered += len(parent_routes - routes)
+        # Junctions on boundary of view lost some of their routes
+        self.assertTrue(filtered > 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
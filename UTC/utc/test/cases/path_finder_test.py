@@ -0,0 +1,339 @@
+import unittest
+import contextlib
+import io
+import random
+import numpy as np
+from utc.src.graph import Graph, RoadNetwork, Route
+from utc.src.graph.network import RouteCosts, DynamicTree, TravelTimeProfiles, Corridor
+from utc.src.routing.traffic.duo import DUO
+from typing import List, Optional, Set, Tuple
+
+
+class PathFinderTest(unittest.TestCase):
+    """ Test equivalence of bidirectional searches, travel time matrices and repaired trees with unidirectional searches """
+    MAP: str = "Dublin"
+    PAIRS: int = 200
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.graph: Graph = Graph(RoadNetwork())
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert (cls.graph.loader.load_map(cls.MAP))
+        random.seed(42)
+        edges: List[str] = sorted(cls.graph.road_network.edges.keys())
+        cls.pairs: List[Tuple[str, str]] = [(random.choice(edges), random.choice(edges)) for _ in range(cls.PAIRS)]
+
+    def test_bidirectional2(self) -> None:
+        """
+        Compares lengths of routes found by 'bidirectional2' with 'a_star2' guided by landmarks (admissible)
+
+        :return: None
+        """
+        for start, goal in self.pairs:
+            with contextlib.redirect_stdout(io.StringIO()):
+                _, expected, _ = self.graph.path_finder.a_star2(start, goal, "landmarks")
+                found: Optional[Route] = self.graph.path_finder.bidirectional2(start, goal)
+            self.assertEqual(expected is None, found is None, (start, goal))
+            if found is not None:
+                self.assertTrue(self.graph.road_network.check_edge_sequence(found.edge_list))
+                self.assertEqual((found.first_edge().id, found.last_edge().id), (start, goal))
+                self.assertAlmostEqual(expected.get_length(), found.get_length(), places=3, msg=(start, goal))
+
+    def test_bidirectional(self) -> None:
+        """
+        Compares routes found by 'bidirectional' with 'a_star' between junctions
+        (Euclidean heuristic of 'a_star' can overestimate, its routes cannot be shorter)
+
+        :return: None
+        """
+        network: RoadNetwork = self.graph.road_network
+        for start, goal in self.pairs:
+            start_junction, goal_junction = network.get_edge(start).from_junction, network.get_edge(goal).to_junction
+            with contextlib.redirect_stdout(io.StringIO()):
+                _, expected, _ = self.graph.path_finder.a_star(start_junction, goal_junction)
+                found: Optional[Route] = self.graph.path_finder.bidirectional(start_junction, goal_junction)
+            self.assertEqual(expected is None, found is None, (start_junction, goal_junction))
+            if found is not None:
+                self.assertTrue(network.check_edge_sequence(found.edge_list))
+                self.assertEqual(found.first_edge().from_junction, start_junction)
+                self.assertEqual(found.last_edge().to_junction, goal_junction)
+                self.assertLessEqual(found.get_length(), expected.get_length() + 1e-3)
+
+    def test_corridor(self) -> None:
+        """
+        Compares routes found by 'top_k_a_star2' with and without corridor pruning, checks that distances
+        of corridor are reused by queries with the same origin (or destination)
+
+        :return: None
+        """
+        # Search without corridor is slow, only a few pairs are compared
+        for start, goal in self.pairs[:12]:
+            with contextlib.redirect_stdout(io.StringIO()):
+                pruned: Optional[List[Route]] = self.graph.path_finder.top_k_a_star2(start, goal, c=1.1, k=100)
+                expected: Optional[List[Route]] = self.graph.path_finder.top_k_a_star2(
+                    start, goal, c=1.1, k=100, corridor=False
+                )
+            self.assertEqual(expected is None, pruned is None, (start, goal))
+            if expected is not None:
+                self.assertEqual(
+                    sorted(tuple(edge.id for edge in route.edge_list) for route in expected),
+                    sorted(tuple(edge.id for edge in route.edge_list) for route in pruned), (start, goal)
+                )
+        network: RoadNetwork = self.graph.road_network
+        corridor: Corridor = network.get_corridor()
+        (start, goal), (other_start, other_goal) = self.pairs[:2]
+        start_route, goal_route, other_start_route, other_goal_route = [
+            network.get_edge(edge_id).internal_id for edge_id in (start, goal, other_start, other_goal)
+        ]
+        corridor.get_mask(start_route, goal_route, np.inf)
+        forward, backward = corridor.get_forward(start_route), corridor.get_backward(goal_route)
+        corridor.get_mask(start_route, other_goal_route, np.inf)
+        corridor.get_mask(other_start_route, goal_route, np.inf)
+        self.assertIs(corridor.get_forward(start_route), forward)
+        self.assertIs(corridor.get_backward(goal_route), backward)
+
+    def test_alternatives(self) -> None:
+        """
+        Checks routes of alternative route generators, the first is the shortest (same as the first route
+        of 'top_k_a_star2' guided by landmarks), others are within limit, without loops and diverse enough
+
+        :return: None
+        """
+        c, overlap = 1.3, 0.6
+        for generator in self.graph.alternatives.GENERATORS:
+            for start, goal in self.pairs[:50]:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    routes: Optional[List[Route]] = self.graph.alternatives.find_routes(
+                        generator, start, goal, c=c, overlap=overlap
+                    )
+                    expected: Optional[List[Route]] = self.graph.path_finder.top_k_a_star2(
+                        start, goal, c=1.1, k=2, heuristic="landmarks"
+                    )
+                self.assertEqual(expected is None, routes is None, (generator, start, goal))
+                if routes is None:
+                    continue
+                self.assertEqual(
+                    [edge.id for edge in routes[0].edge_list], [edge.id for edge in expected[0].edge_list],
+                    (generator, start, goal)
+                )
+                for index, route in enumerate(routes):
+                    edges: List[str] = [edge.id for edge in route.edge_list]
+                    self.assertEqual((edges[0], edges[-1]), (start, goal))
+                    self.assertEqual(len(set(edges)), len(edges), (generator, start, goal))
+                    self.assertLessEqual(route.get_length(), c * routes[0].get_length() + 1e-3)
+                    for previous in routes[:index]:
+                        shared: Set[str] = set(edges) & {edge.id for edge in previous.edge_list}
+                        self.assertLessEqual(
+                            sum(edge.length for edge in route.edge_list if edge.id in shared),
+                            overlap * route.get_length() + 1e-6, (generator, start, goal)
+                        )
+        output: io.StringIO = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertIsNone(self.graph.alternatives.find_routes("penalty", "missing", self.pairs[0][1]))
+        self.assertIn("missing", output.getvalue())
+
+    def test_duo(self) -> None:
+        """
+        Compares travel times of routes found by DUO with 'bidirectional' and 'dijkstra' algorithms
+
+        :return: None
+        """
+        network: RoadNetwork = self.graph.road_network
+        travel_times: List[float] = network.get_route_costs().get_list("travel_time")
+        with contextlib.redirect_stdout(io.StringIO()):
+            dijkstra: DUO = DUO(self.graph, algorithm="dijkstra")
+            bidirectional: DUO = DUO(self.graph, algorithm="bidirectional")
+        for start, goal in self.pairs:
+            with contextlib.redirect_stdout(io.StringIO()):
+                expected: Optional[Route] = dijkstra.dijkstra(start, goal, network)
+                found: Optional[Route] = bidirectional.bidirectional(start, goal, network)
+            self.assertEqual(expected is None, found is None, (start, goal))
+            if found is not None:
+                self.assertTrue(network.check_edge_sequence(found.edge_list))
+                self.assertAlmostEqual(
+                    sum(travel_times[edge.internal_id] for edge in expected.edge_list[1:]),
+                    sum(travel_times[edge.internal_id] for edge in found.edge_list[1:]), places=6
+                )
+
+    def test_contraction_hierarchy(self) -> None:
+        """
+        Compares travel times of routes found by DUO with 'cch' and 'dijkstra' algorithms, before and after
+        random changes of travel times (hierarchy is customized again, travel times are restored afterward)
+
+        :return: None
+        """
+        network: RoadNetwork = self.graph.road_network
+        costs: RouteCosts = network.get_route_costs()
+        generator: np.random.Generator = np.random.default_rng(7)
+        edges: np.ndarray = np.flatnonzero(network.get_csr().edge_mask)
+        with contextlib.redirect_stdout(io.StringIO()):
+            dijkstra: DUO = DUO(self.graph, algorithm="dijkstra")
+            contraction: DUO = DUO(self.graph, algorithm="cch")
+        self.addCleanup(costs.load_travel_time)
+        for update in range(3):
+            if update != 0:
+                changed: np.ndarray = generator.choice(edges, len(edges) // 10, replace=False)
+                costs.update_travel_time(changed, costs.edge_free_flow[changed] * generator.uniform(1, 4, len(changed)))
+            travel_times: List[float] = costs.get_list("travel_time")
+            with contextlib.redirect_stdout(io.StringIO()):
+                found: List[Optional[Route]] = contraction.contraction_many(self.pairs, network)
+            for (start, goal), route in zip(self.pairs, found):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    expected: Optional[Route] = dijkstra.dijkstra(start, goal, network)
+                self.assertEqual(expected is None, route is None, (start, goal))
+                if route is not None:
+                    self.assertEqual((route.first_edge().id, route.last_edge().id), (start, goal))
+                    self.assertAlmostEqual(
+                        sum(travel_times[edge.internal_id] for edge in expected.edge_list[1:]),
+                        sum(travel_times[edge.internal_id] for edge in route.edge_list[1:]), places=6
+                    )
+
+    def test_travel_time_profiles(self) -> None:
+        """
+        Checks interpolation of travel times between buckets and filling of buckets without observation
+
+        :return: None
+        """
+        network: RoadNetwork = self.graph.road_network
+        costs: RouteCosts = network.get_route_costs()
+        routes: np.ndarray = np.flatnonzero(network.get_csr().route_mask)[:50]
+        edges: range = range(len(costs.edge_free_flow))
+        profiles: TravelTimeProfiles = TravelTimeProfiles(network.get_csr(), costs, bucket_size=100, horizon=300)
+        profiles.observe(50, edges, costs.edge_free_flow * 2)
+        profiles.observe(150, edges, costs.edge_free_flow * 4)
+        for route_id in routes.tolist():
+            free_flow: float = costs.free_flow[route_id]
+            self.assertAlmostEqual(profiles.get_travel_time(route_id, 25), 2 * free_flow, places=6)
+            self.assertAlmostEqual(profiles.get_travel_time(route_id, 100), 3 * free_flow, places=6)
+            # The last bucket was not observed, it keeps travel times of previous bucket
+            self.assertAlmostEqual(profiles.get_travel_time(route_id, 290), 4 * free_flow, places=6)
+        # Recorded travel times are used at any time, until other buckets are observed
+        profiles = TravelTimeProfiles(network.get_csr(), costs, bucket_size=100, horizon=300)
+        profiles.record(150)
+        for route_id in routes.tolist():
+            for time in (0, 150, 299):
+                self.assertAlmostEqual(profiles.get_travel_time(route_id, time), costs.travel_time[route_id], places=6)
+
+    def test_time_dependent_dijkstra(self) -> None:
+        """
+        Compares travel times of routes found by time-dependent DUO on constant profiles with static DUO
+
+        :return: None
+        """
+        network: RoadNetwork = self.graph.road_network
+        travel_times: List[float] = network.get_route_costs().get_list("travel_time")
+        # Recorded travel times fill all buckets of new profiles, which are discarded afterward
+        profiles: TravelTimeProfiles = TravelTimeProfiles(network.get_csr(), network.get_route_costs())
+        profiles.record(0)
+        network.set_travel_time_profiles(profiles)
+        self.addCleanup(network.set_travel_time_profiles, None)
+        with contextlib.redirect_stdout(io.StringIO()):
+            dijkstra: DUO = DUO(self.graph, algorithm="dijkstra")
+        for start, goal in self.pairs[:50]:
+            with contextlib.redirect_stdout(io.StringIO()):
+                expected: Optional[Route] = dijkstra.dijkstra(start, goal, network)
+                found: Optional[Route] = dijkstra.dijkstra(start, goal, network, departure=3600.)
+            self.assertEqual(expected is None, found is None, (start, goal))
+            if found is not None:
+                self.assertAlmostEqual(
+                    sum(travel_times[edge.internal_id] for edge in expected.edge_list[1:]),
+                    sum(travel_times[edge.internal_id] for edge in found.edge_list[1:]), places=6
+                )
+
+    def test_dynamic_duo(self) -> None:
+        """
+        Compares travel times of routes found by DUO with 'dynamic' algorithm (trees of starting
+        edges and reversed trees of exit edges) and 'dijkstra' algorithm
+
+        :return: None
+        """
+        network: RoadNetwork = self.graph.road_network
+        travel_times: List[float] = network.get_route_costs().get_list("travel_time")
+        starts: List[str] = [start for start, _ in self.pairs[:20]]
+        goals: List[str] = [goal for _, goal in self.pairs[:3]]
+        with contextlib.redirect_stdout(io.StringIO()):
+            dijkstra: DUO = DUO(self.graph, algorithm="dijkstra")
+            dynamic: DUO = DUO(self.graph, algorithm="dynamic")
+        self.assertTrue(dynamic.has_single_ends(goals, network))
+        with contextlib.redirect_stdout(io.StringIO()):
+            for goal in goals:
+                found: List[Optional[Route]] = dynamic.dynamic_reverse_many(starts, goal, network)
+                for start, route in zip(starts, found):
+                    expected: Optional[Route] = dijkstra.dijkstra(start, goal, network)
+                    self.assertEqual(expected is None, route is None, (start, goal))
+                    if route is not None:
+                        self.assertEqual((route.first_edge().id, route.last_edge().id), (start, goal))
+                        self.assertAlmostEqual(
+                            sum(travel_times[edge.internal_id] for edge in expected.edge_list[1:]),
+                            sum(travel_times[edge.internal_id] for edge in route.edge_list[1:]), places=6
+                        )
+                self.assertEqual(
+                    [route is None for route in found],
+                    [dynamic.dynamic_many(start, [goal], network)[0] is None for start in starts]
+                )
+
+    def test_dynamic_tree(self) -> None:
+        """
+        Compares distances of repaired shortest path trees with trees computed again, after random
+        changes of travel times (travel times are restored afterward)
+
+        :return: None
+        """
+        network: RoadNetwork = self.graph.road_network
+        costs: RouteCosts = network.get_route_costs()
+        generator: np.random.Generator = np.random.default_rng(42)
+        edges: np.ndarray = np.flatnonzero(network.get_csr().edge_mask)
+        roots: List[int] = [network.get_edge(start).internal_id for start, _ in self.pairs[:5]]
+        trees: List[DynamicTree] = [
+            DynamicTree(network.get_csr(), costs, root, reverse) for root in roots for reverse in (False, True)
+        ]
+        self.addCleanup(costs.load_travel_time)
+        for _ in range(5):
+            changed: np.ndarray = generator.choice(edges, len(edges) // 20, replace=False)
+            costs.update_travel_time(changed, costs.edge_free_flow[changed] * generator.uniform(0.9, 3, len(changed)))
+            for tree in trees:
+                tree.update()
+                expected: np.ndarray = np.array(DynamicTree(network.get_csr(), costs, tree.root, tree.reverse).distances)
+                np.testing.assert_allclose(np.array(tree.distances), expected, atol=1e-6)
+
+    def test_travel_time_matrix(self) -> None:
+        """
+        Compares travel times of matrix with travel times of routes found by DUO
+
+        :return: None
+        """
+        network: RoadNetwork = self.graph.road_network
+        travel_times: List[float] = network.get_route_costs().get_list("travel_time")
+        sources: List[str] = [start for start, _ in self.pairs[:20]]
+        targets: List[str] = [goal for _, goal in self.pairs[:20]] + sources[:2]
+        matrix: np.ndarray = network.get_travel_time_matrix().get_matrix(sources, targets)
+        self.assertEqual(matrix.shape, (len(sources), len(targets)))
+        with contextlib.redirect_stdout(io.StringIO()):
+            dijkstra: DUO = DUO(self.graph, algorithm="dijkstra")
+        for i, start in enumerate(sources):
+            for j, goal in enumerate(targets):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    route: Optional[Route] = dijkstra.dijkstra(start, goal, network)
+                if route is None:
+                    self.assertTrue(np.isinf(matrix[i, j]), (start, goal))
+                    continue
+                self.assertAlmostEqual(
+                    sum(travel_times[edge.internal_id] for edge in route.edge_list[1:]), matrix[i, j], places=6
+                )
+        # Internal id's given by numpy arrays give the same matrix
+        internal: np.ndarray = np.array([network.get_edge(edge_id).internal_id for edge_id in sources])
+        np.testing.assert_array_equal(
+            network.get_travel_time_matrix().get_matrix(internal, internal.tolist()),
+            network.get_travel_time_matrix().get_matrix(sources, sources)
+        )
+        # Searches without limit are reused by queries with limit
+        limit: float = float(np.median(matrix[np.isfinite(matrix)]))
+        np.testing.assert_array_equal(
+            network.get_travel_time_matrix().get_matrix(sources, targets, limit=limit),
+            np.where(matrix <= limit, matrix, np.inf)
+        )
+        self.assertEqual(list(network.get_travel_time_matrix()._rows.keys()), ["travel_time"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+from utc.src.constants.static import FilePaths, FileExtension
+from utc.src.constants.file_system.file_types.network_snapshot_file import NetworkSnapshotFile
+from utc.src.graph import Graph, RoadNetwork
+
+
+class SnapshotTest(unittest.TestCase):
+    """ Test that corrupted snapshots of networks are rebuilt, instead of failing to load network """
+    MAP: str = "DCC_central"
+
+    def setUp(self) -> None:
+        # Network is copied, so that snapshots of bundled maps are not touched
+        self.directory: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.network_path: str = os.path.join(self.directory, self.MAP + FileExtension.SUMO_NETWORK)
+        shutil.copy(FilePaths.MAP_SUMO.format(self.MAP), self.network_path)
+        self.snapshot: NetworkSnapshotFile = NetworkSnapshotFile(self.network_path)
+
+    def load(self) -> Graph:
+        """
+        :return: Graph with network loaded (from snapshot, if it is valid)
+        """
+        graph: Graph = Graph(RoadNetwork())
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(graph.loader.load_map(self.network_path))
+        return graph
+
+    def test_corrupted_snapshot(self) -> None:
+        """
+        Truncates snapshot (as by interrupted write) and checks, that network is loaded and snapshot rebuilt
+
+        :return: None
+        """
+        expected: Graph = self.load()
+        self.assertIsNotNone(self.snapshot.load_arrays())
+        with open(self.snapshot.file_path, "rb") as snapshot:
+            content: bytes = snapshot.read()
+        for corrupted in (content[:10], content[:len(content) // 2], content[:-30]):
+            with open(self.snapshot.file_path, "wb") as snapshot:
+                snapshot.write(corrupted)
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertIsNone(self.snapshot.load_arrays())
+            graph: Graph = self.load()
+            self.assertEqual(sorted(graph.road_network.edges.keys()), sorted(expected.road_network.edges.keys()))
+            self.assertEqual(len(graph.road_network.routes), len(expected.road_network.routes))
+            # Snapshot was written again (without leftover temporary files)
+            self.assertIsNotNone(self.snapshot.load_arrays())
+            self.assertEqual(
+                sorted(os.listdir(self.directory)),
+                sorted([os.path.basename(self.network_path), os.path.basename(self.snapshot.file_path)])
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()